@@ -0,0 +1,77 @@
+"""Benchmark lazy graph construction: build time and memory per node.
+
+Usage:
+    python benchmarks/lazy_construction.py [number of nodes]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+import tributary.lazy as tl
+
+
+def build_leaves(count):
+    return [tl.Node(name="x", value=i) for i in range(count)]
+
+
+def build_operators(count):
+    # small expressions over shared inputs, e.g. a pricing model
+    spot = tl.Node(name="spot", value=100.0)
+    vol = tl.Node(name="vol", value=0.2)
+    return [
+        (spot * tl.Node(name="weight", value=i) + vol).exp() for i in range(count // 4)
+    ]
+
+
+def build_callables(count):
+    def foo(x, y=1):
+        return x.value() + y.value()
+
+    return [
+        tl.Node(callable=foo, callable_args=[tl.Node(name="x", value=i)])
+        for i in range(count // 3)
+    ]
+
+
+def _count_nodes():
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, tl.Node))
+
+
+def measure(build, count):
+    # nodes reference themselves, so collect any previous graph
+    gc.collect()
+    before = _count_nodes()
+
+    start = time.perf_counter()
+    graph = build(count)
+    elapsed = time.perf_counter() - start
+
+    nodes = _count_nodes() - before
+    del graph
+    gc.collect()
+
+    # measure memory separately, as tracing slows down the build
+    tracemalloc.start()
+    graph = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return nodes, elapsed, size
+
+
+def main(count=100000):
+    print(
+        "{:<12}{:>12}{:>16}{:>16}".format("graph", "nodes", "build (s)", "bytes/node")
+    )
+    for build in (build_leaves, build_operators, build_callables):
+        nodes, elapsed, peak = measure(build, count)
+        print(
+            "{:<12}{:>12}{:>16.3f}{:>16.0f}".format(
+                build.__name__[len("build_") :], nodes, elapsed, peak / nodes
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,65 @@
+"""Benchmark per-tick overhead of streaming nodes.
+
+Ticks a chain of simple nodes, both by awaiting the nodes directly (engine
+overhead of each node, without task scheduling) and by running the graph.
+
+Usage:
+    python benchmarks/streaming_tick.py [number of ticks] [chain length]
+"""
+import asyncio
+import sys
+import time
+
+import tributary.streaming as ts
+
+
+def build(ticks, length):
+    # each addition also adds a constant input node
+    node = ts.Curve(list(range(ticks)))
+    for _ in range(length):
+        node = node + 1
+    return node
+
+
+def _count(node):
+    return sum(len(level) for level in node._deep_bfs())
+
+
+async def _tick(levels):
+    # same traversal as the graph, minus the tasks
+    while not isinstance(levels[0][0].value(), ts.StreamEnd):
+        for level in levels:
+            for node in level:
+                await node()
+
+
+def measure_nodes(ticks, length):
+    levels = build(ticks, length)._deep_bfs()
+    start = time.perf_counter()
+    asyncio.run(_tick(levels))
+    return time.perf_counter() - start
+
+
+def measure_graph(ticks, length):
+    graph = build(ticks, length)
+    start = time.perf_counter()
+    ts.run(graph, newloop=True)
+    return time.perf_counter() - start
+
+
+def main(ticks=20000, length=10):
+    node_ticks = ticks * _count(build(1, length))
+    print("{:<12}{:>16}{:>20}".format("run", "elapsed (s)", "us/node/tick"))
+    for measure in (measure_nodes, measure_graph):
+        elapsed = measure(ticks, length)
+        print(
+            "{:<12}{:>16.3f}{:>20.2f}".format(
+                measure.__name__[len("measure_") :],
+                elapsed,
+                elapsed / node_ticks * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -34,6 +34,7 @@ requires = [
     "asyncpg>=0.20.1",
     "beautifulsoup4>=4.9.1",
     "boltons>=20.1.0",
+    "dill>=0.3.0",
     "emails>=0.5.15",
     "future>=0.17.1",
     "gevent>=1.3.7",
@@ -75,6 +76,7 @@ setup(
     license="Apache 2.0",
     install_requires=requires,
     extras_require={
+        "arrow": ["pyarrow>=7.0.0"],
         "dev": requires_dev,
         "functional": ["confluent-kafka>=0.11.6", "websocket_client>=0.57.0"],
     },
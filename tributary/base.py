@@ -8,9 +8,8 @@ class StreamEnd:
     instance = None
 
     def __new__(cls):
-        if not StreamEnd.instance:
+        if StreamEnd.instance is None:
             StreamEnd.instance = super().__new__(cls)
-            return StreamEnd.instance
         return StreamEnd.instance
 
 
@@ -21,9 +20,8 @@ class StreamRepeat:
     instance = None
 
     def __new__(cls):
-        if not StreamRepeat.instance:
+        if StreamRepeat.instance is None:
             StreamRepeat.instance = super().__new__(cls)
-            return StreamRepeat.instance
         return StreamRepeat.instance
 
 
@@ -33,9 +31,8 @@ class StreamNone:
     instance = None
 
     def __new__(cls):
-        if not StreamNone.instance:
+        if StreamNone.instance is None:
             StreamNone.instance = super().__new__(cls)
-            return StreamNone.instance
         return StreamNone.instance
 
     def all_bin_ops(self, other):
@@ -85,3 +82,9 @@ class StreamNone:
     __neg__ = all_un_ops
     __nonzero__ = all_un_ops
     __len__ = all_un_ops
+
+
+# singleton instances, so hot paths can check by identity
+_STREAM_END = StreamEnd()
+_STREAM_REPEAT = StreamRepeat()
+_STREAM_NONE = StreamNone()
@@ -3,4 +3,5 @@ from .calculations import *
 from .control import *
 from .input import *
 from .output import *
+from .persist import Persist, PersistentStore
 from .utils import *
@@ -4,44 +4,34 @@ from ..node import Node
 
 def Len(self):
     """Compute len(n) for node n"""
-    return unary(
-        self, "len({})".format(self._name_no_id()), (lambda x: len(self.value()))
-    )
+    return unary(self, "len({})", (lambda x: len(self.value())))
 
 
 def CountBasket(self):
     """Compute len(n) for node n"""
-    return unary(
-        self, "count({})".format(self._name_no_id()), (lambda x: len(self.value()))
-    )
+    return unary(self, "count({})", (lambda x: len(self.value())))
 
 
 def MaxBasket(self):
     """Compute max(n) for node n"""
-    return unary(
-        self, "max({})".format(self._name_no_id()), (lambda x: max(self.value()))
-    )
+    return unary(self, "max({})", (lambda x: max(self.value())))
 
 
 def MinBasket(self):
     """Compute max(n) for node n"""
-    return unary(
-        self, "min({})".format(self._name_no_id()), (lambda x: min(self.value()))
-    )
+    return unary(self, "min({})", (lambda x: min(self.value())))
 
 
 def SumBasket(self):
     """Compute sum(n) for node n"""
-    return unary(
-        self, "sum({})".format(self._name_no_id()), (lambda x: sum(self.value()))
-    )
+    return unary(self, "sum({})", (lambda x: sum(self.value())))
 
 
 def AverageBasket(self):
     """Compute mean(n) for node n"""
     return unary(
         self,
-        "average({})".format(self._name_no_id()),
+        "average({})",
         (lambda x: sum(self.value()) / len(self.value())),
     )
 
@@ -1,10 +1,57 @@
+import numpy as np
 import pandas as pd
 from ..node import Node
 
 
+def _fold_new_values(ret, node, update, initial):
+    """Fold the values appended to `node`'s list of values since `ret` was last
+    evaluated into `ret`'s state with `update(state, value)`, and return the new state.
+
+    Values are only folded incrementally if the input is the same list object as last
+    time, grown without changing its previously last value. Otherwise (e.g. replaced,
+    even by an equal looking list, or truncated), start over from the `initial` state.
+    Tweaked values are folded into a fresh state which isn't kept.
+    """
+    source = values = node.value()
+    if isinstance(values, pd.Series):
+        values = values.values
+
+    if node._tweaks and node in node._tweaks:
+        state = initial
+        for value in values:
+            state = update(state, value)
+        return state
+
+    state, seen = ret._state, ret._seen
+
+    if (
+        not seen
+        or source is not ret._source
+        or seen > len(values)
+        or not (values[seen - 1] is ret._last or values[seen - 1] == ret._last)
+    ):
+        # not an append to what we've seen so far
+        state, seen = initial, 0
+
+    for value in values[seen:]:
+        state = update(state, value)
+
+    ret._state, ret._seen, ret._source = state, len(values), source
+    ret._last = values[-1] if len(values) else None
+    return state
+
+
+def _ewm(average, value, alpha):
+    """one step of `ewm(alpha=alpha, adjust=False)`"""
+    return ((1 - alpha) * average + alpha * value) / ((1 - alpha) + alpha)
+
+
 def RSI(node, period=14, basket=False):
     """Relative Strength Index.
 
+    The last value is computed incrementally, from the values appended to the
+    input since the last evaluation. If `basket` is set, the full history is recomputed.
+
     Args:
         node (Node): input node.
         period (int): RSI period
@@ -12,27 +59,55 @@ def RSI(node, period=14, basket=False):
     """
 
     def _rsi(node=node, period=period, basket=basket):
-        delta = pd.Series(node.value()).diff().shift(-1)
-        up, down = delta.copy(), delta.copy()
-        up[up < 0] = 0
-        down[down > 0] = 0
-        _gain = up.ewm(alpha=1.0 / period.value(), adjust=False).mean()
-        _loss = down.abs().ewm(alpha=1.0 / period.value(), adjust=False).mean()
-        RS = _gain / _loss
-        rsi = pd.Series(100 - (100 / (1 + RS)))
-
         if basket.value():
-            return rsi
-        return rsi.iloc[-1]
+            delta = pd.Series(node.value()).diff().shift(-1)
+            up, down = delta.copy(), delta.copy()
+            up[up < 0] = 0
+            down[down > 0] = 0
+            _gain = up.ewm(alpha=1.0 / period.value(), adjust=False).mean()
+            _loss = down.abs().ewm(alpha=1.0 / period.value(), adjust=False).mean()
+            RS = _gain / _loss
+            return pd.Series(100 - (100 / (1 + RS)))
+
+        alpha = 1.0 / period.value()
+
+        def update(state, value):
+            last, gain, loss, count = state
+
+            if last is None:
+                return value, gain, loss, count
+
+            delta = value - last
+            up, down = max(delta, 0), abs(min(delta, 0))
+
+            if count == 0:
+                return value, up, down, 1
+            return value, _ewm(gain, up, alpha), _ewm(loss, down, alpha), count + 1
+
+        _, gain, loss, count = _fold_new_values(ret, node, update, (None, 0, 0, 0))
+
+        if count == 0:
+            return float("nan")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            RS = np.float64(gain) / loss
+            return 100 - (100 / (1 + RS))
 
     # make new node
-    ret = node._gennode("RSI[{}]".format(period), _rsi, [node])
+    ret = node._gennode(
+        "RSI[{}]".format(period), _rsi, [node], key=("RSI", period, basket)
+    )
+    if not hasattr(ret, "_state"):
+        ret._state, ret._seen, ret._last, ret._source = None, 0, None, None
     return ret
 
 
 def MACD(node, period_fast=12, period_slow=26, signal=9, basket=False):
     """Moving Average Convergence/Divergence
 
+    The last value is computed incrementally, from the values appended to the
+    input since the last evaluation. If `basket` is set, the full history is recomputed.
+
     Args:
         node (Node): input data
         period_fast (int): Fast moving average period
@@ -40,7 +115,7 @@ def MACD(node, period_fast=12, period_slow=26, signal=9, basket=False):
         signal (int): MACD moving average period
         basket (bool): given a list as input, return a list as output (as opposed to the last value)
     Returns:
-        Node: node that emits tuple of (macd, macd_signal)
+        Node: node that emits a series of macd and macd signal, labeled "MACD" and "SIGNAL"
     """
 
     def _macd(
@@ -50,33 +125,63 @@ def MACD(node, period_fast=12, period_slow=26, signal=9, basket=False):
         signal=signal,
         basket=basket,
     ):
-        EMA_fast = pd.Series(
-            pd.Series(node.value())
-            .ewm(ignore_na=False, span=period_fast.value(), adjust=False)
-            .mean(),
-            name="EMA_fast",
-        )
-        EMA_slow = pd.Series(
-            pd.Series(node.value())
-            .ewm(ignore_na=False, span=period_slow.value(), adjust=False)
-            .mean(),
-            name="EMA_slow",
-        )
-        MACD = pd.Series(EMA_fast - EMA_slow, name="MACD")
-        MACD_signal = pd.Series(
-            MACD.ewm(ignore_na=False, span=signal.value(), adjust=False).mean(),
-            name="SIGNAL",
+        if basket.value():
+            EMA_fast = pd.Series(
+                pd.Series(node.value())
+                .ewm(ignore_na=False, span=period_fast.value(), adjust=False)
+                .mean(),
+                name="EMA_fast",
+            )
+            EMA_slow = pd.Series(
+                pd.Series(node.value())
+                .ewm(ignore_na=False, span=period_slow.value(), adjust=False)
+                .mean(),
+                name="EMA_slow",
+            )
+            MACD = pd.Series(EMA_fast - EMA_slow, name="MACD")
+            MACD_signal = pd.Series(
+                MACD.ewm(ignore_na=False, span=signal.value(), adjust=False).mean(),
+                name="SIGNAL",
+            )
+            return pd.concat([MACD, MACD_signal], axis=1).values
+
+        # span to alpha
+        alpha_fast = 2.0 / (period_fast.value() + 1)
+        alpha_slow = 2.0 / (period_slow.value() + 1)
+        alpha_signal = 2.0 / (signal.value() + 1)
+
+        def update(state, value):
+            fast, slow, macd_signal, count = state
+
+            if count == 0:
+                return value, value, 0.0, 1
+
+            fast = _ewm(fast, value, alpha_fast)
+            slow = _ewm(slow, value, alpha_slow)
+            return (
+                fast,
+                slow,
+                _ewm(macd_signal, fast - slow, alpha_signal),
+                count + 1,
+            )
+
+        fast, slow, macd_signal, count = _fold_new_values(
+            ret, node, update, (0.0, 0.0, 0.0, 0)
         )
-        macd = pd.concat([MACD, MACD_signal], axis=1)
 
-        if basket.value():
-            return macd.values
-        return macd.iloc[-1]
+        if count == 0:
+            fast, slow, macd_signal = float("nan"), float("nan"), float("nan")
+        return pd.Series([fast - slow, macd_signal], index=["MACD", "SIGNAL"])
 
     # make new node
     ret = node._gennode(
-        "MACD[{},{},{}]".format(period_fast, period_slow, signal), _macd, [node]
+        "MACD[{},{},{}]".format(period_fast, period_slow, signal),
+        _macd,
+        [node],
+        key=("MACD", period_fast, period_slow, signal, basket),
     )
+    if not hasattr(ret, "_state"):
+        ret._state, ret._seen, ret._last, ret._source = None, 0, None, None
     return ret
 
 
@@ -1,53 +1,144 @@
 import math
 import numpy as np
 import scipy as sp
+import scipy.special  # noqa: F401
 from .utils import _CALCULATIONS_GRAPHVIZSHAPE
 from ..node import Node
 
 
-def unary(node, name, lam):
+# numpy equivalents of operators, by operator name,
+# used to compile graphs into vectorized functions
+# (see `Node.compile`)
+_VECTORIZED = {
+    "{}+{}": np.add,
+    "{}-{}": np.subtract,
+    "{}*{}": np.multiply,
+    "{}/{}": np.true_divide,
+    "{}\\{}": lambda x, y: y / x,
+    "{}^{}": np.power,
+    "{}%{}": np.mod,
+    "(-{})": np.negative,
+    "1/{}": lambda x: 1 / x,
+    "Sum({},{})": lambda *args: sum(args),
+    "Average({},{})": lambda *args: sum(args) / len(args),
+    "{}||{}": np.logical_or,
+    "{}&&{}": np.logical_and,
+    "!{}": np.logical_not,
+    "sin({})": np.sin,
+    "cos({})": np.cos,
+    "tan({})": np.tan,
+    "arcsin({})": np.arcsin,
+    "arccos({})": np.arccos,
+    "arctan({})": np.arctan,
+    "||{}||": np.abs,
+    "sqrt({})": np.sqrt,
+    "log({})": np.log,
+    "exp({})": np.exp,
+    "erf({})": sp.special.erf,
+    "float({})": lambda x: np.asarray(x, dtype=float),
+    "int({})": lambda x: np.asarray(x).astype(int),
+    "bool({})": lambda x: np.asarray(x, dtype=bool),
+    "floor({})": np.floor,
+    "ceil({})": np.ceil,
+    "{}=={}": np.equal,
+    "{}!={}": np.not_equal,
+    "{}>={}": np.greater_equal,
+    "{}>{}": np.greater,
+    "{}<={}": np.less_equal,
+    "{}<{}": np.less,
+}
+
+
+def _pow_gradient(x, y, out):
+    # d/dy is undefined for x <= 0, which is fine if y is constant
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return y * x ** (y - 1), out * np.log(x)
+
+
+def _zero_gradient(*args):
+    # piecewise constant operators
+    return tuple(0 * arg for arg in args[:-1])
+
+
+# partial derivatives of operators w.r.t. each operand, by operator name,
+# as a function of the operand values and the result
+# (see `Node.gradient`)
+_GRADIENTS = {
+    "{}+{}": lambda x, y, out: (1, 1),
+    "{}-{}": lambda x, y, out: (1, -1),
+    "{}*{}": lambda x, y, out: (y, x),
+    "{}/{}": lambda x, y, out: (1 / y, -x / y**2),
+    "{}\\{}": lambda x, y, out: (-y / x**2, 1 / x),
+    "{}^{}": _pow_gradient,
+    "{}%{}": lambda x, y, out: (1, -np.floor(x / y)),
+    "(-{})": lambda x, out: (-1,),
+    "1/{}": lambda x, out: (-1 / x**2,),
+    "Sum({},{})": lambda *args: (1,) * (len(args) - 1),
+    "Average({},{})": lambda *args: (1 / (len(args) - 1),) * (len(args) - 1),
+    "sin({})": lambda x, out: (np.cos(x),),
+    "cos({})": lambda x, out: (-np.sin(x),),
+    "tan({})": lambda x, out: (1 + out**2,),
+    "arcsin({})": lambda x, out: (1 / np.sqrt(1 - x**2),),
+    "arccos({})": lambda x, out: (-1 / np.sqrt(1 - x**2),),
+    "arctan({})": lambda x, out: (1 / (1 + x**2),),
+    "||{}||": lambda x, out: (np.sign(x),),
+    "sqrt({})": lambda x, out: (0.5 / out,),
+    "log({})": lambda x, out: (1 / x,),
+    "exp({})": lambda x, out: (out,),
+    "erf({})": lambda x, out: (2 / math.sqrt(math.pi) * np.exp(-(x**2)),),
+    "float({})": lambda x, out: (1,),
+    "int({})": _zero_gradient,
+    "floor({})": _zero_gradient,
+    "ceil({})": _zero_gradient,
+}
+
+
+def unary(node, name, lam, vectorized=None, gradient=None):
+    """Derived node applying `lam` to `node`. `name` is a format
+    string for the operand name, only formatted if constructing a new node"""
     return node._gennode(
-        name=name,
+        name=lambda: name.format(node._name_no_id()),
+        key=(name, node._use_dual),
         foo=lam,
         foo_args=[node],
         graphvizshape=_CALCULATIONS_GRAPHVIZSHAPE,
         use_dual=node._use_dual,
+        vectorized=vectorized or _VECTORIZED.get(name),
+        gradient=gradient or _GRADIENTS.get(name),
     )
 
 
-def binary(node1, other, name, lam):
-    if isinstance(node1._self_reference, Node):
-        return node1._gennode(
-            name=name,
-            foo=lam,
-            foo_args=[node1._self_reference, other],
-            graphvizshape=_CALCULATIONS_GRAPHVIZSHAPE,
-            use_dual=node1._use_dual,
-        )
+def binary(node1, other, name, lam, vectorized=None, gradient=None):
+    """Derived node applying `lam` to `node1` and `other`. `name` is a format
+    string for the operand names, only formatted if constructing a new node"""
+    first = node1._self_reference if isinstance(node1._self_reference, Node) else node1
     return node1._gennode(
-        name=name,
+        name=lambda: name.format(node1._name_no_id(), other._name_no_id()),
+        key=(name, node1._use_dual),
         foo=lam,
-        foo_args=[node1, other],
+        foo_args=[first, other],
         graphvizshape=_CALCULATIONS_GRAPHVIZSHAPE,
         use_dual=node1._use_dual,
+        vectorized=vectorized or _VECTORIZED.get(name),
+        gradient=gradient or _GRADIENTS.get(name),
     )
 
 
-def n_ary(node, others, name, lam):
-    if isinstance(node._self_reference, Node):
-        return node._gennode(
-            name=name,
-            foo=lam,
-            foo_args=[node._self_reference] + others,
-            graphvizshape=_CALCULATIONS_GRAPHVIZSHAPE,
-            use_dual=node._use_dual,
-        )
+def n_ary(node, others, name, lam, vectorized=None, gradient=None):
+    """Derived node applying `lam` to `node` and `others`. `name` is a format string
+    for the node name and the joined names of others, only formatted if constructing a new node"""
+    first = node._self_reference if isinstance(node._self_reference, Node) else node
     return node._gennode(
-        name=name,
+        name=lambda: name.format(
+            node._name_no_id(), ",".join(other._name_no_id() for other in others)
+        ),
+        key=(name, node._use_dual),
         foo=lam,
-        foo_args=[node] + others,
+        foo_args=[first] + others,
         graphvizshape=_CALCULATIONS_GRAPHVIZSHAPE,
         use_dual=node._use_dual,
+        vectorized=vectorized or _VECTORIZED.get(name),
+        gradient=gradient or _GRADIENTS.get(name),
     )
 
 
@@ -63,7 +154,7 @@ def Add(self, other):
     return binary(
         self,
         other,
-        "{}+{}".format(self._name_no_id(), other._name_no_id()),
+        "{}+{}",
         (
             lambda x, y: x.value() + y.value()
             if not self._use_dual
@@ -79,7 +170,7 @@ def Sub(self, other):
     return binary(
         self,
         other,
-        "{}-{}".format(self._name_no_id(), other._name_no_id()),
+        "{}-{}",
         (
             lambda x, y: x.value() - y.value()
             if not self._use_dual
@@ -95,7 +186,7 @@ def Mult(self, other):
     return binary(
         self,
         other,
-        "{}*{}".format(self._name_no_id(), other._name_no_id()),
+        "{}*{}",
         (
             lambda x, y: x.value() * y.value()
             if not self._use_dual
@@ -114,7 +205,7 @@ def Div(self, other):
     return binary(
         self,
         other,
-        "{}/{}".format(self._name_no_id(), other._name_no_id()),
+        "{}/{}",
         (
             lambda x, y: x.value() / y.value()
             if not self._use_dual
@@ -134,7 +225,7 @@ def RDiv(self, other):
     return binary(
         self,
         other,
-        "{}\\{}".format(self._name_no_id(), other._name_no_id()),
+        "{}\\{}",
         (
             lambda x, y: y.value() / x.value()
             if not self._use_dual
@@ -154,7 +245,7 @@ def Pow(self, other):
     return binary(
         self,
         other,
-        "{}^{}".format(self._name_no_id(), other._name_no_id()),
+        "{}^{}",
         (
             lambda x, y: x.value() ** y.value()
             if not self._use_dual
@@ -174,7 +265,7 @@ def Mod(self, other):
     return binary(
         self,
         other,
-        "{}%{}".format(self._name_no_id(), other._name_no_id()),
+        "{}%{}",
         (lambda x, y: x.value() % y.value()),
     )
 
@@ -183,7 +274,7 @@ def Negate(self):
     """Compute -1 * n for node n"""
     return unary(
         self,
-        "(-{})".format(self._name_no_id()),
+        "(-{})",
         (
             lambda x: -self.value()
             if not self._use_dual
@@ -196,7 +287,7 @@ def Invert(self):
     """Compute 1 / n for node n"""
     return unary(
         self,
-        "1/{}".format(self._name_no_id()),
+        "1/{}",
         (
             lambda x: 1 / self.value()
             if not self._use_dual
@@ -219,9 +310,7 @@ def Sum(self, *others):
     return n_ary(
         self,
         others_nodes,
-        "Sum({},{})".format(
-            self._name_no_id(), ",".join(other._name_no_id() for other in others_nodes)
-        ),
+        "Sum({},{})",
         (
             lambda *args: sum(x.value() for x in args)
             if not self._use_dual
@@ -244,9 +333,7 @@ def Average(self, *others):
     return n_ary(
         self,
         others_nodes,
-        "Average({},{})".format(
-            self._name_no_id(), ",".join(other._name_no_id() for other in others_nodes)
-        ),
+        "Average({},{})",
         (
             lambda *args: sum(x.value() for x in args) / len(args)
             if not self._use_dual
@@ -274,7 +361,7 @@ def Or(self, other):
     return binary(
         self,
         other,
-        "{}||{}".format(self._name_no_id(), other._name_no_id()),
+        "{}||{}",
         (lambda x, y: x.value() or y.value()),
     )
 
@@ -286,14 +373,14 @@ def And(self, other):
     return binary(
         self,
         other,
-        "{}&&{}".format(self._name_no_id(), other._name_no_id()),
+        "{}&&{}",
         (lambda x, y: x.value() and y.value()),
     )
 
 
 def Not(self):
     """Compute not n for node n"""
-    return unary(self, "!{}".format(self._name_no_id()), (lambda x: not x.value()))
+    return unary(self, "!{}", (lambda x: not x.value()))
 
 
 ##########################
@@ -303,7 +390,7 @@ def Sin(self):
     """Compute sin(n) for node n"""
     return unary(
         self,
-        "sin({})".format(self._name_no_id()),
+        "sin({})",
         (
             lambda x: math.sin(self.value())
             if not self._use_dual
@@ -319,7 +406,7 @@ def Cos(self):
     """Compute cos(n) for node n"""
     return unary(
         self,
-        "cos({})".format(self._name_no_id()),
+        "cos({})",
         (
             lambda x: math.cos(self.value())
             if not self._use_dual
@@ -335,7 +422,7 @@ def Tan(self):
     """Compute tan(n) for node n"""
     return unary(
         self,
-        "tan({})".format(self._name_no_id()),
+        "tan({})",
         (
             lambda x: math.tan(self.value())
             if not self._use_dual
@@ -351,7 +438,7 @@ def Arcsin(self):
     """Compute arcsin(n) for node n"""
     return unary(
         self,
-        "arcsin({})".format(self._name_no_id()),
+        "arcsin({})",
         (
             lambda x: math.asin(self.value())
             if not self._use_dual
@@ -367,7 +454,7 @@ def Arccos(self):
     """Compute arccos(n) for node n"""
     return unary(
         self,
-        "arccos({})".format(self._name_no_id()),
+        "arccos({})",
         (
             lambda x: math.acos(self.value())
             if not self._use_dual
@@ -383,7 +470,7 @@ def Arctan(self):
     """Compute arctan(n) for node n"""
     return unary(
         self,
-        "arctan({})".format(self._name_no_id()),
+        "arctan({})",
         (
             lambda x: math.atan(self.value())
             if not self._use_dual
@@ -399,7 +486,7 @@ def Abs(self):
     """Compute abs(n) for node n"""
     return unary(
         self,
-        "||{}||".format(self._name_no_id()),
+        "||{}||",
         (
             lambda x: abs(self.value())
             if not self._use_dual
@@ -415,7 +502,7 @@ def Sqrt(self):
     """Compute sqrt(n) for node n"""
     return unary(
         self,
-        "sqrt({})".format(self._name_no_id()),
+        "sqrt({})",
         (
             lambda x: math.sqrt(self.value())
             if not self._use_dual
@@ -431,7 +518,7 @@ def Log(self):
     """Compute log(n) for node n"""
     return unary(
         self,
-        "log({})".format(self._name_no_id()),
+        "log({})",
         (
             lambda x: math.log(self.value())
             if not self._use_dual
@@ -444,7 +531,7 @@ def Exp(self):
     """Compute exp(n) for node n"""
     return unary(
         self,
-        "exp({})".format(self._name_no_id()),
+        "exp({})",
         (
             lambda x: math.exp(self.value())
             if not self._use_dual
@@ -460,7 +547,7 @@ def Erf(self):
     """Compute erf(n) for node n"""
     return unary(
         self,
-        "erf({})".format(self._name_no_id()),
+        "erf({})",
         (
             lambda x: math.erf(self.value())
             if not self._use_dual
@@ -481,7 +568,7 @@ def Float(self):
     """Compute float(n) for node n"""
     return unary(
         self,
-        "float({})".format(self._name_no_id()),
+        "float({})",
         (
             lambda x: float(self.value())
             if not self._use_dual
@@ -494,7 +581,7 @@ def Int(self):
     """Compute int(n) for node n"""
     return unary(
         self,
-        "int({})".format(self._name_no_id()),
+        "int({})",
         (lambda x: int(self.value()) if not self._use_dual else int(self.value()[0])),
     )
 
@@ -503,7 +590,7 @@ def Bool(self):
     """Compute bool(n) for node n"""
     return unary(
         self,
-        "bool({})".format(self._name_no_id()),
+        "bool({})",
         (lambda x: bool(self.value()) if not self._use_dual else bool(self.value()[0])),
     )
 
@@ -518,7 +605,7 @@ def Str(self):
     """Compute str(n) for node n"""
     return unary(
         self,
-        "str({})".format(self._name_no_id()),
+        "str({})",
         (
             lambda x: str(self.value())
             if not self._use_dual
@@ -534,7 +621,7 @@ def Floor(self):
     """Compute floor(n) for node n"""
     return unary(
         self,
-        "floor({})".format(self._name_no_id()),
+        "floor({})",
         (
             lambda x: math.floor(self.value())
             if not self._use_dual
@@ -547,7 +634,7 @@ def Ceil(self):
     """Compute ceil(n) for node n"""
     return unary(
         self,
-        "ceil({})".format(self._name_no_id()),
+        "ceil({})",
         (
             lambda x: math.ceil(self.value())
             if not self._use_dual
@@ -560,7 +647,7 @@ def Round(self, ndigits=0):
     """Compute round(n, ndigits) for node n"""
     return unary(
         self,
-        "round({}, {})".format(self._name_no_id(), ndigits),
+        "round({{}}, {})".format(ndigits),
         (
             lambda x: round(self.value(), ndigits=ndigits)
             if not self._use_dual
@@ -569,6 +656,8 @@ def Round(self, ndigits=0):
                 round(self.value()[1], ndigits=ndigits),
             )
         ),
+        vectorized=lambda x: np.round(x, ndigits),
+        gradient=_zero_gradient,
     )
 
 
@@ -635,7 +724,7 @@ def Equal(self, other):
     return binary(
         self,
         other,
-        self._name_no_id() + "==" + other._name_no_id(),
+        "{}=={}",
         (
             lambda x, y: x.value() == y.value()
             if not self._use_dual
@@ -653,7 +742,7 @@ def NotEqual(self, other):
     return binary(
         self,
         other,
-        self._name_no_id() + "!=" + other._name_no_id(),
+        "{}!={}",
         (
             lambda x, y: x.value() != y.value()
             if not self._use_dual
@@ -671,7 +760,7 @@ def Ge(self, other):
     return binary(
         self,
         other,
-        self._name_no_id() + ">=" + other._name_no_id(),
+        "{}>={}",
         (
             lambda x, y: x.value() >= y.value()
             if not self._use_dual
@@ -689,7 +778,7 @@ def Gt(self, other):
     return binary(
         self,
         other,
-        self._name_no_id() + ">" + other._name_no_id(),
+        "{}>{}",
         (
             lambda x, y: x.value() > y.value()
             if not self._use_dual
@@ -707,7 +796,7 @@ def Le(self, other):
     return binary(
         self,
         other,
-        self._name_no_id() + "<=" + other._name_no_id(),
+        "{}<={}",
         (
             lambda x, y: x.value() <= y.value()
             if not self._use_dual
@@ -725,7 +814,7 @@ def Lt(self, other):
     return binary(
         self,
         other,
-        self._name_no_id() + "<" + other._name_no_id(),
+        "{}<{}",
         (
             lambda x, y: x.value() < y.value()
             if not self._use_dual
@@ -1,51 +1,254 @@
+from collections import deque
+from copy import deepcopy
+from .utils import _CALCULATIONS_GRAPHVIZSHAPE
 from ..node import Node
 
-# def RollingCount(node):
-#     def foo(node=node):
-#         return node()
-#     # make new node
-#     ret = node._gennode('RollingCount({})'.format(node._name), foo, [node])
-#     return ret
+
+def _rolling(node, name, update, state, result=None):
+    """Derived node folding each new value of `node` into a running state
+    with `update(state, value)`, and returning `result(state)`.
+
+    New values are those added to the upstream node's history since the
+    derived node was last evaluated, so re-evaluating it when the upstream
+    node hasn't produced a new value (e.g. after a tweak) doesn't count a
+    value twice. Tweaked values are applied to a copy of the state.
+
+    Args:
+        node (Node): input node
+        name (str): name of the operation, also used to cache the derived node
+        update (callable): function of (state, value) returning the new state
+        state (any): initial state
+        result (callable): function of state returning the node's value, defaults to the state
+    """
+
+    def foo(node=node):
+        values = node._values
+        new_state = ret._state
+
+        for value in values[ret._seen :]:
+            new_state = update(new_state, value)
+
+        ret._state = new_state
+        ret._seen = len(values)
+
+        if node._tweaks and node in node._tweaks:
+            # don't keep tweaked values
+            new_state = update(deepcopy(new_state), node.value())
+
+        return result(new_state) if result else new_state
+
+    ret = node._gennode(
+        name=lambda: "{}({})".format(name, node._name_no_id()),
+        key=name,
+        foo=foo,
+        foo_args=[node],
+        graphvizshape=_CALCULATIONS_GRAPHVIZSHAPE,
+    )
+
+    # cached nodes keep their state
+    if not hasattr(ret, "_state"):
+        ret._state = state
+        ret._seen = 0
+    return ret
+
+
+def _sum_update(state, value):
+    total, count = state
+    try:
+        # iterable, sum with sum function
+        iter(value)
+        return total + sum(value), count + len(value)
+    except TypeError:
+        # not iterable, sum by value
+        return total + value, count + 1
 
 
 def RollingCount(node):
-    raise NotImplementedError()
+    """Node to count new values of the input node
+
+    Args:
+        node (Node): input node
+    """
+    return _rolling(node, "Count", lambda count, value: count + 1, 0)
 
 
 def RollingMax(node):
-    raise NotImplementedError()
+    """Node to take rolling max of values of the input node
+
+    Args:
+        node (Node): input node
+    """
+    return _rolling(
+        node,
+        "Max",
+        lambda state, value: value if state is None else max(state, value),
+        None,
+    )
 
 
 def RollingMin(node):
-    raise NotImplementedError()
+    """Node to take rolling min of values of the input node
+
+    Args:
+        node (Node): input node
+    """
+    return _rolling(
+        node,
+        "Min",
+        lambda state, value: value if state is None else min(state, value),
+        None,
+    )
 
 
 def RollingSum(node):
-    raise NotImplementedError()
+    """Node to take rolling sum of values of the input node
+
+    If value is iterable, will do += sum(value). If value
+    is not iterable, will do += value.
+
+    Args:
+        node (Node): input node
+    """
+    return _rolling(node, "Sum", _sum_update, (0, 0), lambda state: state[0])
 
 
 def RollingAverage(node):
-    raise NotImplementedError()
+    """Node to take the running average of values of the input node
+
+    If value is iterable, will do (sum + sum(value))/(count+len(value)).
+    If value is not iterable, will do (sum + value)/(count + 1)
+
+    Args:
+        node (Node): input node
+    """
+    return _rolling(
+        node,
+        "Average",
+        _sum_update,
+        (0, 0),
+        lambda state: state[0] / state[1] if state[1] > 0 else float("nan"),
+    )
 
 
 def SMA(node, window_width=10, full_only=False):
-    raise NotImplementedError()
+    """Node to take the simple moving average over a window of values
+
+    Arguments:
+        node (node): input node
+        window_width (int): size of window to use
+        full_only (bool): only return if window is full
+    """
+
+    def update(state, value):
+        window, total = state
+        if len(window) == window_width:
+            total -= window[0]
+        window.append(value)
+        return window, total + value
+
+    def result(state):
+        window, total = state
+        if full_only and len(window) < window_width:
+            return None
+        return total / len(window) if len(window) > 0 else float("nan")
+
+    return _rolling(
+        node,
+        "SMA[{},{}]".format(window_width, full_only),
+        update,
+        (deque(maxlen=window_width), 0),
+        result,
+    )
 
 
 def EMA(node, window_width=10, full_only=False, alpha=None, adjust=False):
-    raise NotImplementedError()
+    """Node to take the exponential moving average of values, matching
+    `pd.Series.ewm(span=window_width, adjust=adjust).mean()`
+    (or `ewm(alpha=alpha, ...)` if alpha is provided)
+
+    Arguments:
+        node (node): input node
+        window_width (int): span of the average
+        full_only (bool): only return once window_width values have been seen
+        alpha (float): smoothing factor, overrides window_width
+        adjust (bool): divide by decaying adjustment factor, as in pandas
+    """
+    mult = alpha if alpha is not None else 2 / (window_width + 1)
+
+    def update(state, value):
+        numerator, denominator, count = state
+
+        if adjust:
+            # weighted average of all values, with weights (1 - mult)^i
+            return (
+                numerator * (1 - mult) + value,
+                denominator * (1 - mult) + 1,
+                count + 1,
+            )
+
+        if count == 0:
+            return value, 1, 1
+        return numerator * (1 - mult) + value * mult, 1, count + 1
+
+    def result(state):
+        numerator, denominator, count = state
+        if count == 0 or (full_only and count < window_width):
+            return None
+        return numerator / denominator
+
+    return _rolling(
+        node,
+        "EMA[{},{},{},{}]".format(window_width, full_only, alpha, adjust),
+        update,
+        (0, 0, 0),
+        result,
+    )
+
+
+def _last_update(state, value):
+    try:
+        iter(value)
+        return value[-1]
+    except TypeError:
+        return value
 
 
 def Last(node):
-    raise NotImplementedError()
+    """
+    Node to return the last value encountered
+    """
+    return _rolling(node, "Last", _last_update, None)
 
 
 def First(node):
-    raise NotImplementedError()
+    """
+    Node to return the first value encountered
+    """
+
+    def update(state, value):
+        if state[0]:
+            return state
+        try:
+            iter(value)
+            return True, value[0]
+        except TypeError:
+            return True, value
+
+    return _rolling(node, "First", update, (False, None), lambda state: state[1])
 
 
 def Diff(node):
-    raise NotImplementedError()
+    """
+    Node to return the diff between values
+    """
+
+    def update(state, value):
+        last, _ = state
+        if last is None:
+            return value, None
+        return value, value - last
+
+    return _rolling(node, "Diff", update, (None, None), lambda state: state[1])
 
 
 Node.rollingCount = RollingCount
@@ -1,4 +1,6 @@
 class _DagreD3Mixin(object):
+    __slots__ = ()
+
     def _greendd3g(self):
         if self._dd3g:
             self._dd3g.setNode(
@@ -1,7 +1,6 @@
 import types
 from .node import Node  # noqa: F401
 from ..base import TributaryException
-from ..utils import _compare
 
 
 class LazyGraph(object):
@@ -87,7 +86,7 @@ class LazyGraph(object):
             elif isinstance(value, Node):
                 raise TributaryException("Cannot set to node")
             else:
-                node._dirty = _compare(node.value(), value)
+                node._dirty = node._compare(value, node.value())
                 node._setValue(value)
         else:
             super(LazyGraph, self).__setattr__(name, value)
@@ -1,17 +1,62 @@
 import inspect
-import uuid
-from collections import namedtuple
+import itertools
+from types import MappingProxyType
 
 from ..base import TributaryException
 
 # from boltons.funcutils import wraps
-from ..utils import _compare, _either_type, _ismethod
+from ..utils import _either_type, _get_compare, _ismethod, _signature
 from .dd3 import _DagreD3Mixin
 
+# nodes are numbered in order of construction
+_NODE_IDS = itertools.count()
+
+# shared by nodes without a callable, never modified
+_NO_ARGS = ()
+_NO_KWARGS = MappingProxyType({})
+
 
 class Node(_DagreD3Mixin):
     """Class to represent an operation that is lazy"""
 
+    __slots__ = (
+        "_id",
+        "_name",
+        "_graphvizshape",
+        "_dd3g",
+        "_values",
+        "_use_dual",
+        "_compare",
+        "_executor",
+        "_vectorized",
+        "_gradient",
+        "_constant",
+        "_callable_is_method",
+        "_callable",
+        "_callable_args",
+        "_callable_kwargs",
+        "_args_mapping",
+        "_upstream",
+        "_dynamic",
+        "_parents",
+        "_self_reference",
+        "_node_op_cache",
+        "_tweaks",
+        "_dependencies",
+        "_dependencies_stashed",
+        "_is_dirty",
+        # recompute wrapped in a cache, e.g. by `Expire`
+        "_cached_recompute",
+        # only set by the nodes using them, e.g. state of rolling nodes
+        "_state",
+        "_seen",
+        "_last",
+        "_source",
+        "_accum",
+        "_persistent_store",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         value=None,
@@ -35,16 +80,19 @@ class Node(_DagreD3Mixin):
             callable_args (tuple): args for the wrapped callable
             callable_kwargs (dict): kwargs for the wrapped callable
             dynamic (bool): node should not be lazy - always access underlying value
+            compare (Union[str, callable]): how to detect that the node's value has changed,
+                                            in ("tolerance", "identity", "version", "hash"),
+                                            or a callable taking (new_value, old_value)
         """
         # ID is unique identifier of the node
-        self._id = str(uuid.uuid4())
+        self._id = next(_NODE_IDS)
 
         # Name is a string for display
         self._name = "{}#{}".format(
             name
             or (callable.__name__ if callable else None)
             or self.__class__.__name__,
-            self._id[:5],
+            self._id,
         )
 
         if isinstance(value, Node):
@@ -59,63 +107,49 @@ class Node(_DagreD3Mixin):
         # if using dagre-d3, this will be set
         self._dd3g = None
 
+        # see `Expire` and `Interval`
+        self._cached_recompute = None
+
         # starting value
         self._values = []
 
         # use dual number operators
         self._use_dual = kwargs.get("use_dual", False)
 
-        # threshold for calculating difference
-        self._compare = _compare
+        # change detection, defaults to numerical comparison within a threshold
+        self._compare = _get_compare(kwargs.get("compare", None))
+
+        # executor to evaluate independent dirty upstream subtrees on, opt-in
+        self._executor = kwargs.get("executor", None)
+
+        # numpy equivalent of the callable, used to compile vectorized functions
+        self._vectorized = kwargs.get("vectorized", None)
+
+        # partial derivatives of the callable w.r.t. its arguments, used for reverse-mode autodiff
+        self._gradient = kwargs.get("gradient", None)
+
+        # node is a constant operand, rather than an input
+        self._constant = kwargs.get("constant", False)
 
         # callable and args
-        self._callable_is_method = _ismethod(callable)
+        self._callable_is_method = callable is not None and _ismethod(callable)
         self._callable = callable
 
         # map arguments of callable to nodes
-        self._callable_args = callable_args or []
-        self._callable_kwargs = callable_kwargs or {}
-
-        # callable_args_mapping maps the wrapped functions'
-        # arguments to nodes. It does so in 2 ways, either
-        # via the argument node's name, or the wrapped
-        # function's argument name
-        #
-        # e.g. if i have lambda x, y: x + y
-        # where x is set to a Node(name="One")
-        # and y is set to a Node(name="Two"),
-        # callable_args_mapping looks like:
-        # {0: {"node": "One", "arg": "x"},
-        #  1: {"node": "Two", "arg": "y"}}
-        #
-        # this way i can pass (x=5) or (One=5)
-        # to modify the node's value
-        self._callable_args_mapping = {}
+        self._callable_args = callable_args or ([] if callable else _NO_ARGS)
+        self._callable_kwargs = callable_kwargs or ({} if callable else _NO_KWARGS)
 
-        # map positional to kw
-        if callable is not None and not inspect.isgeneratorfunction(callable):
-            # wrap args and kwargs of function to node
-            try:
-                signature = inspect.signature(callable)
-
-            except ValueError:
-                # https://bugs.python.org/issue20189
-                signature = namedtuple("Signature", ["parameters"])({})
-
-            parameters = [
-                p
-                for p in signature.parameters.values()
-                if p.kind
-                not in (
-                    inspect._ParameterKind.VAR_POSITIONAL,
-                    inspect._ParameterKind.VAR_KEYWORD,
-                )
-            ]
+        # mapping of callable's arguments to names, built on first
+        # use, see `_callable_args_mapping`
+        self._args_mapping = None
 
-            # map argument index to name of argument, for later use
-            self._callable_args_mapping = {
-                i: {"arg": arg.name} for i, arg in enumerate(parameters)
-            }
+        is_generator = callable is not None and inspect.isgeneratorfunction(callable)
+
+        # map positional to kw
+        if callable is not None and not is_generator:
+            # wrap args and kwargs of function to node, as (name, default)
+            # pairs, with whether the callable takes varargs
+            parameters, varargs = _signature(callable)
 
             # first, iterate through callable_args and callable_kwargs and convert to nodes
             for i, arg in enumerate(self._callable_args):
@@ -123,20 +157,12 @@ class Node(_DagreD3Mixin):
                 if not isinstance(arg, Node):
                     # see if arg in argspec
                     if i < len(parameters):
-                        name = parameters[i].name
+                        name = parameters[i][0]
                     else:
                         name = "vararg"
 
                     self._callable_args[i] = Node(name=name, value=arg)
 
-                # ensure arg can be passed by either node name, or arg name
-                if i not in self._callable_args_mapping:
-                    # varargs, disallow by arg
-                    self._callable_args_mapping[i] = {}
-                self._callable_args_mapping[i]["node"] = self._callable_args[
-                    i
-                ]._name_no_id()
-
             # first, iterate through callable_args and callable_kwargs and convert to nodes
             for name, kwarg in self._callable_kwargs.items():
                 if not isinstance(kwarg, Node):
@@ -144,32 +170,30 @@ class Node(_DagreD3Mixin):
 
             # now iterate through callable's args and ensure
             # everything is matched up
-            for i, arg in enumerate(parameters):
-                if arg.name == "self":
+            for i, (arg_name, default) in enumerate(parameters):
+                if arg_name == "self":
                     # skip
                     continue
 
                 # passed in as arg
-                if i < len(self._callable_args) or arg.name in self._callable_kwargs:
+                if i < len(self._callable_args) or arg_name in self._callable_kwargs:
                     # arg is passed in args/kwargs, continue
                     continue
 
                 # arg not accounted for, see if it has a default in the callable
                 # convert to node
-                node = Node(name=arg.name, derived=True, value=arg.default)
+                node = Node(name=arg_name, derived=True, value=default)
 
                 # set in kwargs
-                self._callable_kwargs[arg.name] = node
+                self._callable_kwargs[arg_name] = node
 
-            # compare filtered parameters to original
-            if len(parameters) != len(signature.parameters):
+            named = len([arg for arg, _ in parameters if arg != "self"])
+            if varargs:
                 # if varargs, can have more callable_args + callable_kwargs than listed arguments
-                failif = len([arg for arg in parameters if arg.name != "self"]) > (
-                    len(self._callable_args) + len(self._callable_kwargs)
-                )
+                failif = named > (len(self._callable_args) + len(self._callable_kwargs))
             else:
                 # should be exactly equal
-                failif = len([arg for arg in parameters if arg.name != "self"]) != (
+                failif = named != (
                     len(self._callable_args) + len(self._callable_kwargs)
                 )
 
@@ -183,8 +207,14 @@ class Node(_DagreD3Mixin):
                 )
 
             try:
-                self._callable._node_wrapper = None  # not known until program start
+                # plain functions accept attributes, so don't allocate
+                # one here. others are checked, and wrapped if necessary
+                if not inspect.isfunction(self._callable):
+                    self._callable._node_wrapper = None  # not known until program start
             except AttributeError:
+                # map arguments of the original callable
+                self._args_mapping = self._map_args(parameters)
+
                 # can't set attributes on certain functions, so wrap with lambda
                 if self._callable_is_method:
                     self._callable = lambda self, *args, **kwargs: callable(
@@ -197,6 +227,7 @@ class Node(_DagreD3Mixin):
         elif callable is not None:
             self._callable_args = callable_args or []
             self._callable_kwargs = callable_kwargs or {}
+            self._args_mapping = {}
 
             # FIXME this wont work for attribute inputs
             def _callable(gen=callable(*self._callable_args, **self._callable_kwargs)):
@@ -211,26 +242,24 @@ class Node(_DagreD3Mixin):
             self._callable = _callable
 
         # list out all upstream nodes
-        self._upstream = list(self._callable_args) + list(
-            self._callable_kwargs.values()
+        self._upstream = (
+            list(self._callable_args) + list(self._callable_kwargs.values())
+            if callable is not None
+            else _NO_ARGS
         )
 
         # if always dirty, always reevaluate
         # self._dynamic = dynamic  # or self._callable is not None
-        self._dynamic = (
-            dynamic
-            or (self._callable and inspect.isgeneratorfunction(callable))
-            or False
-        )
+        self._dynamic = dynamic or is_generator
 
-        # parent nodes in graph
-        self._parents = []
+        # parent nodes in graph, created when first added
+        self._parents = None
 
         # self reference for method calls
         self._self_reference = self
 
-        # cache node operations that have already been done
-        self._node_op_cache = {}
+        # cache node operations that have already been done, created on first use
+        self._node_op_cache = None
 
         # tweaks
         self._tweaks = None
@@ -241,14 +270,14 @@ class Node(_DagreD3Mixin):
                 self._callable: (self._callable_args, self._callable_kwargs)
             }
         else:
-            self._dependencies = {}
+            self._dependencies = _NO_KWARGS
 
             # insert initial value
             self._setValue(value)
 
         # use this variable when manually overriding
         # a callable to have a fixed value
-        self._dependencies_stashed = {}
+        self._dependencies_stashed = None
 
         # if derived node, default to dirty to start
         if derived or self._callable is not None:
@@ -256,6 +285,37 @@ class Node(_DagreD3Mixin):
         else:
             self._dirty = False
 
+    def _map_args(self, parameters):
+        """map the wrapped functions' arguments to nodes. It does so in 2 ways,
+        either via the argument node's name, or the wrapped function's argument name
+
+        e.g. if i have lambda x, y: x + y
+        where x is set to a Node(name="One")
+        and y is set to a Node(name="Two"),
+        callable_args_mapping looks like:
+        {0: {"node": "One", "arg": "x"},
+         1: {"node": "Two", "arg": "y"}}
+
+        this way i can pass (x=5) or (One=5)
+        to modify the node's value
+        """
+        # map argument index to name of argument
+        mapping = {i: {"arg": arg_name} for i, (arg_name, _) in enumerate(parameters)}
+
+        for i, arg in enumerate(self._callable_args):
+            # ensure arg can be passed by either node name, or arg name
+            # (if varargs, disallow by arg)
+            mapping.setdefault(i, {})["node"] = arg._name_no_id()
+        return mapping
+
+    @property
+    def _callable_args_mapping(self):
+        if self._args_mapping is None:
+            self._args_mapping = (
+                self._map_args(_signature(self._callable)[0]) if self._callable else {}
+            )
+        return self._args_mapping
+
     def inputs(self, name=""):
         """get node inputs, optionally by name"""
         dat = {n._name_no_id(): n for n in self._upstream}
@@ -320,6 +380,14 @@ class Node(_DagreD3Mixin):
         # TODO another way of doing this?
         self._dirty = True
 
+    def _add_parent(self, parent):
+        if self._parents is None:
+            self._parents = [parent]
+
+        # nodes overload ==, so compare by identity
+        elif not any(p is parent for p in self._parents):
+            self._parents.append(parent)
+
     def _compute_from_dependencies(self, node_tweaks):
         """recompute node's value from its dependencies, applying any temporary tweaks as necessary"""
 
@@ -332,16 +400,20 @@ class Node(_DagreD3Mixin):
             # mark graph as calculating
             self._greendd3g()
 
+            # if running in parallel, compute independent dirty subtrees
+            # on the executor first, and skip them below
+            recomputed = self._parallel_recompute(node_tweaks)
+
             # iterate through upstream deps
             for deps in self._dependencies.values():
                 # recompute args
                 for arg in deps[0]:
                     # recompute
-                    arg._recompute(node_tweaks)
+                    if id(arg) not in recomputed:
+                        arg._recompute(node_tweaks)
 
                     # Set yourself as parent if not set
-                    if self not in arg._parents:
-                        arg._parents.append(self)
+                    arg._add_parent(self)
 
                     # mark as tweaking
                     if node_tweaks:
@@ -350,11 +422,11 @@ class Node(_DagreD3Mixin):
                 # recompute kwargs
                 for kwarg in deps[1].values():
                     # recompute
-                    kwarg._recompute(node_tweaks)
+                    if id(kwarg) not in recomputed:
+                        kwarg._recompute(node_tweaks)
 
                     # Set yourself as parent if not set
-                    if self not in kwarg._parents:
-                        kwarg._parents.append(self)
+                    kwarg._add_parent(self)
 
                     # mark as tweaking
                     if node_tweaks:
@@ -408,6 +480,85 @@ class Node(_DagreD3Mixin):
         # return my value
         return self.value()
 
+    def _dirty_closure(self, dirty=None, visited=None):
+        """collect the ids of the nodes in this node's upstream subtree, including itself,
+        that need to be recomputed. Unlike `isDirty`, this doesn't mark any node as dirty."""
+        dirty = set() if dirty is None else dirty
+        visited = set() if visited is None else visited
+
+        if id(self) in visited:
+            return dirty
+
+        visited.add(id(self))
+
+        upstream = []
+        for call, deps in self._dependencies.items():
+            # callable node
+            if getattr(call, "_node_wrapper", None) is not None:
+                upstream.append(call._node_wrapper)
+
+            upstream.extend(deps[0])
+            upstream.extend(deps[1].values())
+
+        for node in upstream:
+            node._dirty_closure(dirty, visited)
+
+        if self._dirty or self._dynamic or any(id(node) in dirty for node in upstream):
+            dirty.add(id(self))
+        return dirty
+
+    def _parallel_recompute(self, node_tweaks):
+        """recompute independent dirty upstream subtrees concurrently on the node's executor.
+
+        Only the node's direct dependencies are submitted, each recomputing its own
+        subtree serially. Upstream nodes whose dirty subtrees overlap are grouped together and
+        recomputed within a single task, so that no node is ever evaluated from two
+        workers at once. Clean upstream nodes are left alone.
+
+        Returns:
+            set: ids of the upstream nodes that were recomputed
+        """
+        if self._executor is None or node_tweaks:
+            # tweaks mutate shared state on upstream nodes, so always run serially
+            return set()
+
+        # list of (ids of dirty nodes in subtrees, upstream nodes to recompute)
+        groups = []
+
+        for deps in self._dependencies.values():
+            for node in list(deps[0]) + list(deps[1].values()):
+                closure = node._dirty_closure()
+
+                if not closure:
+                    # clean, nothing to do
+                    continue
+
+                # merge with any groups that share a dirty node
+                members, nodes = closure, [node]
+                for group in [g for g in groups if g[0] & closure]:
+                    groups.remove(group)
+                    members = members | group[0]
+                    nodes = group[1] + [
+                        n for n in nodes if all(n is not m for m in group[1])
+                    ]
+                groups.append((members, nodes))
+
+        if len(groups) < 2:
+            # nothing to parallelize
+            return set()
+
+        def _recompute_all(nodes, node_tweaks=node_tweaks):
+            for node in nodes:
+                node._recompute(node_tweaks)
+
+        futures = [self._executor.submit(_recompute_all, nodes) for _, nodes in groups]
+
+        for future in futures:
+            # raise any exceptions from workers
+            future.result()
+
+        return set(id(node) for _, nodes in groups for node in nodes)
+
     def _subtree_dirty(self, node_tweaks):
         for call, deps in self._dependencies.items():
             # callable node
@@ -446,7 +597,7 @@ class Node(_DagreD3Mixin):
 
         if self in node_tweaks:
             # return dirty but don't set
-            return _compare(node_tweaks[self], self.value())
+            return self._compare(node_tweaks[self], self.value())
 
         self._dirty = self._dirty or self._subtree_dirty(node_tweaks) or self._dynamic
         return self._dirty
@@ -457,26 +608,33 @@ class Node(_DagreD3Mixin):
 
     def _recompute(self, node_tweaks):
         """returns result of computation"""
+        if self._cached_recompute is not None:
+            return self._cached_recompute(node_tweaks)
+        return self._recompute_uncached(node_tweaks)
+
+    def _recompute_uncached(self, node_tweaks):
+        """returns result of computation, ignoring any cache"""
         # check if self or upstream dirty
         self.isDirty(node_tweaks)
 
         # if i'm dirty, recompute my value
         if self._dirty:
+            # computing from dependencies sets my value
+            # (if not tweaking), so keep the old one
+            old_value = self.value()
+
             # compute upstream and then apply to self
             new_value = self._compute_from_dependencies(node_tweaks)
 
-            # if my new value is not equal to my old value,
-            # make sure to indicate that i was really dirty
-            if self._compare(new_value, self.value()):
+            # if my new value is not equal to my old value (or i'm a
+            # leaf whose value was set directly), make sure to indicate
+            # that i was really dirty
+            if not self._dependencies or self._compare(new_value, old_value):
                 # mark my parents as dirty
                 if self._parents:
                     for parent in self._parents:
                         # let your parents know you were dirty!
                         parent._dirty = True
-
-                # set my value if not tweaking
-                if not node_tweaks:
-                    self._setValue(new_value)
         else:
             new_value = self.value()
 
@@ -486,26 +644,60 @@ class Node(_DagreD3Mixin):
         # return result of computation
         return new_value
 
-    def _gennode(self, name, foo, foo_args, **kwargs):
-        if name not in self._node_op_cache:
-            self._node_op_cache[name] = Node(
-                name=name,
+    def _gennode(self, name, foo, foo_args, key=None, **kwargs):
+        """Return the derived node computing `foo` over `foo_args`, constructing it if necessary.
+
+        Derived nodes are cached structurally, on the operation (`key`, or `name`
+        if not provided) and the identities of the operands, so that building the same
+        subexpression twice yields the same node. The cached node keeps its operands
+        alive, so their identities can't be reused while it is in the cache.
+
+        Args:
+            name (Union[str, callable]): name of the derived node, or a callable
+                                         returning the name, evaluated only when
+                                         the node is constructed
+            foo (callable): callable to wrap
+            foo_args (list): operands of the callable
+            key (hashable): identity of the operation, if different from `name`
+        """
+        key = (name if key is None else key,) + tuple(id(arg) for arg in foo_args)
+
+        if self._node_op_cache is None:
+            self._node_op_cache = {}
+
+        if key not in self._node_op_cache:
+            self._node_op_cache[key] = Node(
+                name=name() if callable(name) else name,
                 derived=True,
                 callable=foo,
                 callable_args=foo_args,
                 override_callable_dirty=True,
                 **kwargs,
             )
-        return self._node_op_cache[name]
+        return self._node_op_cache[key]
 
     def _tonode(self, other):
         if isinstance(other, Node):
             return other
-        if str(other) not in self._node_op_cache:
-            self._node_op_cache[str(other)] = Node(
-                name="var(" + str(other)[:5] + ")", derived=True, value=other
+
+        # key constants by value if hashable, otherwise by identity
+        try:
+            key = ("value", type(other), other)
+            hash(key)
+        except TypeError:
+            key = ("id", type(other), id(other))
+
+        if self._node_op_cache is None:
+            self._node_op_cache = {}
+
+        if key not in self._node_op_cache:
+            self._node_op_cache[key] = Node(
+                name="var(" + str(other)[:5] + ")",
+                derived=True,
+                value=other,
+                constant=True,
             )
-        return self._node_op_cache[str(other)]
+        return self._node_op_cache[key]
 
     def setValue(self, value):
         """set the node's value, marking it as dirty as appropriate.
@@ -517,7 +709,7 @@ class Node(_DagreD3Mixin):
                 self._dependencies_stashed = self._dependencies
 
                 # reset to empty
-                self._dependencies = {}
+                self._dependencies = _NO_KWARGS
 
                 # mark as not dynamic anymore
                 self._dynamic = False
@@ -536,7 +728,7 @@ class Node(_DagreD3Mixin):
             self._dependencies = self._dependencies_stashed
 
             # clear out stashed
-            self._dependencies_stashed = {}
+            self._dependencies_stashed = None
 
             # mark as dynamic again
             self._dynamic = True
@@ -670,6 +862,130 @@ class Node(_DagreD3Mixin):
         # assert self.value() == computed
         return self.value()
 
+    def _operator_order(self, inputs, attr):
+        """Return the nodes of the operator graph ending at this node, each after
+        all of its dependencies, stopping at `inputs`. Every other node with
+        dependencies must have `attr` set, e.g. the numpy equivalent of its operator,
+        and only positional dependencies, which are the operands passed to it"""
+        # nodes overload ==, so compare by id
+        input_ids = set(id(node) for node in inputs)
+
+        # walk graph iteratively (graphs can be deep)
+        order = []
+        visited = set()
+        stack = [(self, False)]
+
+        while stack:
+            node, expanded = stack.pop()
+
+            if id(node) in visited:
+                continue
+
+            deps = []
+            if node._dependencies and id(node) not in input_ids:
+                deps, kwargs = list(node._dependencies.values())[0]
+                if getattr(node, attr) is None or node._use_dual or kwargs:
+                    raise TributaryException("Unsupported operator: {}".format(node))
+
+            if expanded or not deps:
+                visited.add(id(node))
+                order.append(node)
+                continue
+
+            stack.append((node, True))
+            for dep in reversed(deps):
+                stack.append((dep, False))
+        return order
+
+    def compile(self, *inputs):
+        """Compile the graph of operators ending at this node into a single function
+        over its inputs, using the numpy equivalent of every operator. Calling this
+        function with arrays of inputs evaluates the graph over every row at once.
+
+        Upstream nodes which aren't inputs are treated as constants, and their
+        current values are read every time the compiled function is called.
+
+        Args:
+            inputs (Node): input nodes, in the order they are passed to the compiled function.
+                           Defaults to all leaf nodes that aren't constant operands.
+        Returns:
+            callable: function taking one value per input, available as its `inputs` attribute
+        """
+        order = self._operator_order(inputs, "_vectorized")
+
+        if not inputs:
+            inputs = [n for n in order if not n._dependencies and not n._constant]
+
+        # map node to index in list of values
+        slots = {id(node): i for i, node in enumerate(inputs)}
+
+        # list of (callable, indices of arguments)
+        steps = []
+
+        for node in order:
+            if id(node) in slots:
+                continue
+
+            if node._dependencies:
+                deps = list(node._dependencies.values())[0][0]
+                steps.append((node._vectorized, [slots[id(dep)] for dep in deps]))
+            else:
+                # constant, read current value
+                steps.append((node.value, []))
+
+            slots[id(node)] = len(slots)
+
+        def _compiled(*values):
+            if len(values) != len(inputs):
+                raise TributaryException(
+                    "Expected {} inputs, got {}".format(len(inputs), len(values))
+                )
+
+            values = list(values)
+            for foo, args in steps:
+                values.append(foo(*(values[i] for i in args)))
+            return values[slots[id(self)]]
+
+        _compiled.inputs = list(inputs)
+        return _compiled
+
+    def gradient(self, *inputs):
+        """Compute the derivatives of this node's value with respect to its inputs,
+        in a single reverse (adjoint) sweep over the graph of operators ending at
+        this node. The node is evaluated first, if necessary.
+
+        Args:
+            inputs (Node): nodes to differentiate with respect to.
+                           Defaults to all leaf nodes that aren't constant operands.
+        Returns:
+            dict: mapping of input node to derivative
+        """
+        self()
+
+        order = self._operator_order(inputs, "_gradient")
+
+        if not inputs:
+            inputs = [n for n in order if not n._dependencies and not n._constant]
+
+        input_ids = set(id(node) for node in inputs)
+
+        # map node id to derivative of this node w.r.t. that node
+        adjoints = {id(self): 1.0}
+
+        for node in reversed(order):
+            adjoint = adjoints.get(id(node))
+
+            if adjoint is None or not node._dependencies or id(node) in input_ids:
+                continue
+
+            deps = list(node._dependencies.values())[0][0]
+            partials = node._gradient(*(dep.value() for dep in deps), node.value())
+
+            for dep, partial in zip(deps, partials):
+                adjoints[id(dep)] = adjoints.get(id(dep), 0.0) + adjoint * partial
+
+        return {node: adjoints.get(id(node), 0.0) for node in inputs}
+
     def evaluate(self, node_tweaks=None, *positional_tweaks, **keyword_tweaks):
         return self(node_tweaks, *positional_tweaks, **keyword_tweaks)
 
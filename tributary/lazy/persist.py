@@ -0,0 +1,213 @@
+import hashlib
+import os.path
+import pickle
+import sqlite3
+import threading
+import time
+import weakref
+from .node import Node
+from ..base import TributaryException
+from ..utils import _hash_value
+
+
+# sentinel for cache misses, since None is a valid node value
+_MISS = object()
+
+
+class PersistentStore(object):
+    """SQLite-backed store of lazy node results, keyed by
+    node key and a fingerprint of the node's input values.
+
+    Entries are evicted least-recently-used first once the total
+    size of the stored (pickled) values exceeds `max_size` bytes.
+
+    The connection is closed by `close`, on leaving a `with` block,
+    or once the store is garbage collected.
+
+    Args:
+        path (str): path to sqlite database file, created if it doesn't exist
+        max_size (int): maximum total size of stored values, in bytes
+    """
+
+    def __init__(self, path, max_size=1 << 30):
+        self._path = path
+        self._max_size = max_size
+
+        # nodes may be evaluated from multiple threads, see `Parallel`
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT, fingerprint BLOB, value BLOB, size INTEGER, accessed REAL, "
+                "PRIMARY KEY (key, fingerprint))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+
+    def get(self, key, fingerprint, default=None):
+        """get the stored value for key and fingerprint, or `default` if not stored"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ? AND fingerprint = ?",
+                (key, fingerprint),
+            ).fetchone()
+
+            if row is None:
+                return default
+
+            self._conn.execute(
+                "UPDATE results SET accessed = ? WHERE key = ? AND fingerprint = ?",
+                (time.time(), key, fingerprint),
+            )
+        return pickle.loads(row[0])
+
+    def set(self, key, fingerprint, value):
+        """store value for key and fingerprint, evicting old entries as necessary.
+        Returns false if value couldn't be stored"""
+        try:
+            data = pickle.dumps(value)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # can't persist, will just be recomputed
+            return False
+
+        if len(data) > self._max_size:
+            return False
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, fingerprint, data, len(data), time.time()),
+            )
+            self._evict()
+        return True
+
+    def _evict(self):
+        """delete least recently used entries until under max size"""
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+
+        if total <= self._max_size:
+            return
+
+        to_delete = []
+        for rowid, size in self._conn.execute(
+            "SELECT rowid, size FROM results ORDER BY accessed"
+        ):
+            if total <= self._max_size:
+                break
+            to_delete.append((rowid,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM results WHERE rowid = ?", to_delete)
+
+    def size(self):
+        """total size of stored values, in bytes"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+
+    def clear(self):
+        """remove all stored values"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        """close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+        # don't hand out a closed store
+        if _STORES.get(os.path.abspath(self._path)) is self:
+            del _STORES[os.path.abspath(self._path)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# stores by path, so nodes persisting to the same file share a connection
+# while any of them are alive
+_STORES = weakref.WeakValueDictionary()
+
+
+def _fingerprint(args, kwargs):
+    """digest of the values of upstream nodes, or None if any
+    of them can't be digested deterministically"""
+    digest = hashlib.blake2b()
+
+    for name, arg in list(enumerate(args)) + list(kwargs.items()):
+        if not isinstance(arg, Node):
+            # e.g. self for methods
+            continue
+
+        value_digest = _hash_value(arg.value())
+        if value_digest is None:
+            return None
+
+        digest.update(repr(name).encode() + b":")
+        digest.update(value_digest)
+    return digest.digest()
+
+
+def Persist(node, store, key, max_size=1 << 30):
+    """Persist a node's results to disk, so that they can be reused across restarts.
+
+    Results are keyed by `key` and a fingerprint of the node's input values. When the
+    node is dirty and needs to be recomputed, the store is checked first, and the wrapped
+    callable is only called if there is no stored result for the current inputs. Inputs
+    without a deterministic fingerprint, e.g. arbitrary objects, bypass the store.
+
+    Arguments:
+        node (node): node to persist, must wrap a callable
+        store (Union[str, PersistentStore]): path to sqlite database, or store instance
+        key (str): key to identify node across restarts. This must be stable, and
+                   unique among the nodes using the store.
+        max_size (int): if constructing a new store, maximum total size in bytes
+    """
+    if not node._dependencies or node._dynamic:
+        raise TributaryException("Can only persist static nodes wrapping a callable")
+
+    if not key:
+        raise TributaryException("Must provide a key to persist a node")
+
+    if not isinstance(store, PersistentStore):
+        path = os.path.abspath(store)
+        store = _STORES.get(path)
+        if store is None:
+            store = _STORES[path] = PersistentStore(path, max_size=max_size)
+
+    kallable = list(node._dependencies.keys())[0]
+
+    def _persisted(*args, **kwargs):
+        fingerprint = _fingerprint(args, kwargs)
+
+        if fingerprint is None:
+            # can't tell inputs apart across restarts, don't persist
+            return kallable(*args, **kwargs)
+
+        value = store.get(key, fingerprint, _MISS)
+
+        if value is _MISS:
+            value = kallable(*args, **kwargs)
+
+            if not isinstance(value, Node):
+                store.set(key, fingerprint, value)
+
+        return value
+
+    # preserve node wrapper for callables that return nodes
+    _persisted._node_wrapper = getattr(kallable, "_node_wrapper", None)
+
+    node._dependencies = {_persisted: node._dependencies[kallable]}
+    node._persistent_store = store
+    return node
+
+
+Node.persist = Persist
@@ -1,5 +1,11 @@
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from temporalcache import interval, expire
 from .base import Node
+from .persist import _fingerprint
+from ..base import TributaryException
 
 
 def Expire(
@@ -25,11 +31,8 @@ def Expire(
         [node],
     )
 
-    # stash original recompute
-    ret._orig_recompute = ret._recompute
-
     # make recompute run on expire
-    ret._recompute = expire(
+    ret._cached_recompute = expire(
         second=second,
         minute=minute,
         hour=hour,
@@ -38,7 +41,7 @@ def Expire(
         week=week,
         month=month,
         maxsize=maxsize,
-    )(ret._recompute)
+    )(ret._recompute_uncached)
     return ret
 
 
@@ -57,11 +60,8 @@ def Interval(
         [node],
     )
 
-    # stash original recompute
-    ret._orig_recompute = ret._recompute
-
     # make recompute run on interval
-    ret._recompute = interval(
+    ret._cached_recompute = interval(
         seconds=seconds,
         minutes=minutes,
         hours=hours,
@@ -70,10 +70,60 @@ def Interval(
         months=months,
         years=years,
         maxsize=maxsize,
-    )(ret._recompute)
+    )(ret._recompute_uncached)
     return ret
 
 
+def Memoize(node, maxsize=128, ttl=None):
+    """Cache a node's results keyed by the values of its upstream dependencies,
+    so that revisiting a previous input state is a lookup instead of a recompute.
+    Inputs without a deterministic digest of their contents, e.g. arbitrary
+    objects, are not cached.
+
+    Arguments:
+        node (node): node to memoize, must wrap a callable
+        maxsize (int): max number of input states to remember, least recently used are evicted first
+        ttl (float): if provided, number of seconds after which a result should be recomputed
+    """
+    if not node._dependencies or node._dynamic:
+        raise TributaryException("Can only memoize static nodes wrapping a callable")
+
+    kallable = list(node._dependencies.keys())[0]
+    cache = OrderedDict()
+
+    def _memoized(*args, **kwargs):
+        # key on a digest of the contents of upstream values, so that
+        # values modified in place don't get a stale result
+        key = _fingerprint(args, kwargs)
+
+        if key is None:
+            # can't tell inputs apart, e.g. arbitrary objects, don't cache
+            return kallable(*args, **kwargs)
+
+        if key in cache:
+            timestamp, value = cache[key]
+
+            if ttl is None or time.monotonic() - timestamp < ttl:
+                cache.move_to_end(key)
+                return value
+
+        value = kallable(*args, **kwargs)
+
+        if not isinstance(value, Node):
+            cache[key] = (time.monotonic(), value)
+            cache.move_to_end(key)
+
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+        return value
+
+    # preserve node wrapper for callables that return nodes
+    _memoized._node_wrapper = getattr(kallable, "_node_wrapper", None)
+
+    node._dependencies = {_memoized: node._dependencies[kallable]}
+    return node
+
+
 def Window(node, size=-1, full_only=False):
     """Lazy wrapper to collect a window of values. If a node is executed 3 times,
     returning 1, 2, 3, then the window node will collect those values in a list.
@@ -108,6 +158,36 @@ def Window(node, size=-1, full_only=False):
     return ret
 
 
+def Parallel(node, executor=None, max_workers=None):
+    """Evaluate the independent dirty upstream subtrees of a node concurrently.
+    When the node is recomputed, upstream dependencies that don't share any dirty
+    nodes are recomputed on the executor and joined before calling the node's callable.
+    Clean upstream dependencies are not resubmitted. Only the node's direct dependencies
+    are parallelized, each of their subtrees is recomputed serially on one worker.
+
+    Note that node state lives in-process, so only thread-based executors are supported.
+
+    Arguments:
+        node (node): node whose upstream dependencies should be evaluated in parallel
+        executor (concurrent.futures.Executor): executor to use, owned by the caller. Defaults to
+                                                a ThreadPoolExecutor owned by the node, shut
+                                                down once the node is garbage collected
+        max_workers (int): if not given an executor, the number of workers to use
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TributaryException("Lazy nodes can only be evaluated on threads")
+
+    if executor is None:
+        # created once and reused across evaluations, workers are started on first use
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        weakref.finalize(node, executor.shutdown, wait=False)
+
+    node._executor = executor
+    return node
+
+
 Node.expire = Expire
 Node.interval = Interval
 Node.window = Window
+Node.memoize = Memoize
+Node.parallel = Parallel
@@ -5,6 +5,8 @@ _DD3_TRANSITION_DELAY = 0.1  # used so you can visually see the
 
 
 class _DagreD3Mixin(object):
+    __slots__ = ()
+
     # ***********************
     # Dagre D3 integration
     # ***********************
@@ -1,8 +1,11 @@
 import asyncio
+import pickle
 import sys
+import time
 from threading import Thread
 
 from ..base import StreamEnd, StreamNone, StreamRepeat, TributaryException  # noqa: F401
+from ..base import _STREAM_END
 
 
 class StreamingGraph(object):
@@ -49,36 +52,165 @@ class StreamingGraph(object):
     def stop(self):
         self._stop = True
 
-    async def _run(self):
+    def checkpoint(self):
+        """return the runtime state of all nodes, by node id. Nodes whose
+        state can't be pickled are skipped, and will resume from scratch"""
+        ret = {}
+        for level in self._nodes:
+            for node in level:
+                try:
+                    ret[node._id] = node.checkpoint()
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    continue
+        return ret
+
+    def restoreCheckpoint(self, checkpoint):
+        """restore the runtime state of nodes from `checkpoint()`, e.g. of a copy
+        of this graph running in another process"""
+        for level in self._nodes:
+            for node in level:
+                if node._id in checkpoint:
+                    node.restoreCheckpoint(checkpoint[node._id])
+
+    async def _start(self, node, timeout):
+        """run a node's onstarts concurrently, within `timeout` seconds"""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(s() for s in node._onstarts)), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TributaryException("Timed out starting node: {}".format(node))
+
+    async def _stopNodes(self, nodes, timeout):
+        """run onstops of all nodes concurrently, within `timeout` seconds.
+        All onstops are run, then the first error (if any) is raised"""
+        calls = [(node, s) for node in nodes for s in node._onstops]
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(s(), timeout) for _, s in calls), return_exceptions=True
+        )
+
+        for (node, _), result in zip(calls, results):
+            if isinstance(result, asyncio.TimeoutError):
+                raise TributaryException("Timed out stopping node: {}".format(node))
+            if isinstance(result, BaseException):
+                raise result
+
+    def _ready(self, starting, node):
+        """check if node has finished starting, raising if it failed to start"""
+        if id(node) not in starting:
+            return True
+
+        _, task = starting[id(node)]
+        if not task.done():
+            return False
+
+        # raise if failed
+        task.result()
+        del starting[id(node)]
+        return True
+
+    def _started(self, starting, node):
+        """check if node finished starting successfully, without raising"""
+        if id(node) not in starting:
+            return True
+
+        _, task = starting[id(node)]
+        return task.done() and not task.cancelled() and task.exception() is None
+
+    async def _run(
+        self,
+        start_timeout=None,
+        stop_timeout=None,
+        oncheckpoint=None,
+        checkpoint_interval=1,
+    ):
         value, last, self._stop = None, None, False
+        next_checkpoint = time.monotonic() + checkpoint_interval
+
+        # start every node's onstarts concurrently, nodes begin ticking
+        # as soon as their own are done rather than waiting for the slowest
+        nodes = [n for level in self._nodes for n in level]
+        starting = {
+            id(n): (n, asyncio.create_task(self._start(n, start_timeout)))
+            for n in nodes
+            if n._onstarts
+        }
+
+        try:
+            while True:
+
+                for level in self._nodes:
+                    if self._stop:
+                        break
+
+                    ready = [n for n in level if self._ready(starting, n)]
+
+                    if ready:
+                        await asyncio.gather(*(asyncio.create_task(n()) for n in ready))
+
+                if starting:
+                    # some nodes can't tick until they finish starting, so wait for
+                    # one to rather than spinning through the started ones
+                    await asyncio.wait(
+                        [task for _, task in starting.values()],
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+
+                self.rebuild()
 
-        # run onstarts
-        await asyncio.gather(*(asyncio.create_task(s()) for s in self._onstarts))
+                if oncheckpoint and time.monotonic() >= next_checkpoint:
+                    # between ticks, so state is consistent across nodes
+                    oncheckpoint(self.checkpoint())
+                    next_checkpoint = time.monotonic() + checkpoint_interval
 
-        while True:
-            for level in self._nodes:
                 if self._stop:
                     break
 
-                await asyncio.gather(*(asyncio.create_task(n()) for n in level))
-
-            self.rebuild()
+                value, last = self._starting_node.value(), value
 
-            if self._stop:
-                break
-
-            value, last = self._starting_node.value(), value
-
-            if isinstance(value, StreamEnd):
-                break
+                if value is _STREAM_END:
+                    break
 
-        # run `onstops`
-        await asyncio.gather(*(asyncio.create_task(s()) for s in self._onstops))
+        finally:
+            # let nodes partway through starting finish, so what they opened gets
+            # closed by their onstops, and only give up on them after `stop_timeout`
+            tasks = [task for _, task in starting.values()]
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=stop_timeout)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            # don't stop nodes that didn't start
+            await self._stopNodes(
+                [n for n in nodes if self._started(starting, n)], stop_timeout
+            )
 
         # return last val
         return last
 
-    def run(self, blocking=True, newloop=False, start=True):
+    def run(
+        self,
+        blocking=True,
+        newloop=False,
+        start=True,
+        start_timeout=None,
+        stop_timeout=None,
+        oncheckpoint=None,
+        checkpoint_interval=1,
+    ):
+        """run the graph
+
+        Args:
+            blocking (bool); block until graph finishes, returning the last value
+            newloop (bool); run in a new event loop
+            start (bool); if not blocking, start running in a background thread
+            start_timeout (float); seconds each node's onstarts have to complete, else raise
+            stop_timeout (float); seconds each onstop has to complete, else raise
+            oncheckpoint (callable); called with `checkpoint()` between ticks, every `checkpoint_interval` seconds
+            checkpoint_interval (float); seconds between checkpoints
+        """
         if sys.platform == "win32":
             # Set to proactor event loop on window
             # (default in python 3.8+)
@@ -94,7 +226,14 @@ class StreamingGraph(object):
 
         asyncio.set_event_loop(loop)
 
-        task = loop.create_task(self._run())
+        task = loop.create_task(
+            self._run(
+                start_timeout=start_timeout,
+                stop_timeout=stop_timeout,
+                oncheckpoint=oncheckpoint,
+                checkpoint_interval=checkpoint_interval,
+            )
+        )
 
         if blocking:
             # block until done
@@ -1,7 +1,13 @@
+from .arrow import Arrow
+from .arrow import Arrow as ArrowSource
+from .arrow import Parquet
+from .arrow import Parquet as ParquetSource
 from .file import File
 from .file import File as FileSource
 from .http import HTTP
 from .http import HTTP as HTTPSource
+from .http import HTTPFanOut
+from .http import HTTPFanOut as HTTPFanOutSource
 from .http import HTTPServer
 from .http import HTTPServer as HTTPServerSource
 from .input import *
@@ -0,0 +1,122 @@
+import asyncio
+from .input import Foo
+from ...base import TributaryException
+
+
+def _format(batch, batch_format):
+    """convert an arrow record batch or table to `batch_format`"""
+    if batch_format == "arrow":
+        return batch
+    if batch_format == "pandas":
+        return batch.to_pandas()
+    return batch.to_pylist()
+
+
+def _select(batch, columns):
+    """project an arrow record batch to `columns`"""
+    if columns is None:
+        return batch
+    return type(batch).from_arrays(
+        [batch.column(c) for c in columns], names=list(columns)
+    )
+
+
+def _parquet(filename, columns, batch_size):
+    """generator of the row groups, or batches of `batch_size` rows, of a parquet file,
+    closing the file once done"""
+    import pyarrow
+    import pyarrow.parquet as pq
+
+    with pyarrow.memory_map(filename) as source:
+        file = pq.ParquetFile(source)
+        if batch_size:
+            yield from file.iter_batches(batch_size=batch_size, columns=columns)
+        else:
+            for i in range(file.num_row_groups):
+                yield file.read_row_group(i, columns=columns)
+
+
+def _arrow(filename, columns):
+    """generator of the record batches of an arrow ipc file, or stream, closing the file
+    once done"""
+    import pyarrow
+    import pyarrow.ipc
+
+    with pyarrow.memory_map(filename) as source:
+        try:
+            reader = pyarrow.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pyarrow.ArrowInvalid:
+            source.seek(0)
+            batches = iter(pyarrow.ipc.open_stream(source))
+
+        for batch in batches:
+            yield _select(batch, columns)
+
+
+class _Columnar(Foo):
+    """yield the batches of a columnar file, read and converted off the event loop"""
+
+    def __init__(self, batches, batch_format):
+        if batch_format not in ("arrow", "pandas", "records"):
+            raise TributaryException("Unknown batch format: {}".format(batch_format))
+
+        def _next(batches):
+            batch = next(batches, None)
+            return None if batch is None else _format(batch, batch_format)
+
+        async def _read():
+            loop = asyncio.get_event_loop()
+            it = await loop.run_in_executor(None, batches)
+
+            try:
+                while True:
+                    batch = await loop.run_in_executor(None, _next, it)
+                    if batch is None:
+                        break
+                    yield batch
+            finally:
+                # unmap the file, e.g. if the graph stops first
+                it.close()
+
+        super().__init__(foo=_read)
+
+
+class Parquet(_Columnar):
+    """Stream a parquet file, by row groups or batches of rows
+
+    Each tick is one row group of the file, or `batch_size` rows if set, so only that much is
+    held in memory at a time. Requires pyarrow.
+
+    Args:
+        filename (str): filename to read
+        columns (list): columns to read, defaults to all
+        batch_size (int): if set, rows per tick instead of one row group per tick
+        batch_format (str): format of yielded batches, one of:
+                                - "arrow": pyarrow RecordBatch, or Table if by row group
+                                - "pandas": pandas DataFrame
+                                - "records": list of dicts, one per row
+    """
+
+    def __init__(self, filename, columns=None, batch_size=None, batch_format="arrow"):
+        super().__init__(lambda: _parquet(filename, columns, batch_size), batch_format)
+        self._name = "Parquet"
+
+
+class Arrow(_Columnar):
+    """Stream an arrow ipc file or stream, by record batches
+
+    The file is memory mapped, and each tick is one record batch. Requires pyarrow.
+
+    Args:
+        filename (str): filename to read
+        columns (list): columns to read, defaults to all
+        batch_format (str): format of yielded batches, one of:
+                                - "arrow": pyarrow RecordBatch
+                                - "pandas": pandas DataFrame
+                                - "records": list of dicts, one per row
+    """
+
+    def __init__(self, filename, columns=None, batch_format="arrow"):
+        super().__init__(lambda: _arrow(filename, columns), batch_format)
+        self._name = "Arrow"
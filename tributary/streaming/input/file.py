@@ -1,31 +1,231 @@
-import aiofiles
-import json as JSON
+import asyncio
+import csv as CSV
+import io
+import mmap
+import os
+import threading
+import time
+from datetime import datetime
 from .input import Foo
+from ...base import TributaryException
+from ...utils import _loads
+
+
+def _line_end(data, quoted):
+    """index just past the last complete line of `data`, or 0 if there is none. If `quoted`,
+    newlines inside double quotes, as in csv, don't end lines"""
+    end = data.rfind(b"\n")
+
+    if quoted:
+        # odd number of quotes before a newline means it's inside a quoted field
+        odd = data.count(b'"', 0, max(end, 0)) % 2
+        while end >= 0 and odd:
+            previous = data.rfind(b"\n", 0, end)
+            odd ^= data.count(b'"', previous + 1, end) % 2
+            end = previous
+
+    return end + 1
+
+
+class _Chunks(object):
+    """Complete lines of a file, `chunk_size` bytes at a time, from a memory map
+
+    Chunks are read with `next`, e.g. on an executor's thread, and the file can be closed
+    with `close` from any thread, waiting for a read in progress.
+    """
+
+    def __init__(self, filename, chunk_size, quoted=False):
+        self._chunk_size = chunk_size
+        self._quoted = quoted
+        self._lock = threading.Lock()
+        self._start = 0
+        self._fp = open(filename, "rb")
+        self._mm = None
+
+        if os.fstat(self._fp.fileno()).st_size > 0:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def next(self):
+        """next chunk, or None once done or closed"""
+        with self._lock:
+            if self._mm is None or self._start >= len(self._mm):
+                return None
+
+            start, size = self._start, len(self._mm)
+            end = min(start + self._chunk_size, size)
+
+            while end < size:
+                # up to the end of the last complete line, reading more if there is none
+                line_end = _line_end(self._mm[start:end], self._quoted)
+                if line_end:
+                    end = start + line_end
+                    break
+                end = min(start + 2 * (end - start), size)
+
+            self._start = end
+            return self._mm[start:end]
+
+    def close(self):
+        """unmap and close the file"""
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            self._fp.close()
+
+
+def _parse(chunk, json, csv, header):
+    """parse a chunk of complete lines into records"""
+    if json:
+        return _loads([line for line in chunk.splitlines() if line.strip()])
+
+    text = chunk.decode("utf-8")
+
+    if csv:
+        rows = [row for row in CSV.reader(io.StringIO(text)) if row]
+        if header is not None:
+            return [dict(zip(header, row)) for row in rows]
+        return rows
+
+    # universal newlines, as in text mode
+    return list(io.StringIO(text, newline=None))
+
+
+def _format(records, batch_format):
+    """convert a list of records to `batch_format`"""
+    if batch_format == "records":
+        return records
+
+    import pandas as pd
+
+    df = pd.DataFrame(records)
+    if batch_format == "pandas":
+        return df
+
+    # arrow
+    import pyarrow
+
+    df.columns = [str(c) for c in df.columns]
+    return pyarrow.RecordBatch.from_pandas(df, preserve_index=False)
+
+
+def _seconds(value):
+    """timestamp in seconds of a number, datetime or string"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (str, bytes)):
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(
+                value.decode() if isinstance(value, bytes) else value
+            ).timestamp()
+    if hasattr(value, "as_py"):
+        # arrow scalar
+        return _seconds(value.as_py())
+    return float(value)
+
+
+def _timestamp(data, replay, batch_format, batch):
+    """timestamp of a tick, i.e. of its first record if a batch"""
+    if batch and batch_format == "pandas":
+        return _seconds(data[replay].iloc[0])
+    if batch and batch_format == "arrow":
+        return _seconds(data.column(str(replay))[0])
+    if batch:
+        data = data[0]
+    return _seconds(data[replay])
 
 
 class File(Foo):
     """Open up a file and yield back lines in the file
 
+    The file is memory mapped and parsed `chunk_size` bytes at a time, off the event loop, and
+    chunks end on complete lines (for csv, outside of quoted fields). By default, each tick is
+    one line. If `batch`, each tick is all the lines of a chunk, in
+    `batch_format`. If `replay` is set, ticks are paced by that field of the records,
+    a timestamp, at `speed` times real time.
+
     Args:
         filename (str): filename to read
         json (bool): load file line as json
+        csv (bool): load file line as csv
+        header (bool): if csv, first line holds column names, and rows are yielded as dicts
+        chunk_size (int): bytes of the file to read and parse at a time
+        batch (bool): yield all the lines of a chunk at once
+        batch_format (str): if batch, format of yielded lines, one of:
+                                - "records": list of lines
+                                - "pandas": pandas DataFrame
+                                - "arrow": pyarrow RecordBatch (requires pyarrow)
+        replay (str): if set, field (or column index, if csv without header) of records holding
+                      their timestamp, as a number of seconds, a datetime or an ISO 8601 string
+        speed (float): if replay, multiple of real time to replay at, None for as fast as possible
     """
 
-    def __init__(self, filename, json=False, csv=False):
-        assert not (json and csv)
+    def __init__(
+        self,
+        filename,
+        json=False,
+        csv=False,
+        header=False,
+        chunk_size=1 << 20,
+        batch=False,
+        batch_format="records",
+        replay=None,
+        speed=1,
+    ):
+        if json and csv:
+            raise TributaryException("Must provide at most one of json, csv")
+
+        if batch_format not in ("records", "pandas", "arrow"):
+            raise TributaryException("Unknown batch format: {}".format(batch_format))
 
         async def _file(filename=filename, json=json, csv=csv):
-            if csv:
-                async with aiofiles.open(filename) as f:
-                    async for line in f:
-                        yield line.strip().split(",")
-            else:
-                async with aiofiles.open(filename) as f:
-                    async for line in f:
-                        if json:
-                            yield JSON.loads(line)
-                        else:
-                            yield line
+            loop = asyncio.get_event_loop()
+            chunks = _Chunks(filename, chunk_size, quoted=csv)
+            columns = None
+            start = None
+
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(None, chunks.next)
+                    if chunk is None:
+                        break
+
+                    if csv and header and columns is None:
+                        # column names from the first line
+                        line, _, chunk = chunk.partition(b"\n")
+                        columns = next(CSV.reader([line.decode("utf-8")]))
+
+                    records = await loop.run_in_executor(
+                        None, _parse, chunk, json, csv, columns
+                    )
+                    if not records:
+                        continue
+
+                    if batch:
+                        ticks = [
+                            await loop.run_in_executor(
+                                None, _format, records, batch_format
+                            )
+                        ]
+                    else:
+                        ticks = records
+
+                    for tick in ticks:
+                        if replay is not None and speed:
+                            # wait until the tick's time, relative to the first one
+                            ts = _timestamp(tick, replay, batch_format, batch)
+                            if start is None:
+                                start = (time.monotonic(), ts)
+                            wait = start[0] + (ts - start[1]) / speed - time.monotonic()
+                            if wait > 0:
+                                await asyncio.sleep(wait)
+
+                        yield tick
+            finally:
+                # unmap the file
+                chunks.close()
 
         super().__init__(foo=_file)
         self._name = "File"
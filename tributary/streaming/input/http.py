@@ -3,12 +3,15 @@ import asyncio
 import json as JSON
 from aiohttp import web
 from .input import Foo
-from ...base import TributaryException
+from ..session import lifecycle, request
+from ...base import TributaryException, _STREAM_NONE
 
 
 class HTTP(Foo):
     """Connect to url and yield results
 
+    Requests go through the graph's shared client session, see `tributary.streaming.session`.
+
     Args:
         url (str): url to connect to
         interval (int): interval to re-query
@@ -19,6 +22,11 @@ class HTTP(Foo):
         proxies (list): list of URL proxies to pass to requests.get
         cookies (list): list of cookies to pass to requests.get
         response_handler (Optional[callable]): custom handler to manage the response from the server
+        limit (int): maximum number of connections of the shared session
+        keepalive_timeout (float): seconds to keep idle connections open
+        retries (int): times to retry a failed connection
+        backoff (float): seconds to wait before the first retry
+        session (aiohttp.ClientSession): existing session to use, which won't be closed when the graph stops
     """
 
     def __init__(
@@ -32,6 +40,11 @@ class HTTP(Foo):
         proxies=None,
         cookies=None,
         response_handler=None,
+        limit=100,
+        keepalive_timeout=15,
+        retries=3,
+        backoff=0.1,
+        session=None,
     ):
         async def _req(
             url=url,
@@ -42,43 +55,203 @@ class HTTP(Foo):
             field=field,
             proxies=proxies,
             cookies=cookies,
+            self=self,
         ):
             count = 0 if repeat >= 0 else float("-inf")  # make less than anything
             while count < repeat:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        url, cookies=cookies, proxy=proxies
-                    ) as response:
+                async with await request(
+                    self.session,
+                    "GET",
+                    url,
+                    retries,
+                    backoff,
+                    cookies=cookies,
+                    proxy=proxies,
+                ) as response:
 
-                        if response_handler and callable(response_handler):
-                            yield response_handler(response)
+                    if response_handler and callable(response_handler):
+                        yield response_handler(response)
 
-                        else:
-                            msg = await response.text()
+                    else:
+                        msg = await response.text()
 
-                            if msg is None or response.status != 200:
-                                break
+                        if msg is None or response.status != 200:
+                            break
 
-                            if json:
-                                msg = JSON.loads(msg)
+                        if json:
+                            msg = JSON.loads(msg)
 
-                            if field:
-                                msg = msg[field]
+                        if field:
+                            msg = msg[field]
 
-                            if wrap:
-                                msg = [msg]
+                        if wrap:
+                            msg = [msg]
 
-                            yield msg
+                        yield msg
 
-                        if interval:
-                            await asyncio.sleep(interval)
+                if interval:
+                    await asyncio.sleep(interval)
 
-                        if repeat >= 0:
-                            count += 1
+                if repeat >= 0:
+                    count += 1
 
         super().__init__(foo=_req)
         self._name = "HTTP"
 
+        _start, _shutdown = lifecycle(self, session, limit, keepalive_timeout)
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
+
+class HTTPFanOut(Foo):
+    """Poll many urls concurrently and yield results
+
+    Each round requests every url, at most `concurrency` at a time, through the graph's shared
+    client session (see `tributary.streaming.session`). By default, each result is yielded as
+    soon as it arrives, as a dict of url to result. If `batch`, the results of a round are
+    yielded together once it is done, as a dict of url to result, unless none changed. With
+    `conditional`, urls are requested with the `ETag` and `Last-Modified` of their last
+    response, and unchanged ones are skipped without being read. Failed or non-200 responses are skipped. Counts of
+    requests, results, unchanged and failed responses are kept in the node's `stats` attribute.
+
+    Args:
+        urls (list): urls to poll, or a function returning urls to poll, called each round
+        interval (int): interval between rounds
+        repeat (int): number of rounds, negative for forever
+        json (bool): load http content data as json
+        wrap (bool): wrap result in a list
+        field (str): field to index result by
+        batch (bool): yield all results of a round at once
+        concurrency (int): maximum number of requests in flight
+        conditional (bool): skip unchanged responses, using etag and last modified headers
+        proxies (list): list of URL proxies to pass to requests.get
+        cookies (list): list of cookies to pass to requests.get
+        limit (int): maximum number of connections of the shared session
+        keepalive_timeout (float): seconds to keep idle connections open
+        retries (int): times to retry a failed connection
+        backoff (float): seconds to wait before the first retry
+        session (aiohttp.ClientSession): existing session to use, which won't be closed when the graph stops
+    """
+
+    def __init__(
+        self,
+        urls,
+        interval=1,
+        repeat=1,
+        json=False,
+        wrap=False,
+        field=None,
+        batch=False,
+        concurrency=10,
+        conditional=True,
+        proxies=None,
+        cookies=None,
+        limit=100,
+        keepalive_timeout=15,
+        retries=3,
+        backoff=0.1,
+        session=None,
+    ):
+        # etag and last modified of last response, by url
+        validators = {}
+
+        async def _fetch(url, semaphore, self=self):
+            headers = {}
+            etag, modified = validators.get(url, (None, None))
+            if conditional and etag:
+                headers["If-None-Match"] = etag
+            if conditional and modified:
+                headers["If-Modified-Since"] = modified
+
+            async with semaphore:
+                self.stats["requests"] += 1
+                try:
+                    async with await request(
+                        self.session,
+                        "GET",
+                        url,
+                        retries,
+                        backoff,
+                        headers=headers,
+                        cookies=cookies,
+                        proxy=proxies,
+                    ) as response:
+                        if response.status == 304 or (
+                            conditional
+                            and etag
+                            and response.headers.get("ETag") == etag
+                        ):
+                            self.stats["unchanged"] += 1
+                            return url, _STREAM_NONE
+
+                        if response.status != 200:
+                            self.stats["failed"] += 1
+                            return url, _STREAM_NONE
+
+                        msg = await response.text()
+                        validators[url] = (
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                        )
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    self.stats["failed"] += 1
+                    return url, _STREAM_NONE
+
+            if json:
+                msg = JSON.loads(msg)
+
+            if field:
+                msg = msg[field]
+
+            if wrap:
+                msg = [msg]
+
+            self.stats["results"] += 1
+            return url, msg
+
+        async def _req(interval=interval, repeat=repeat):
+            semaphore = asyncio.Semaphore(concurrency)
+
+            count = 0 if repeat >= 0 else float("-inf")  # make less than anything
+            while count < repeat:
+                tasks = [
+                    asyncio.create_task(_fetch(url, semaphore))
+                    for url in (urls() if callable(urls) else urls)
+                ]
+                results = {}
+
+                try:
+                    for task in asyncio.as_completed(tasks):
+                        url, msg = await task
+                        if msg is _STREAM_NONE:
+                            continue
+
+                        if batch:
+                            results[url] = msg
+                        else:
+                            yield {url: msg}
+                finally:
+                    # e.g. if the graph stops mid round
+                    for task in tasks:
+                        task.cancel()
+
+                if results:
+                    yield results
+
+                if interval:
+                    await asyncio.sleep(interval)
+
+                if repeat >= 0:
+                    count += 1
+
+        super().__init__(foo=_req)
+        self._name = "HTTPFanOut"
+        self.set("stats", {"requests": 0, "results": 0, "unchanged": 0, "failed": 0})
+
+        _start, _shutdown = lifecycle(self, session, limit, keepalive_timeout)
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
 
 class HTTPServer(Foo):
     """Host a server and yield posted data
@@ -200,7 +373,7 @@ class HTTPServer(Foo):
 
             async def _shutdown(self=self, server=server, host=host, port=port):
                 await self.site.stop()
-                await self.runner.cleanup()
+                await self.app.cleanup()
 
             self._onstarts = (_start,)
             self._onstops = (_shutdown,)
@@ -1,10 +1,18 @@
 import json as JSON
 from .input import Foo
+from ..node import Node
+from ...base import _STREAM_NONE
+from ...utils import _loads
 
 
 class Kafka(Foo):
     """Connect to kafka server and yield back results
 
+    By default, yields one message at a time. If `batch` is set, messages are fetched with
+    `getmany`, and each tick is a dict of TopicPartition to list of messages, which can be fanned
+    out to separate downstream branches with `partition()`. If `commit` is set as well, a batch's
+    offsets are committed once the graph has processed it, i.e. before fetching the next batch.
+
     Args:
         servers (list): kafka bootstrap servers
         group (str): kafka group id
@@ -12,6 +20,11 @@ class Kafka(Foo):
         json (bool): load input data as json
         wrap (bool): wrap result in a list
         interval (int): kafka poll interval
+        batch (bool): yield batches of messages by partition
+        max_records (int): if batch, maximum number of messages per batch
+        timeout_ms (int): if batch, time to wait for messages
+        commit (bool): if batch, commit offsets after processing instead of autocommitting
+        consumer (AIOKafkaConsumer): existing consumer to use, which won't be stopped when the graph stops
     """
 
     def __init__(
@@ -22,23 +35,27 @@ class Kafka(Foo):
         json=False,
         wrap=False,
         interval=1,
+        batch=False,
+        max_records=None,
+        timeout_ms=1000,
+        commit=False,
+        consumer=None,
         **consumer_kwargs
     ):
         from aiokafka import AIOKafkaConsumer
 
-        self._consumer = None
+        self._consumer = consumer
 
         if not isinstance(topics, (list, tuple)):
             topics = [topics]
 
-        async def _listen(
-            servers=servers,
-            group=group,
-            topics=topics,
-            json=json,
-            wrap=wrap,
-            interval=interval,
-        ):
+        if batch and commit:
+            consumer_kwargs["enable_auto_commit"] = False
+
+        # offsets of the last batch, to commit once processed
+        offsets = {}
+
+        async def _connect(self=self):
             if self._consumer is None:
 
                 self._consumer = AIOKafkaConsumer(
@@ -51,6 +68,29 @@ class Kafka(Foo):
                 # Get cluster layout and join group `my-group`
                 await self._consumer.start()
 
+        async def _stop(self=self):
+            # stop our own consumer once, whether the stream or the graph ends first
+            if self._consumer is None or consumer is not None or self.stopped:
+                return
+
+            self.stopped = True
+            await self._consumer.stop()
+
+        async def _commit(self=self):
+            if offsets:
+                await self._consumer.commit(dict(offsets))
+                offsets.clear()
+
+        async def _listen(
+            servers=servers,
+            group=group,
+            topics=topics,
+            json=json,
+            wrap=wrap,
+            interval=interval,
+        ):
+            await _connect()
+
             async for msg in self._consumer:
                 # Consume messages
                 # msg.topic, msg.partition, msg.offset, msg.key, msg.value, msg.timestamp
@@ -62,7 +102,66 @@ class Kafka(Foo):
                 yield msg
 
             # Will leave consumer group; perform autocommit if enabled.
-            await self._consumer.stop()
+            await _stop()
+
+        async def _listenBatches(json=json, wrap=wrap):
+            await _connect()
+
+            while True:
+                if commit:
+                    # previous batch has been processed
+                    await _commit()
+
+                batches = await self._consumer.getmany(
+                    timeout_ms=timeout_ms, max_records=max_records
+                )
+
+                for tp, msgs in batches.items():
+                    if json:
+                        for msg, value in zip(msgs, _loads([m.value for m in msgs])):
+                            msg.value = value
+                    if wrap:
+                        for msg in msgs:
+                            msg.value = [msg.value]
+                    offsets[tp] = msgs[-1].offset + 1
 
-        super().__init__(foo=_listen)
+                # if nothing within timeout, don't tick but let the graph carry on
+                yield batches or _STREAM_NONE
+
+        super().__init__(foo=_listenBatches if batch else _listen)
         self._name = "Kafka"
+        self.set("stopped", False)
+
+        async def _shutdown(self=self):
+            if self._consumer is None:
+                return
+
+            if commit:
+                await _commit()
+
+            await _stop()
+
+        self._onstops = (_shutdown,)
+
+    def partition(self, partition, topic=None):
+        """Node emitting only the messages of `partition` (and `topic`, if given) from
+        each batch, to fan out partitions to separate downstream branches
+
+        Args:
+            partition (int): partition
+            topic (str): topic, defaults to any
+        """
+
+        def _partition(batch):
+            ret = [
+                msg
+                for tp, msgs in batch.items()
+                if tp.partition == partition and (topic is None or tp.topic == topic)
+                for msg in msgs
+            ]
+            # don't tick if nothing for this partition
+            return ret or _STREAM_NONE
+
+        ret = Node(foo=_partition, name="Partition[{}]".format(partition), inputs=1)
+        self >> ret
+        return ret
@@ -1,11 +1,50 @@
 import asyncpg
 import asyncio
+import numpy as np
 from .input import Foo
+from ...base import TributaryException
+
+
+def _format(records, batch_format):
+    """convert a list of asyncpg records to `batch_format`"""
+    if batch_format == "records":
+        return [list(x.items()) for x in records]
+
+    columns = list(records[0].keys()) if records else []
+
+    if batch_format == "numpy":
+        return {
+            column: np.array([x[i] for x in records])
+            for i, column in enumerate(columns)
+        }
+
+    # arrow
+    import pyarrow
+
+    return pyarrow.RecordBatch.from_pydict(
+        {column: [x[i] for x in records] for i, column in enumerate(columns)}
+    )
+
+
+def _identifier(name):
+    """quote a column name as a sql identifier"""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _key(record):
+    """key identifying a row, for rows which may be unhashable"""
+    return repr(tuple(record.values()))
 
 
 class Postgres(Foo):
     """Connects to Postgres and yields result of query
 
+    By default, each execution yields all rows of all queries. If `chunk_size` is set, rows are
+    streamed with a server-side cursor and yielded `chunk_size` rows at a time, so a large table
+    never needs to be held in memory. If `watermark` is set, each execution only fetches rows
+    with a value of the `watermark` column at or past the last one seen, in order of that column,
+    skipping rows already yielded with that last value. Rows are told apart by their values.
+
     Args:
         user (str): postgres user
         password (str): postgres password
@@ -14,9 +53,85 @@ class Postgres(Foo):
         queries (str): list of queries to execute
         interval (int): seconds to wait before executing queries
         repeat (int): times to repeat
+        chunk_size (int): if set, yield rows in chunks of this size, fetched with a cursor
+        batch_format (str): format of yielded rows, one of:
+                                - "records": list of (column, value) lists, one per row
+                                - "numpy": dict of column to numpy array
+                                - "arrow": pyarrow RecordBatch (requires pyarrow)
+        watermark (str): if set, column (case sensitive) to only fetch new rows past on each execution
+        watermark_start (any): if watermark, only fetch rows past this value on the first execution
     """
 
-    def __init__(self, user, password, database, host, queries, repeat=1, interval=1):
+    def __init__(
+        self,
+        user,
+        password,
+        database,
+        host,
+        queries,
+        repeat=1,
+        interval=1,
+        chunk_size=None,
+        batch_format="records",
+        watermark=None,
+        watermark_start=None,
+    ):
+        if batch_format not in ("records", "numpy", "arrow"):
+            raise TributaryException("Unknown batch format: {}".format(batch_format))
+
+        # last value of watermark seen, and rows seen with that value, by query
+        marks = {query: watermark_start for query in queries}
+        seen = {query: set() for query in queries}
+
+        def _query(query):
+            """query and args, only fetching rows at or past the watermark"""
+            if watermark is None:
+                return query, ()
+
+            column = _identifier(watermark)
+
+            if marks[query] is None:
+                return (
+                    "SELECT * FROM ({}) AS q ORDER BY {}".format(
+                        query.strip().rstrip(";"), column
+                    ),
+                    (),
+                )
+
+            # rows sharing the last value seen may have arrived since, so include
+            # that value and skip the rows already seen with it. A start value is
+            # excluded, as no rows were seen with it
+            return (
+                "SELECT * FROM ({}) AS q WHERE {} {} $1 ORDER BY {}".format(
+                    query.strip().rstrip(";"),
+                    column,
+                    ">=" if seen[query] else ">",
+                    column,
+                ),
+                (marks[query],),
+            )
+
+        def _advance(query, records):
+            """skip rows already seen, and move the watermark past the new ones"""
+            if watermark is None:
+                return records
+
+            mark = marks[query]
+            records = [
+                record
+                for record in records
+                if record[watermark] != mark or _key(record) not in seen[query]
+            ]
+
+            if records:
+                last = records[-1][watermark]
+                if last != mark:
+                    marks[query], seen[query] = last, set()
+                seen[query].update(
+                    _key(record) for record in records if record[watermark] == last
+                )
+            return records
+
         async def _send(
             queries=queries,
             repeat=int(repeat),
@@ -33,21 +148,43 @@ class Postgres(Foo):
                 host=host.split(":")[0],
                 port=host.split(":")[1],
             )
-            count = 0 if repeat >= 0 else float("-inf")
-            while count < repeat:
-                data = []
-                for query in queries:
-                    values = await conn.fetch(query)
-                    data.extend([list(x.items()) for x in values])
-                yield data
+            try:
+                count = 0 if repeat >= 0 else float("-inf")
+                while count < repeat:
+                    if chunk_size:
+                        for query in queries:
+                            statement, args = _query(query)
+
+                            # cursors must be used in a transaction
+                            async with conn.transaction():
+                                cursor = await conn.cursor(statement, *args)
+
+                                while True:
+                                    records = await cursor.fetch(chunk_size)
+                                    if not records:
+                                        break
+
+                                    records = _advance(query, records)
+                                    if records:
+                                        yield _format(records, batch_format)
+                    else:
+                        records = []
+                        for query in queries:
+                            statement, args = _query(query)
+                            values = await conn.fetch(statement, *args)
+                            records.extend(_advance(query, values))
 
-                if interval:
-                    await asyncio.sleep(interval)
+                        # if watermark, skip if nothing new since last execution
+                        if records or watermark is None:
+                            yield _format(records, batch_format)
 
-                if repeat >= 0:
-                    count += 1
+                    if interval:
+                        await asyncio.sleep(interval)
 
-            await conn.close()
+                    if repeat >= 0:
+                        count += 1
+            finally:
+                await conn.close()
 
         super().__init__(foo=_send)
         self._name = "Postgres"
@@ -4,22 +4,51 @@ import json as JSON
 from aiohttp import web
 
 from .input import Foo
+from ..session import lifecycle, retry
 
 
 class WebSocket(Foo):
     """Connect to websocket and yield back results
 
+    The connection goes through the graph's shared client session, see
+    `tributary.streaming.session`.
+
     Args:
         url (str): websocket url to connect to
         json (bool): load websocket data as json
         wrap (bool): wrap result in a list
         field (str): field to index result by
+        heartbeat (float): if set, seconds between pings keeping the connection alive
+        limit (int): maximum number of connections of the shared session
+        keepalive_timeout (float): seconds to keep idle connections open
+        retries (int): times to retry a failed connection
+        backoff (float): seconds to wait before the first retry
+        session (aiohttp.ClientSession): existing session to use, which won't be closed when the graph stops
     """
 
-    def __init__(self, url, json=False, wrap=False, field=None):
+    def __init__(
+        self,
+        url,
+        json=False,
+        wrap=False,
+        field=None,
+        heartbeat=None,
+        limit=100,
+        keepalive_timeout=15,
+        retries=3,
+        backoff=0.1,
+        session=None,
+    ):
+        async def _connect(url=url, self=self):
+            return await retry(
+                lambda: self.session.ws_connect(url, heartbeat=heartbeat),
+                retries,
+                backoff,
+                (aiohttp.ClientError, asyncio.TimeoutError),
+            )
+
         async def _listen(url=url, json=json, wrap=wrap):
-            session = aiohttp.ClientSession()
-            async with session.ws_connect(url) as ws:
+            async with await _connect() as ws:
 
                 async for msg in ws:
                     if msg.type == aiohttp.WSMsgType.TEXT:
@@ -39,6 +68,10 @@ class WebSocket(Foo):
         super().__init__(foo=_listen)
         self._name = "WebSocket"
 
+        _start, _shutdown = lifecycle(self, session, limit, keepalive_timeout)
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
 
 class WebSocketServer(Foo):
     """Host a websocket server and stream in the data
@@ -5,12 +5,40 @@ from collections import deque
 from .dd3 import _DagreD3Mixin
 from .graph import StreamingGraph
 from .serialize import NodeSerializeMixin
-from ..base import StreamEnd, StreamNone, StreamRepeat
+from ..base import _STREAM_END, _STREAM_NONE, _STREAM_REPEAT
 from ..base import TributaryException
 from ..utils import _agen_to_foo, _gen_to_foo
 
 
 class Node(NodeSerializeMixin, _DagreD3Mixin, object):
+    __slots__ = (
+        "_id",
+        "_graphvizshape",
+        "_dd3g",
+        "_name",
+        "_name_only",
+        "_input",
+        "_active",
+        "_downstream",
+        "_upstream",
+        "_foo",
+        "_old_foo",
+        "_foo_kwargs",
+        "_delay_interval",
+        "_execution_max",
+        "_execution_count",
+        "_last",
+        "_finished",
+        "_use_dual",
+        "_drop",
+        "_replace",
+        "_repeat",
+        "_onstarts",
+        "_onstops",
+        "_state",
+        "__dict__",
+    )
+
     def __init__(
         self,
         foo,
@@ -67,7 +95,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
 
         # Active are currently valid inputs, since inputs
         # may come at different rates
-        self._active = [StreamNone() for _ in range(inputs)]
+        self._active = [_STREAM_NONE] * inputs
 
         # Downstream nodes so we can traverse graph, push
         # results to downstream nodes
@@ -83,6 +111,9 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         #    - async generator
         self._foo = foo
 
+        # The original function, when `_foo` has been swapped to unroll a generator
+        self._old_foo = None
+
         # Any kwargs necessary for the function.
         # These should be static call-to-call.
         self._foo_kwargs = foo_kwargs or {}
@@ -98,7 +129,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         self._execution_count = 0
 
         # last value pushed downstream
-        self._last = StreamNone()
+        self._last = _STREAM_NONE
 
         # stream is in a finished state, will only propogate StreamEnd instances
         self._finished = False
@@ -124,8 +155,9 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         # coroutines to run on graph stop
         self._onstops = ()
 
-        # for safety
-        self._initial_attrs = dir(self) + ["_old_foo", "_initial_attrs"]
+        # state set with `set()`, kept apart from node-critical attributes.
+        # Assigned last, as it marks the end of construction
+        self._state = {}
 
     # ***********************
     # Public interface
@@ -141,18 +173,46 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         """Use this method to set attributes
 
         Since we often use attributes to track node state, let's make sure we don't clobber any important ones"""
-        if hasattr(self, "_initial_attrs") and key in self._initial_attrs:
-
-            # if we've completed our construction, ensure critical attrs arent overloaded
+        if key not in self._state and self._isattr(key):
             raise TributaryException(
                 "Overloading node-critical attribute: {}".format(key)
             )
 
-        self._initial_attrs.append(key)
-        super().__setattr__(key, value)
+        self._state[key] = value
+
+    def _isattr(self, key):
+        """check if key is a node attribute (including methods), rather than state"""
+        return hasattr(type(self), key) or key in self.__dict__
+
+    def __getattr__(self, key):
+        # only called if regular lookup fails, so check state
+        try:
+            return object.__getattribute__(self, "_state")[key]
+        except (AttributeError, KeyError):
+            raise AttributeError(
+                "'{}' object has no attribute '{}'".format(type(self).__name__, key)
+            )
 
     def __setattr__(self, key, value):
-        if hasattr(self, "_initial_attrs") and key not in self._initial_attrs:
+        if key in _NODE_ATTRS:
+            # fast path for the engine's own attributes
+            object.__setattr__(self, key, value)
+            return
+
+        try:
+            state = object.__getattribute__(self, "_state")
+        except AttributeError:
+            # still under construction
+            object.__setattr__(self, key, value)
+            return
+
+        if key in state:
+            state[key] = value
+
+        elif self._isattr(key):
+            object.__setattr__(self, key, value)
+
+        else:
             # if we've completed our construction, ensure critical attrs arent overloaded
             raise TributaryException(
                 "Use set() to set attribute, to avoid overloading node-critical attribute: {}".format(
@@ -160,8 +220,6 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
                 )
             )
 
-        super().__setattr__(key, value)
-
     def upstream(self, node=None):
         """Access list of upstream nodes"""
         return self._upstream
@@ -179,7 +237,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         # Downstream nodes can't process
         if self._backpressure():
             await self._waitdd3g()
-            return StreamNone()
+            return _STREAM_NONE
 
         # Previously ended stream
         if self._finished:
@@ -194,30 +252,30 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
 
         # Stop executing
         if self._execution_max > 0 and self._execution_count >= self._execution_max:
-            self._foo = lambda: StreamEnd()
-            self._old_foo = lambda: StreamEnd()
+            self._foo = lambda: _STREAM_END
+            self._old_foo = lambda: _STREAM_END
 
         ready = True
         # iterate through inputs
         for i, inp in enumerate(self._input):
             # if input hasn't received value
-            if isinstance(self._active[i], StreamNone):
+            if self._active[i] is _STREAM_NONE:
                 if len(inp) > 0:
                     # get from input queue
                     val = inp.popleft()
 
-                    while isinstance(val, StreamRepeat):
+                    while val is _STREAM_REPEAT:
                         # Skip entry
                         val = inp.popleft()
 
-                    if isinstance(val, StreamEnd):
+                    if val is _STREAM_END:
                         return await self._finish()
 
                     # set as active
                     self._active[i] = val
                 else:
                     # wait for value
-                    self._active[i] = StreamNone()
+                    self._active[i] = _STREAM_NONE
                     ready = False
 
         if ready:
@@ -248,7 +306,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
 
     async def _empty(self, index):
         """check if value"""
-        return len(self._input[index]) == 0 or self._active[index] != StreamNone()
+        return len(self._input[index]) == 0 or self._active[index] is not _STREAM_NONE
 
     async def _pop(self, index):
         """pop value from downstream nodes"""
@@ -262,12 +320,8 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
 
         # wait for valid input
         while not valid:
-            # await if its a coroutine
-            if asyncio.iscoroutine(self._foo):
-                _last = await self._foo(*self._active, **self._foo_kwargs)
-
-            # else call it
-            elif isinstance(self._foo, types.FunctionType):
+            # call it (checked first, as this is the common case)
+            if isinstance(self._foo, types.FunctionType):
                 try:
                     # could be a generator
                     try:
@@ -280,6 +334,10 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
                     self._foo = self._old_foo
                     continue
 
+            # else await if its a coroutine
+            elif asyncio.iscoroutine(self._foo):
+                _last = await self._foo(*self._active, **self._foo_kwargs)
+
             else:
                 raise TributaryException("Cannot use type:{}".format(type(self._foo)))
 
@@ -307,7 +365,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
             _last = await _last
 
         if self._repeat:
-            if isinstance(_last, (StreamNone, StreamRepeat)):
+            if _last is _STREAM_NONE or _last is _STREAM_REPEAT:
                 # NOOP
                 self._last = self._last
             else:
@@ -318,16 +376,16 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         await self._output(self._last)
 
         for i in range(len(self._active)):
-            self._active[i] = StreamNone()
+            self._active[i] = _STREAM_NONE
 
         await self._enddd3g()
-        if isinstance(self._last, StreamEnd):
+        if self._last is _STREAM_END:
             await self._finish()
 
     async def _finish(self):
         """mark this node as finished"""
         self._finished = True
-        self._last = StreamEnd()
+        self._last = _STREAM_END
         await self._finishdd3g()
         await self._output(self._last)
 
@@ -342,7 +400,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
     async def _output(self, ret):
         """output value to downstream nodes"""
         # if downstreams, output
-        if not isinstance(ret, (StreamNone, StreamRepeat)):
+        if ret is not _STREAM_NONE and ret is not _STREAM_REPEAT:
             for down, i in self.downstream():
 
                 if self._drop:
@@ -350,7 +408,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
                         # do nothing
                         pass
 
-                    elif not isinstance(down._active[i], StreamNone):
+                    elif down._active[i] is not _STREAM_NONE:
                         # do nothing
                         pass
 
@@ -361,7 +419,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
                     if len(down._input[i]) > 0:
                         _ = await down._pop(i)
 
-                    elif not isinstance(down._active[i], StreamNone):
+                    elif down._active[i] is not _STREAM_NONE:
                         down._active[i] = ret
 
                     else:
@@ -454,3 +512,7 @@ class Node(NodeSerializeMixin, _DagreD3Mixin, object):
         return nodes
 
     # ***********************
+
+
+# attributes stored in slots, set without checking state
+_NODE_ATTRS = frozenset(Node.__slots__)
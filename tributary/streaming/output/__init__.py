@@ -1,3 +1,5 @@
+from .arrow import Arrow as ArrowSink
+from .arrow import Parquet as ParquetSink
 from .email import Email as EmailSink
 from .file import File as FileSink
 from .http import HTTP as HTTPSink
@@ -0,0 +1,165 @@
+import asyncio
+from .output import _Buffered
+from ..node import Node
+
+
+def _table(data, schema):
+    """convert a tick other than rows to an arrow table"""
+    import pyarrow
+
+    if isinstance(data, pyarrow.RecordBatch):
+        data = pyarrow.Table.from_batches([data])
+    elif not isinstance(data, pyarrow.Table):
+        # pandas DataFrame
+        data = pyarrow.Table.from_pandas(data, schema=schema, preserve_index=False)
+
+    if schema is not None and not data.schema.equals(schema):
+        data = data.cast(schema)
+    return data
+
+
+class _Columnar(_Buffered):
+    """accumulate ticks into arrow tables of `batch_size` rows, written off the event loop
+    with the writer returned by `open_writer(schema)`"""
+
+    def __init__(self, node, open_writer, schema, batch_size, name):
+        # ticks waiting to be written, runs of rows kept as lists
+        pending = []
+
+        def _write(ticks, self=self):
+            import pyarrow
+
+            # schema inferred from the first tick unless given
+            schema, tables = self.schema, []
+            for tick in ticks:
+                if isinstance(tick, list):
+                    # buffered rows
+                    table = pyarrow.Table.from_pylist(tick, schema=schema)
+                else:
+                    table = _table(tick, schema)
+                schema = schema or table.schema
+                tables.append(table)
+
+            # one batch per flush
+            table = pyarrow.concat_tables(tables).combine_chunks()
+
+            if self.writer is None:
+                self.schema = table.schema
+                self.writer = open_writer(self.schema)
+
+            self.writer.write_table(table)
+            self.stats["batches"] += 1
+            self.stats["rows"] += table.num_rows
+
+        async def _flush(self=self, pending=pending):
+            async with self.lock:
+                if pending:
+                    ticks = pending[:]
+                    del pending[:]
+                    self.buffered = 0
+                    await asyncio.get_event_loop().run_in_executor(None, _write, ticks)
+
+        async def _send(data, self=self, pending=pending):
+            rows = [data] if isinstance(data, dict) else data
+
+            if isinstance(rows, list):
+                if pending and isinstance(pending[-1], list):
+                    pending[-1].extend(rows)
+                else:
+                    pending.append(list(rows))
+            else:
+                # already columnar
+                pending.append(rows)
+            self.buffered += len(rows)
+
+            if self.buffered >= batch_size:
+                await _flush()
+            return data
+
+        super().__init__(foo=_send, name=name, inputs=1)
+        node >> self
+
+        self.set("schema", schema)
+        self.set("writer", None)
+        self.set("lock", None)
+        self.set("buffered", 0)
+        self.set("stats", {"batches": 0, "rows": 0})
+
+        async def _start(self=self):
+            # only one write at a time
+            self.lock = asyncio.Lock()
+
+        async def _shutdown(self=self):
+            if self.lock is None:
+                return
+
+            # write anything left
+            await _flush()
+            async with self.lock:
+                if self.writer is not None:
+                    await asyncio.get_event_loop().run_in_executor(
+                        None, self.writer.close
+                    )
+                    self.writer = None
+
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
+
+class Parquet(_Columnar):
+    """Write ticks to a parquet file
+
+    Ticks can be dicts (one row), lists of dicts, pandas DataFrames or pyarrow RecordBatches and
+    Tables. All of them are buffered and written once `batch_size` rows are held, each batch as
+    one row group. The file is closed when the stream ends or the graph
+    stops. Numbers of batches and rows written are kept in the node's `stats` attribute.
+    Requires pyarrow.
+
+    Args:
+        node (Node): input stream
+        filename (str): filename to write
+        schema (pyarrow.Schema): schema of the file, defaults to that of the first batch
+        batch_size (int): write once this many rows are buffered
+        compression (str): parquet compression codec
+    """
+
+    def __init__(
+        self, node, filename, schema=None, batch_size=10000, compression="snappy"
+    ):
+        def _open(schema):
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(filename, schema, compression=compression)
+
+        super().__init__(node, _open, schema, batch_size, "Parquet")
+
+
+class Arrow(_Columnar):
+    """Write ticks to an arrow ipc file or stream
+
+    Ticks can be dicts (one row), lists of dicts, pandas DataFrames or pyarrow RecordBatches and
+    Tables. All of them are buffered and written once `batch_size` rows are held, each batch as
+    one record batch. The file is closed when the stream ends or the graph stops. Numbers of batches
+    and rows written are kept in the node's `stats` attribute. Requires pyarrow.
+
+    Args:
+        node (Node): input stream
+        filename (str): filename to write
+        schema (pyarrow.Schema): schema of the file, defaults to that of the first batch
+        batch_size (int): write once this many rows are buffered
+        stream (bool): write the ipc streaming format instead of the file format
+    """
+
+    def __init__(self, node, filename, schema=None, batch_size=10000, stream=False):
+        def _open(schema):
+            import pyarrow.ipc
+
+            if stream:
+                return pyarrow.ipc.new_stream(filename, schema)
+            return pyarrow.ipc.new_file(filename, schema)
+
+        super().__init__(node, _open, schema, batch_size, "Arrow")
+
+
+Node.parquet = Parquet
+Node.arrow = Arrow
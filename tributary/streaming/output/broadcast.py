@@ -0,0 +1,100 @@
+import asyncio
+from collections import deque
+from ...base import TributaryException
+
+
+class Subscriber(object):
+    """Bounded queue of messages for one client of a `Broadcast`"""
+
+    def __init__(self, broadcast, messages=()):
+        self._broadcast = broadcast
+        self._queue = deque(messages)
+        self._event = asyncio.Event()
+        self.closed = False
+
+    def put(self, message):
+        if self.closed:
+            return
+
+        if len(self._queue) >= self._broadcast.max_queue:
+            # slow consumer
+            policy = self._broadcast.policy
+            if policy == "disconnect":
+                self._broadcast.stats["disconnected"] += 1
+                self._queue.clear()
+                self.close()
+                return
+
+            if policy == "conflate":
+                self._broadcast.stats["dropped"] += len(self._queue)
+                self._queue.clear()
+            else:
+                self._broadcast.stats["dropped"] += 1
+                self._queue.popleft()
+
+        self._queue.append(message)
+        self._event.set()
+
+    async def get(self):
+        """next message, or None once closed"""
+        while not self._queue:
+            if self.closed:
+                return None
+            self._event.clear()
+            await self._event.wait()
+        return self._queue.popleft()
+
+    def close(self):
+        """stop once queued messages are sent"""
+        self.closed = True
+        self._event.set()
+
+
+class Broadcast(object):
+    """Fan out messages to many clients
+
+    Each message is published once and shared by every client's queue, rather than copied or
+    reencoded per client. New clients first get the last `history` messages. A client whose
+    queue reaches `max_queue` messages is handled according to `policy`:
+        - "drop": drop its oldest queued message
+        - "conflate": drop all its queued messages, so it skips ahead to the newest
+        - "disconnect": close it
+
+    Args:
+        history (int): number of messages to replay to new clients, 0 for none
+        max_queue (int): maximum number of messages queued per client
+        policy (str): what to do with slow clients, in ("drop", "conflate", "disconnect")
+    """
+
+    def __init__(self, history=1000, max_queue=1000, policy="drop"):
+        if policy not in ("drop", "conflate", "disconnect"):
+            raise TributaryException(
+                "`policy` must be in ('drop', 'conflate', 'disconnect')"
+            )
+        self.history = deque(maxlen=history)
+        self.max_queue = max_queue
+        self.policy = policy
+        self.subscribers = []
+        self.stats = {"published": 0, "dropped": 0, "disconnected": 0}
+
+    def subscribe(self):
+        """new client, starting with a snapshot of the history"""
+        subscriber = Subscriber(self, self.history)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.close()
+        self.subscribers = [s for s in self.subscribers if s is not subscriber]
+
+    def publish(self, message):
+        self.history.append(message)
+        self.stats["published"] += 1
+        for subscriber in self.subscribers:
+            subscriber.put(message)
+
+    def close(self):
+        """disconnect every client"""
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.subscribers = []
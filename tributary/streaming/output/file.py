@@ -1,34 +1,201 @@
 import aiofiles
+import asyncio
+import csv as CSV
+import io
 import json as JSON
-from .output import Foo
+import os
+import time
+import zlib
+from .output import _Buffered
 from ..node import Node
+from ...base import TributaryException
 
 
-class File(Foo):
+def _csv(data):
+    """format a row as a csv line"""
+    out = io.StringIO()
+    CSV.writer(out, lineterminator="").writerow(data)
+    return out.getvalue()
+
+
+def _compressor(compression):
+    """streaming compressor for `compression`, if any"""
+    if compression == "gzip":
+        return zlib.compressobj(wbits=31)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compressobj()
+    return None
+
+
+def _rotated(filename):
+    """next free name for a rotated file, e.g. ticks.json to ticks.1.json, ticks.2.json, ..."""
+    root, ext = os.path.splitext(filename)
+    index = 1
+    while os.path.exists("{}.{}{}".format(root, index, ext)):
+        index += 1
+    return "{}.{}{}".format(root, index, ext)
+
+
+class File(_Buffered):
     """Open up a file and write lines to the file
 
+    The file is opened when the graph starts and kept open. Ticks are buffered, and written
+    once `buffer_size` bytes are buffered or every `flush_interval` seconds, and when the stream
+    ends or the graph stops. If `rotate_size` or `rotate_interval` is set, a file that big or
+    that old is closed, renamed with an index (ticks.json to ticks.1.json, ticks.2.json, ...)
+    and replaced by a new one. Output can be compressed with gzip, or zstd (requires zstandard).
+
     Args:
         node (Node): input stream
         filename (str): filename to write
         json (bool): write file line as json
         csv (bool): write file line as csv
+        separator (str): written after each tick, defaults to a newline if csv, else nothing
+        buffer_size (int): write once this many bytes are buffered
+        flush_interval (float): write buffered ticks every `flush_interval` seconds, if set
+        rotate_size (int): if set, rotate the file once this many bytes are written to it
+        rotate_interval (float): if set, rotate the file every `rotate_interval` seconds
+        compression (str): if set, compress output, in ("gzip", "zstd")
     """
 
-    def __init__(self, node, filename="", json=False, csv=False):
-        async def _file(data):
+    def __init__(
+        self,
+        node,
+        filename="",
+        json=False,
+        csv=False,
+        separator=None,
+        buffer_size=65536,
+        flush_interval=1,
+        rotate_size=None,
+        rotate_interval=None,
+        compression=None,
+    ):
+        if compression not in (None, "gzip", "zstd"):
+            raise TributaryException("`compression` must be in (None, 'gzip', 'zstd')")
+
+        if separator is None:
+            separator = "\n" if csv else ""
+
+        # encoded ticks to write
+        buffer = []
+
+        async def _open(self=self):
+            self.fp = await aiofiles.open(filename, mode="ab")
+            self.compressor = _compressor(compression)
+            self.opened = time.monotonic()
+            self.written = 0
+            self.raw = 0
+
+        async def _closeFile(self=self):
+            if self.compressor is not None:
+                await self.fp.write(self.compressor.flush())
+            await self.fp.close()
+            self.fp = None
+
+        def _rotate(self=self):
+            if self.raw == 0:
+                # don't rotate empty files
+                return False
+            if rotate_size and self.written >= rotate_size:
+                return True
+            return bool(
+                rotate_interval and time.monotonic() - self.opened >= rotate_interval
+            )
+
+        async def _flush(self=self, buffer=buffer):
+            async with self.lock:
+                if self.fp is None:
+                    return
+
+                if buffer:
+                    data = b"".join(buffer)
+                    del buffer[:]
+                    self.buffered = 0
+                    self.raw += len(data)
+
+                    if self.compressor is not None:
+                        data = self.compressor.compress(data)
+
+                    await self.fp.write(data)
+                    self.written += len(data)
+
+                if _rotate():
+                    await _closeFile()
+                    os.rename(filename, _rotated(filename))
+                    await _open()
+
+        async def _close(self=self):
+            await _flush()
+            async with self.lock:
+                if self.fp is not None:
+                    await _closeFile()
+
+        async def _flushEvery(self=self):
+            while True:
+                await asyncio.sleep(flush_interval or rotate_interval)
+                try:
+                    # don't lose a write in flight when cancelled on stop
+                    await asyncio.shield(_flush())
+                except Exception as e:
+                    # raise on next tick
+                    self.error = e
+
+        async def _file(data, self=self, buffer=buffer):
+            if self.error is not None:
+                error, self.error = self.error, None
+                raise error
+
             if csv:
-                async with aiofiles.open(filename, "w") as f:
-                    await f.write(",".join(data))
+                line = _csv(data)
+            elif json:
+                line = JSON.dumps(data)
             else:
-                async with aiofiles.open(filename, mode="a") as f:
-                    if json:
-                        await f.write(JSON.dumps(data))
-                    else:
-                        await f.write(data)
-                return data
+                line = data
+
+            line = (line + separator).encode("utf-8")
+            buffer.append(line)
+            self.buffered += len(line)
+
+            if self.buffered >= buffer_size:
+                await _flush()
+            return data
 
         super().__init__(foo=_file, name="File", inputs=1)
         node >> self
 
+        self.set("fp", None)
+        self.set("compressor", None)
+        self.set("lock", None)
+        self.set("flusher", None)
+        self.set("error", None)
+        self.set("opened", None)
+        self.set("buffered", 0)
+        # bytes written to the current file, and before compression
+        self.set("written", 0)
+        self.set("raw", 0)
+
+        async def _start(self=self):
+            # only one write at a time
+            self.lock = asyncio.Lock()
+
+            await _open()
+
+            if flush_interval or rotate_interval:
+                self.flusher = asyncio.create_task(_flushEvery())
+
+        async def _shutdown(self=self):
+            if self.flusher is not None:
+                self.flusher.cancel()
+                self.flusher = None
+
+            # write anything left
+            await _close()
+
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
 
 Node.file = File
@@ -1,15 +1,17 @@
 import asyncio
-import aiohttp
 import json as JSON
 from aiohttp import web
 from .output import Foo
 from ..node import Node
+from ..session import lifecycle, request
 from ...base import StreamEnd, TributaryException
 
 
 class HTTP(Foo):
     """Connect to url and post results to it
 
+    Requests go through the graph's shared client session, see `tributary.streaming.session`.
+
     Args:
         node (Node): input tributary
         url (str): url to connect to
@@ -21,6 +23,11 @@ class HTTP(Foo):
         proxies (list): list of URL proxies to pass to requests.get
         cookies (list): list of cookies to pass to requests.get
         response_handler (Optional[callable]): custom handler to manage the response from the server
+        limit (int): maximum number of connections of the shared session
+        keepalive_timeout (float): seconds to keep idle connections open
+        retries (int): times to retry a failed connection
+        backoff (float): seconds to wait before the first retry
+        session (aiohttp.ClientSession): existing session to use, which won't be closed when the graph stops
     """
 
     def __init__(
@@ -33,6 +40,11 @@ class HTTP(Foo):
         proxies=None,
         cookies=None,
         response_handler=None,
+        limit=100,
+        keepalive_timeout=15,
+        retries=3,
+        backoff=0.1,
+        session=None,
     ):
         async def _send(
             data,
@@ -42,6 +54,7 @@ class HTTP(Foo):
             field=field,
             proxies=proxies,
             cookies=cookies,
+            self=self,
         ):
             if json:
                 data = JSON.dumps(data)
@@ -52,35 +65,45 @@ class HTTP(Foo):
             if wrap:
                 data = [data]
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url, cookies=cookies, proxy=proxies, data=data
-                ) as response:
-                    if response_handler and callable(response_handler):
-                        return response_handler(response)
-
-                    msg = await response.text()
-
-                    if msg is None:
-                        return StreamEnd()
-                    if response.status != 200:
-                        return msg
+            async with await request(
+                self.session,
+                "POST",
+                url,
+                retries,
+                backoff,
+                cookies=cookies,
+                proxy=proxies,
+                data=data,
+            ) as response:
+                if response_handler and callable(response_handler):
+                    return response_handler(response)
+
+                msg = await response.text()
+
+                if msg is None:
+                    return StreamEnd()
+                if response.status != 200:
+                    return msg
 
-                    if json:
-                        msg = JSON.loads(msg)
+                if json:
+                    msg = JSON.loads(msg)
 
-                    if field:
-                        msg = msg[field]
+                if field:
+                    msg = msg[field]
 
-                    if wrap:
-                        msg = [msg]
+                if wrap:
+                    msg = [msg]
 
-                    return msg
+                return msg
 
         super().__init__(foo=_send, inputs=1)
         self._name = "HTTP"
         node >> self
 
+        _start, _shutdown = lifecycle(self, session, limit, keepalive_timeout)
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
 
 class HTTPServer(Foo):
     """Host a server and send results on get requests
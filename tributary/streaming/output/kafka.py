@@ -1,12 +1,23 @@
+import asyncio
 import json as JSON
 from aiokafka import AIOKafkaProducer
 from .output import Foo
 from ..node import Node
 
 
+def _encode(value):
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
 class Kafka(Foo):
     """Connect to kafka server and send data
 
+    By default, each tick waits for the broker to acknowledge its message. If `wait` is False,
+    messages are sent without waiting, with at most `max_in_flight` unacknowledged at a time,
+    so the producer can batch them (see `linger_ms` and `max_batch_size`). Delivery failures
+    are counted in the node's `stats` attribute rather than raised, and pending messages are
+    flushed when the graph stops.
+
     Args:
         node (Node): input tributary
         servers (list): kafka bootstrap servers
@@ -14,19 +25,48 @@ class Kafka(Foo):
         json (bool): load input data as json
         wrap (bool): wrap result in a list
         interval (int): kafka poll interval
+        key (callable): function of input data, before wrap and json, returning the message key
+        partition (callable): function of input data, before wrap and json, returning the partition
+        wait (bool): wait for each message to be acknowledged
+        max_in_flight (int): if not wait, maximum number of unacknowledged messages
+        linger_ms (int): time the producer waits to batch messages together
+        max_batch_size (int): maximum size of the producer's batches, in bytes
+        producer (AIOKafkaProducer): existing producer to use, which won't be stopped when the graph stops
     """
 
     def __init__(
-        self, node, servers="", topic="", json=False, wrap=False, **producer_kwargs
+        self,
+        node,
+        servers="",
+        topic="",
+        json=False,
+        wrap=False,
+        key=None,
+        partition=None,
+        wait=True,
+        max_in_flight=1000,
+        linger_ms=0,
+        max_batch_size=16384,
+        producer=None,
+        **producer_kwargs
     ):
-        async def _send(data, topic=topic, json=json, wrap=wrap):
-            if self._producer is None:
-                self._producer = AIOKafkaProducer(
-                    bootstrap_servers=servers, **producer_kwargs
-                )
+        # unacknowledged messages
+        in_flight = set()
 
-                # Get cluster layout and initial topic/partition leadership information
-                await self._producer.start()
+        def _delivered(future, self=self, in_flight=in_flight):
+            in_flight.discard(future)
+            if future.cancelled() or future.exception() is not None:
+                self.stats["failed"] += 1
+            else:
+                self.stats["delivered"] += 1
+
+        async def _send(data, topic=topic, json=json, wrap=wrap):
+            # of the tick itself, before it's encoded
+            kwargs = {}
+            if key is not None:
+                kwargs["key"] = _encode(key(data))
+            if partition is not None:
+                kwargs["partition"] = partition(data)
 
             if wrap:
                 data = [data]
@@ -35,14 +75,56 @@ class Kafka(Foo):
                 data = JSON.dumps(data)
 
             # Produce message
-            await self._producer.send_and_wait(topic, data.encode("utf-8"))
+            if wait:
+                await self._producer.send_and_wait(topic, _encode(data), **kwargs)
+                self.stats["sent"] += 1
+                self.stats["delivered"] += 1
+                return data
+
+            if len(in_flight) >= max_in_flight:
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            try:
+                future = await self._producer.send(topic, _encode(data), **kwargs)
+            except Exception:
+                # e.g. message too large
+                self.stats["failed"] += 1
+                return data
+
+            self.stats["sent"] += 1
+            in_flight.add(future)
+            future.add_done_callback(_delivered)
             return data
 
-        # # Wait for all pending messages to be delivered or expire.
-        # await producer.stop()
         super().__init__(foo=_send, name="Kafka", inputs=1)
         node >> self
-        self.set("_producer", None)
+        self.set("_producer", producer)
+        self.set("stats", {"sent": 0, "delivered": 0, "failed": 0})
+
+        async def _start(self=self):
+            if self._producer is None:
+                self._producer = AIOKafkaProducer(
+                    bootstrap_servers=servers,
+                    linger_ms=linger_ms,
+                    max_batch_size=max_batch_size,
+                    **producer_kwargs
+                )
+
+                # Get cluster layout and initial topic/partition leadership information
+                await self._producer.start()
+
+        async def _shutdown(self=self, in_flight=in_flight):
+            # Wait for all pending messages to be delivered or expire.
+            await self._producer.flush()
+            if in_flight:
+                await asyncio.wait(in_flight)
+
+            if producer is None:
+                await self._producer.stop()
+                self._producer = None
+
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
 
 
 Node.kafka = Kafka
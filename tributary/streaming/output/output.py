@@ -1,9 +1,10 @@
+import asyncio
 import copy
 import logging
 from aioconsole import aprint
 from IPython.display import display
 from ..node import Node
-from ...base import StreamEnd, StreamNone, StreamRepeat
+from ...base import _STREAM_END, _STREAM_NONE, _STREAM_REPEAT
 from ...utils import _gen_node
 
 
@@ -27,6 +28,17 @@ class Foo(Node):
         )
 
 
+class _Buffered(Foo):
+    """Output node buffering its writes, which runs its onstops to write anything left as soon
+    as its stream ends, rather than only when the graph stops. Its onstops must be safe to run
+    again when the graph stops."""
+
+    async def _finish(self):
+        if not self._finished:
+            await asyncio.gather(*(stop() for stop in self._onstops))
+        await super()._finish()
+
+
 def Print(node, text=""):
     async def foo(val):
         if getattr(Print, "_multiprocess", None):
@@ -77,7 +89,11 @@ def Collect(node, limit=None):
     ret = []
 
     def foo(val, ret=ret):
-        if not isinstance(val, (StreamEnd, StreamNone, StreamRepeat)):
+        if (
+            val is not _STREAM_END
+            and val is not _STREAM_NONE
+            and val is not _STREAM_REPEAT
+        ):
             ret.append(copy.deepcopy(val))
             if limit:
                 ret = ret[-limit:]
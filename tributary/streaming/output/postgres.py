@@ -1,11 +1,32 @@
+import asyncio
+import time
 import asyncpg
 from .output import Foo
 from ..node import Node
+from ...base import TributaryException
+
+
+def _record(data):
+    """default record parser, one record per tick"""
+    if isinstance(data, dict):
+        return [tuple(data.values())]
+    if isinstance(data, (list, tuple)):
+        return [tuple(data)]
+    return [(data,)]
 
 
 class Postgres(Foo):
     """Connects to Postgres and executes queries
 
+    Ticks are buffered, and written in batches once `batch_size` queries/records are buffered
+    or every `batch_interval` seconds, using a connection pool opened when the graph starts and
+    closed when it stops. Anything left is written when the graph stops. Queries from
+    `query_parser` are run one by one in a single transaction. A batch that fails to write stays
+    buffered and is retried on the next flush, up to `max_retries` times before being dropped
+    (and passed to `dead_letter`), and the error raised on the next tick. The number of flushes,
+    failed flushes, written and dropped records, and the size and latency of the last flush, are
+    kept in the node's `stats` attribute.
+
     Args:
         node (Node): input tributary
         user (str): postgres user
@@ -13,33 +34,172 @@ class Postgres(Foo):
         database (str): postgres database
         host (str): postgres host
         query_parser (func): parse input node data to query list
+        query (str): instead of query_parser, parameterized query to run with `executemany` over records,
+                     e.g. "INSERT INTO test(col1) VALUES ($1)"
+        table (str): instead of query_parser, table to write records to with `copy_records_to_table`
+        columns (list): columns of table to write records to, defaults to all
+        record_parser (func): parse input node data to list of records (tuples) for `query` or `table`,
+                              defaults to one record per tick
+        batch_size (int): write once this many queries/records are buffered
+        batch_interval (float): write buffered queries/records every `batch_interval` seconds, if set
+        pool_size (int): maximum number of connections in pool
+        pool (asyncpg.Pool): existing pool to use, which won't be closed when the graph stops
+        max_retries (int): times to retry a failed batch before dropping it
+        dead_letter (callable): if set, called with each dropped batch and its error
     """
 
-    def __init__(self, node, user, password, database, host, query_parser):
-        async def _send(
-            data,
-            query_parser=query_parser,
-            user=user,
-            password=password,
-            database=database,
-            host=host,
-        ):
-            conn = await asyncpg.connect(
-                user=user,
-                password=password,
-                database=database,
-                host=host.split(":")[0],
-                port=host.split(":")[1],
-            )
-            queries = query_parser(data)
-            for q in queries:
-                await conn.execute(q)
-
-            await conn.close()
+    def __init__(
+        self,
+        node,
+        user,
+        password,
+        database,
+        host,
+        query_parser=None,
+        query=None,
+        table=None,
+        columns=None,
+        record_parser=None,
+        batch_size=100,
+        batch_interval=0.1,
+        pool_size=10,
+        pool=None,
+        max_retries=3,
+        dead_letter=None,
+    ):
+        if sum(_ is not None for _ in (query_parser, query, table)) != 1:
+            raise TributaryException("Must provide one of query_parser, query, table")
+
+        record_parser = record_parser or _record
+
+        # queries or records to write
+        buffer = []
+
+        async def _flush(self=self, buffer=buffer):
+            async with self.lock:
+                if not buffer:
+                    return
+
+                # kept buffered until written, so a failed batch is retried on the next flush
+                batch = buffer[:]
+
+                start = time.monotonic()
+
+                try:
+                    async with self.pool.acquire() as conn:
+                        if table is not None:
+                            await conn.copy_records_to_table(
+                                table, records=batch, columns=columns
+                            )
+                        elif query is not None:
+                            await conn.executemany(query, batch)
+                        else:
+                            # one transaction, but queries run as given
+                            async with conn.transaction():
+                                for q in batch:
+                                    await conn.execute(q)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.retries += 1
+
+                    if self.retries > max_retries:
+                        # give up, so one bad batch doesn't block the sink
+                        del buffer[: len(batch)]
+                        self.retries = 0
+                        self.stats["dropped"] += len(batch)
+                        if dead_letter is not None:
+                            dead_letter(batch, e)
+                    raise
+
+                # ticks may have been buffered meanwhile
+                del buffer[: len(batch)]
+                self.retries = 0
+
+                latency = time.monotonic() - start
+                self.stats["flushes"] += 1
+                self.stats["records"] += len(batch)
+                self.stats["last_batch_size"] = len(batch)
+                self.stats["last_latency"] = latency
+                self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+
+        async def _flushEvery(self=self):
+            while True:
+                await asyncio.sleep(batch_interval)
+                try:
+                    # don't lose a batch in flight when cancelled on stop
+                    await asyncio.shield(_flush())
+                except Exception as e:
+                    # raise on next tick
+                    self.error = e
+
+        async def _send(data, self=self, buffer=buffer):
+            if self.error is not None:
+                error, self.error = self.error, None
+                raise error
+
+            if query_parser is not None:
+                buffer.extend(query_parser(data))
+            else:
+                buffer.extend(record_parser(data))
+
+            if len(buffer) >= batch_size:
+                await _flush()
             return data
 
         super().__init__(foo=_send, name="PostgresSink", inputs=1)
         node >> self
 
+        self.set("pool", pool)
+        self.set("lock", None)
+        self.set("flusher", None)
+        self.set("error", None)
+        # failed attempts at the batch at the head of the buffer
+        self.set("retries", 0)
+        self.set(
+            "stats",
+            {
+                "flushes": 0,
+                "failed": 0,
+                "records": 0,
+                "dropped": 0,
+                "last_batch_size": 0,
+                "last_latency": 0.0,
+                "max_latency": 0.0,
+            },
+        )
+
+        async def _start(self=self):
+            # only one flush at a time
+            self.lock = asyncio.Lock()
+
+            if self.pool is None:
+                self.pool = await asyncpg.create_pool(
+                    user=user,
+                    password=password,
+                    database=database,
+                    host=host.split(":")[0],
+                    port=host.split(":")[1],
+                    min_size=1,
+                    max_size=pool_size,
+                )
+
+            if batch_interval:
+                self.flusher = asyncio.create_task(_flushEvery())
+
+        async def _shutdown(self=self):
+            if self.flusher is not None:
+                self.flusher.cancel()
+
+            try:
+                # write anything left
+                await _flush()
+            finally:
+                if pool is None:
+                    await self.pool.close()
+                    self.pool = None
+
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
 
 Node.postgres = Postgres
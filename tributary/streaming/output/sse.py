@@ -1,15 +1,37 @@
 import asyncio
-from collections import deque
 import json as JSON
+import re
 from aiohttp import web
 from aiohttp_sse import sse_response
+from .broadcast import Broadcast
 from .output import Foo
 from ..node import Node
 
+_LINE_SEP = re.compile(r"\r\n|\r|\n")
+
+
+async def _write(resp, data, timeout):
+    """write an encoded event, handling slow and gone clients as `EventSourceResponse.send`"""
+    try:
+        await asyncio.wait_for(resp.write(data), timeout)
+    except (ConnectionResetError, asyncio.TimeoutError):
+        resp.stop_streaming()
+        raise
+
+
+def _event(data):
+    """encode data as an sse event"""
+    lines = "".join("data: {}\r\n".format(line) for line in _LINE_SEP.split(data))
+    return (lines + "\r\n").encode("utf-8")
+
 
 class SSE(Foo):
     """Host an sse server and send results on requests
 
+    Each tick is encoded once and the same event shared by every client, through a bounded
+    queue per client (see `Broadcast`). Clients that fall `max_queue` events behind are
+    handled according to `slow_consumer`.
+
     Args:
         path (str): route on which to host sse server
         json (bool): load http content data as json
@@ -22,6 +44,10 @@ class SSE(Foo):
         port (Optional[int]): if running the web app, port to listen on
         request_handler (Optional[callable]): custom handler to process the request from client
         response_handler (Optional[callable]): custom handler to manage the response sent to client
+        snapshot_size (int): if snapshot, number of latest ticks in the snapshot
+        max_queue (int): maximum number of ticks queued per client
+        slow_consumer (str): what to do with clients falling behind, in ("drop", "conflate", "disconnect")
+        send_timeout (float): seconds to wait for a client to take an event before disconnecting it
     """
 
     def __init__(
@@ -38,41 +64,46 @@ class SSE(Foo):
         port=8080,
         request_handler=None,
         response_handler=None,
+        snapshot_size=1000,
+        max_queue=1000,
+        slow_consumer="drop",
+        send_timeout=10,
     ):
         # instantiate server if not existing
         server = server or web.Application()
 
-        # capture history
-        self._history = deque()
+        # clients' queues and history
+        self._broadcast = Broadcast(
+            snapshot_size if snapshot else 0, max_queue, slow_consumer
+        )
+        self._history = self._broadcast.history
 
-        # create queue map for clients
-        self._queue_map = {}
+        # ticks are sent to clients as is, rather than encoded once for all
+        custom = bool(request_handler or response_handler)
 
         # http server handler
         async def _handler(
             request,
-            queue_map=self._queue_map,
-            history=self._history,
+            broadcast=self._broadcast,
             request_handler=request_handler,
             response_handler=response_handler,
         ):
             async with sse_response(request) as resp:
-                if resp not in queue_map:
-                    # create a queue for this client
-                    queue_map[resp] = asyncio.Queue()
-
-                    # send history if snapshotting
-                    for data in history:
-                        if response_handler and callable(response_handler):
-                            data = await response_handler(request, data)
-                        await resp.send(data)
-
-                queue = queue_map[resp]
+                # snapshot, then new ticks
+                subscriber = broadcast.subscribe()
 
                 try:
                     while not resp.task.done():
-                        # put the request into the queue
-                        data = await queue.get()
+                        data = await subscriber.get()
+
+                        if data is None:
+                            # disconnected as a slow consumer
+                            break
+
+                        if not custom:
+                            # already encoded
+                            await _write(resp, data, send_timeout)
+                            continue
 
                         # TODO move this?
                         if request_handler and callable(request_handler):
@@ -88,9 +119,13 @@ class SSE(Foo):
                         else:
                             # just put an ok with data
                             await resp.send(JSON.dumps(data))
+                except (ConnectionResetError, asyncio.TimeoutError):
+                    # client gone, or too slow to take an event
+                    pass
                 finally:
-                    # remove from queue
-                    queue_map.pop(resp)
+                    broadcast.unsubscribe(subscriber)
+
+            return resp
 
         # tributary node handler
         async def _req(
@@ -98,9 +133,7 @@ class SSE(Foo):
             json=json,
             wrap=wrap,
             field=field,
-            snapshot=snapshot,
-            queue_map=self._queue_map,
-            history=self._history,
+            broadcast=self._broadcast,
         ):
             if json:
                 data = JSON.dumps(data)
@@ -111,14 +144,13 @@ class SSE(Foo):
             if wrap:
                 data = [data]
 
-            # put data in history
-            if snapshot:
-                history.append(data)
-
-            # put data into queue
-            await asyncio.gather(
-                *(asyncio.create_task(queue.put(data) for queue in queue_map.values()))
-            )
+            if custom:
+                broadcast.publish(data)
+            else:
+                # encode once for all clients
+                broadcast.publish(
+                    _event(data if json and isinstance(data, str) else JSON.dumps(data))
+                )
 
             # TODO expect response from clients?
             return data
@@ -130,6 +162,9 @@ class SSE(Foo):
         # set server attribute so it can be accessed
         self.set("server", server)
 
+        # counts of published ticks, and dropped ticks and disconnected clients if slow
+        self.set("stats", self._broadcast.stats)
+
         # install get handler
         server.router.add_get(path, _handler)
 
@@ -150,6 +185,8 @@ class SSE(Foo):
                 await site.start()
 
             async def _shutdown(self=self, server=server, host=host, port=port):
+                # let clients' handlers finish
+                self._broadcast.close()
                 await self.site.stop()
                 await self.app.cleanup()
 
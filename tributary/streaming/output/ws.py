@@ -1,22 +1,40 @@
 import asyncio
 import aiohttp
 import json as JSON
-from collections import deque
 from aiohttp import web
+from .broadcast import Broadcast
 from .output import Foo
 from ..node import Node
+from ..session import lifecycle, retry
 from ...base import StreamNone, StreamEnd
 
 
 class WebSocket(Foo):
     """Connect to websocket and send data
 
+    One connection is opened when the graph starts, through the graph's shared client session
+    (see `tributary.streaming.session`), and used for every tick. Unless waiting for a `response`, ticks
+    don't wait on the socket: up to `max_pending` messages are queued and sent back to back,
+    and anything left is sent when the graph stops. A dropped connection is reopened, retrying
+    `retries` times and waiting exponentially longer from `backoff` seconds, and the message
+    resent. Send errors are raised on the next tick, or when the graph stops.
+
     Args:
         node (Node): input tributary
         url (str): websocket url to connect to
         json (bool): dump data as json
         wrap (bool): wrap result in a list
+        field (str): field to index response by
+        response (bool): wait for a response to each message
+        response_timeout (float): seconds to wait for a response
         binary (bool): send_bytes instead of send_str
+        max_pending (int): if not response, maximum number of messages waiting to be sent
+        heartbeat (float): if set, seconds between pings keeping the connection alive
+        limit (int): maximum number of connections of the shared session
+        keepalive_timeout (float): seconds to keep idle connections open
+        retries (int): times to retry a failed connection
+        backoff (float): seconds to wait before the first retry
+        session (aiohttp.ClientSession): existing session to use, which won't be closed when the graph stops
     """
 
     def __init__(
@@ -29,7 +47,49 @@ class WebSocket(Foo):
         response=False,
         response_timeout=1,
         binary=False,
+        max_pending=1000,
+        heartbeat=None,
+        limit=100,
+        keepalive_timeout=15,
+        retries=3,
+        backoff=0.1,
+        session=None,
     ):
+        async def _connect(self=self):
+            self.ws = await retry(
+                lambda: self.session.ws_connect(url, heartbeat=heartbeat),
+                retries,
+                backoff,
+                (aiohttp.ClientError, asyncio.TimeoutError),
+            )
+
+        async def _send_once(data, self=self):
+            if self.ws is None or self.ws.closed:
+                await _connect()
+            try:
+                if binary:
+                    await self.ws.send_bytes(data)
+                else:
+                    await self.ws.send_str(data)
+            except ConnectionError:
+                # dropped, reconnect and resend
+                self.ws = None
+                raise
+
+        async def _write(data):
+            await retry(lambda: _send_once(data), retries, backoff, (ConnectionError,))
+
+        async def _sendEvery(self=self):
+            while True:
+                data = await self.pending.get()
+                try:
+                    await _write(data)
+                except Exception as e:
+                    # raise on next tick
+                    self.error = e
+                finally:
+                    self.pending.task_done()
+
         async def _send(
             data,
             url=url,
@@ -38,35 +98,31 @@ class WebSocket(Foo):
             field=field,
             response=response,
             response_timeout=response_timeout,
-            binary=binary,
+            self=self,
         ):
             if isinstance(data, (StreamNone, StreamEnd)):
                 return data
 
+            if self.error is not None:
+                error, self.error = self.error, None
+                raise error
+
             if wrap:
                 data = [data]
             if json:
                 data = JSON.dumps(data)
 
-            session = aiohttp.ClientSession()
-            async with session.ws_connect(url) as ws:
-                if binary:
-                    await ws.send_bytes(data)
-                else:
-                    await ws.send_str(data)
-
-                if response:
-                    msg = await ws.receive(response_timeout)
-                    if msg.type == aiohttp.WSMsgType.TEXT:
-                        x = msg.data
-                    elif msg.type == aiohttp.WSMsgType.CLOSED:
-                        x = "{}"
-                    elif msg.type == aiohttp.WSMsgType.ERROR:
-                        x = "{}"
-                else:
-                    x = "{}"
+            x = "{}"
 
-            await session.close()
+            if response:
+                await _write(data)
+
+                msg = await self.ws.receive(response_timeout)
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    x = msg.data
+            else:
+                # waits if max_pending are queued
+                await self.pending.put(data)
 
             if json:
                 x = JSON.loads(x)
@@ -82,10 +138,51 @@ class WebSocket(Foo):
         super().__init__(foo=_send, name="WebSocket", inputs=1)
         node >> self
 
+        self.set("ws", None)
+        self.set("pending", None)
+        self.set("sender", None)
+        self.set("error", None)
+
+        _acquire, _release = lifecycle(self, session, limit, keepalive_timeout)
+
+        async def _start(self=self):
+            await _acquire()
+            await _connect()
+
+            if not response:
+                self.pending = asyncio.Queue(max_pending)
+                self.sender = asyncio.create_task(_sendEvery())
+
+        async def _shutdown(self=self):
+            try:
+                if self.sender is not None:
+                    # send anything left
+                    await self.pending.join()
+                    self.sender.cancel()
+                    self.sender = None
+
+                if self.ws is not None:
+                    await self.ws.close()
+                    self.ws = None
+
+                if self.error is not None:
+                    # no tick left to raise it on
+                    error, self.error = self.error, None
+                    raise error
+            finally:
+                await _release()
+
+        self._onstarts = (_start,)
+        self._onstops = (_shutdown,)
+
 
 class WebSocketServer(Foo):
     """Host a websocket server and stream in the data
 
+    Each tick is encoded once and the same message shared by every client, through a
+    bounded queue per client (see `Broadcast`). Clients that fall `max_queue` messages behind
+    are handled according to `slow_consumer`.
+
     Args:
         path (str): route on which to host ws server
         json (bool): load http content data as json
@@ -98,7 +195,10 @@ class WebSocketServer(Foo):
         port (Optional[int]): if running the web app, port to listen on
         request_handler (Optional[callable]): custom handler to process the request from client
         response_handler (Optional[callable]): custom handler to manage the response sent to client
-        binary (bool): send_bytes instead of send_str
+        binary (bool): send_bytes instead of send_str, for responses of `response_handler`
+        snapshot_size (int): if snapshot, number of latest ticks in the snapshot
+        max_queue (int): maximum number of ticks queued per client
+        slow_consumer (str): what to do with clients falling behind, in ("drop", "conflate", "disconnect")
     """
 
     def __init__(
@@ -116,21 +216,26 @@ class WebSocketServer(Foo):
         request_handler=None,
         response_handler=None,
         binary=False,
+        snapshot_size=1000,
+        max_queue=1000,
+        slow_consumer="drop",
     ):
         # instantiate server if not existing
         server = server or web.Application()
 
-        # capture history
-        self._history = deque()
+        # clients' queues and history
+        self._broadcast = Broadcast(
+            snapshot_size if snapshot else 0, max_queue, slow_consumer
+        )
+        self._history = self._broadcast.history
 
-        # create queue map for clients
-        self._queue_map = {}
+        # ticks are sent to clients as is, rather than encoded once for all
+        custom = bool(request_handler or response_handler)
 
         # http server handler
         async def _handler(
             request,
-            queue_map=self._queue_map,
-            history=self._history,
+            broadcast=self._broadcast,
             request_handler=request_handler,
             response_handler=response_handler,
             binary=binary,
@@ -138,51 +243,53 @@ class WebSocketServer(Foo):
             ws = web.WebSocketResponse()
             await ws.prepare(request)
 
-            if ws not in queue_map:
-                # create a queue for this client
-                queue_map[ws] = asyncio.Queue()
+            # snapshot, then new ticks
+            subscriber = broadcast.subscribe()
+
+            try:
+                while not ws.closed:
+                    data = await subscriber.get()
 
-                # send history if snapshotting
-                for data in history:
+                    if data is None:
+                        # disconnected as a slow consumer
+                        break
+
+                    if not custom:
+                        # already encoded json, always sent as text as before,
+                        # `binary` only applies to handlers' responses
+                        if hasattr(ws, "send_frame"):
+                            await ws.send_frame(data, aiohttp.WSMsgType.TEXT)
+                        else:
+                            await ws.send_str(data.decode("utf-8"))
+                        continue
+
+                    # TODO move this?
+                    if request_handler and callable(request_handler):
+                        data = await request_handler(request)
+
+                    # if custom response handler is given, use that to determine response
                     if response_handler and callable(response_handler):
                         data = await response_handler(request, data)
-                    if binary:
-                        await ws.send_bytes(data)
-                    else:
-                        await ws.send_str(data)
-
-                queue = queue_map[ws]
+                        if binary:
+                            await ws.send_bytes(data)
+                        else:
+                            await ws.send_str(data)
 
-                try:
-                    while not ws.closed:
-                        # put the request into the queue
-                        data = await queue.get()
-
-                        # TODO move this?
-                        if request_handler and callable(request_handler):
-                            data = await request_handler(request)
-
-                        # if custom response handler is given, use that to determine response
-                        if response_handler and callable(response_handler):
-                            data = await response_handler(request, data)
-                            if binary:
-                                await ws.send_bytes(data)
-                            else:
-                                await ws.send_str(data)
-
-                        elif response_handler and isinstance(
-                            response_handler, (str, bytes)
-                        ):
-                            if binary:
-                                await ws.send_bytes(response_handler)
-                            else:
-                                await ws.send_str(response_handler)
+                    elif response_handler and isinstance(
+                        response_handler, (str, bytes)
+                    ):
+                        if binary:
+                            await ws.send_bytes(response_handler)
                         else:
-                            # just put an ok with data
-                            await ws.send_str(JSON.dumps(data))
-                finally:
-                    # remove from queue
-                    queue_map.pop(ws)
+                            await ws.send_str(response_handler)
+                    else:
+                        # just put an ok with data
+                        await ws.send_str(JSON.dumps(data))
+            finally:
+                broadcast.unsubscribe(subscriber)
+                await ws.close()
+
+            return ws
 
         # tributary node handler
         async def _req(
@@ -190,9 +297,7 @@ class WebSocketServer(Foo):
             json=json,
             wrap=wrap,
             field=field,
-            snapshot=snapshot,
-            queue_map=self._queue_map,
-            history=self._history,
+            broadcast=self._broadcast,
         ):
             if json:
                 data = JSON.dumps(data)
@@ -203,14 +308,12 @@ class WebSocketServer(Foo):
             if wrap:
                 data = [data]
 
-            # put data in history
-            if snapshot:
-                history.append(data)
-
-            # put data into queue
-            await asyncio.gather(
-                *(asyncio.create_task(queue.put(data)) for queue in queue_map.values())
-            )
+            if custom:
+                broadcast.publish(data)
+            else:
+                # encode once for all clients
+                message = data if json and isinstance(data, str) else JSON.dumps(data)
+                broadcast.publish(message.encode("utf-8"))
 
             # TODO expect response from clients?
             return data
@@ -222,6 +325,9 @@ class WebSocketServer(Foo):
         # set server attribute so it can be accessed
         self.set("server", server)
 
+        # counts of published ticks, and dropped ticks and disconnected clients if slow
+        self.set("stats", self._broadcast.stats)
+
         # install get handler
         server.router.add_get(path, _handler)
 
@@ -242,6 +348,8 @@ class WebSocketServer(Foo):
                 await site.start()
 
             async def _shutdown(self=self, server=server, host=host, port=port):
+                # let clients' handlers finish
+                self._broadcast.close()
                 await self.site.stop()
                 await self.app.cleanup()
 
@@ -1,72 +1,223 @@
 import sys
 import time
-from io import StringIO
+import traceback
+from io import StringIO, TextIOBase
 from datetime import datetime, timedelta
-from multiprocessing import Process
-from threading import Thread
+from functools import partial
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from queue import SimpleQueue
+from threading import Lock, Thread
 from .node import Node
 from ..base import TributaryException
 
 
-def _waitToRun(stdout, stderr, startsafter, endsafter, graph):
-    # remap outputs
-    # TODO
-    # sys.stderr = stderr
-    # sys.stdout = stdout
+class _Channel(object):
+    """Messages from a graph's process to the scheduler, sent from a background
+    thread so that writing output never blocks the graph's event loop"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._queue = SimpleQueue()
+        self._thread = Thread(target=self._send, daemon=True)
+        self._thread.start()
+
+    def put(self, kind, data):
+        self._queue.put((kind, data))
+
+    def close(self, timeout=1):
+        """send anything left, e.g. before exiting"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _send(self):
+        while True:
+            messages = [self._queue.get()]
+            while not self._queue.empty():
+                messages.append(self._queue.get())
+
+            for kind, data in _coalesce(messages):
+                if kind is None:
+                    return
+                try:
+                    self._conn.send((kind, data))
+                except (OSError, ValueError):
+                    # scheduler has gone away
+                    return
+
+
+def _coalesce(messages):
+    """merge consecutive writes to the same stream into one message"""
+    ret = []
+    for message in messages:
+        if message is None:
+            ret.append((None, None))
+        elif ret and message[0] in ("stdout", "stderr") and ret[-1][0] == message[0]:
+            ret[-1] = (message[0], ret[-1][1] + message[1])
+        else:
+            ret.append(message)
+    return ret
+
+
+class _ChannelWriter(TextIOBase):
+    """file-like object writing to a channel, to replace stdout/stderr"""
+
+    def __init__(self, channel, kind):
+        self._channel = channel
+        self._kind = kind
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        self._channel.put(self._kind, s)
+        return len(s)
+
+
+def _metrics(graph, last, interval):
+    """executions per second and queued inputs of each node, by name"""
+    ret = {}
+    for level in graph._nodes:
+        for node in level:
+            ret[node._name] = {
+                "executions": node._execution_count,
+                "throughput": (node._execution_count - last.get(node._name, 0))
+                / interval,
+                "queued": sum(len(inp) for inp in node._input),
+            }
+    return ret
+
+
+def _reportMetrics(channel, graph, interval):
+    executions = {}
+    while True:
+        time.sleep(interval)
+        metrics = _metrics(graph, executions, interval)
+        executions = {name: m["executions"] for name, m in metrics.items()}
+        channel.put("metrics", metrics)
+
+
+def _waitToRun(
+    conn,
+    startsafter,
+    endsafter,
+    graph,
+    checkpoint_interval=None,
+    metrics_interval=1,
+):
+    # send outputs to the scheduler
+    channel = _Channel(conn)
+    sys.stdout = _ChannelWriter(channel, "stdout")
+    sys.stderr = _ChannelWriter(channel, "stderr")
 
     # Fix issue with aioconsole
     Node.print._multiprocess = "yes"
 
+    # initialized, now wait to be started with the checkpoint to resume from.
+    # A warm standby waits here until the running process dies
+    try:
+        checkpoint = conn.recv()
+    except EOFError:
+        # scheduler has gone away
+        sys.exit(0)
+
+    if checkpoint:
+        graph.restoreCheckpoint(checkpoint)
+
+    oncheckpoint = None
+    if checkpoint_interval:
+        oncheckpoint = partial(channel.put, "checkpoint")
+
+    if metrics_interval:
+        Thread(
+            target=_reportMetrics,
+            args=(channel, graph, metrics_interval),
+            daemon=True,
+        ).start()
+
     if (startsafter - datetime.now()).total_seconds() > 0:
         # in the future
         time.sleep((startsafter - datetime.now()).total_seconds())
 
     try:
-        graph.run(blocking=True, newloop=True)
+        graph.run(
+            blocking=True,
+            newloop=True,
+            oncheckpoint=oncheckpoint,
+            checkpoint_interval=checkpoint_interval or 1,
+        )
     except KeyboardInterrupt:
-        sys.exit(0)
+        code = 0
     except BaseException:
-        sys.exit(1)
+        traceback.print_exc()
+        code = 1
     else:
         # TODO do this?
         # time.sleep((endsafter - datetime.now()).total_seconds())
-        sys.exit(0)
+        code = 0
+
+    channel.close()
+    sys.exit(code)
 
 
-def _printOuts(stdout, stderr):
-    if stdout:
-        print(stdout, file=sys.stdout)
-    if stderr:
-        print(stderr, file=sys.stderr)
+def _printOuts(scheduler, printed):
+    """print output of the subprocess after the `printed` positions, returning the new positions"""
+    stdout, stderr = scheduler.output()
+    if len(stdout) > printed[0]:
+        print(stdout[printed[0] :], file=sys.stdout, end="")
+    if len(stderr) > printed[1]:
+        print(stderr[printed[1] :], file=sys.stderr, end="")
+    return len(stdout), len(stderr)
 
 
 def _monitor(scheduler):
+    printed = 0, 0
+
     while not scheduler.shouldend():
         # Monitor that process is running
         if not scheduler.alive():
             # restart subprocess if exit uncleanly
             if scheduler.exitcode() == 0:
                 print("exiting...")
-                return
+                scheduler._stopStandby()
+                break
             print("restarting...")
             scheduler.restart()
 
-        # sleep for a second
-        time.sleep(1)
-        _printOuts(*scheduler.output())
+        # wait for up to a second, or until the process exits
+        scheduler._wait(1)
+        printed = _printOuts(scheduler, printed)
 
     # dump last
-    _printOuts(*scheduler.output())
+    _printOuts(scheduler, printed)
 
 
 class Scheduler(object):
-    def __init__(self, graph, startsafter=None, endsafter=None):
+    def __init__(
+        self,
+        graph,
+        startsafter=None,
+        endsafter=None,
+        standby=False,
+        checkpoint_interval=1,
+        metrics_interval=1,
+    ):
         """Construct a new scheduler object
 
         Args:
             graph (StreamingGraph): the graph object to run
             end (Optional[datetime]): when to terminate the graph
+            standby (bool): keep a warm standby process, initialized and waiting to take over
+                            from the last checkpoint of the running process if it dies
+            checkpoint_interval (float): if standby, seconds between checkpoints of the graph's state
+            metrics_interval (float): seconds between reports of each node's throughput and queued inputs
         """
+        if standby:
+            try:
+                import dill  # noqa: F401
+            except ImportError:
+                raise TributaryException("dill is required to checkpoint a standby")
+
         # Graph object
         self._graph = graph
 
@@ -79,9 +230,29 @@ class Scheduler(object):
         # Runner process
         self._process = None
 
+        # Stopped by the user, so don't restart
+        self._stopped = False
+
+        # Pipe from runner process, for its output, metrics and checkpoints
+        self._conn = None
+
+        # Warm standby process and its pipe, and last checkpoint of the graph's state
+        self._standby = standby
+        self._standby_process = None
+        self._standby_conn = None
+        self._checkpoint = None
+        self._checkpoint_interval = checkpoint_interval
+
         # IO of subprocess
-        self._stdout = None
-        self._stderr = None
+        self._stdout = StringIO()
+        self._stderr = StringIO()
+
+        # guard reading from the pipe
+        self._lock = Lock()
+
+        # latest metrics of subprocess
+        self._metrics = None
+        self._metrics_interval = metrics_interval
 
         # Monitor process
         self._monitor = Thread(target=_monitor, args=(self,))
@@ -94,7 +265,7 @@ class Scheduler(object):
         return self._endsafter
 
     def shouldend(self):
-        return datetime.now() > self.endsafter()
+        return self._stopped or datetime.now() > self.endsafter()
 
     def alive(self):
         return self._process.is_alive()
@@ -111,34 +282,116 @@ class Scheduler(object):
         return self._process.exitcode
 
     def output(self):
+        """stdout and stderr of the subprocess, across restarts"""
+        self._receive()
         return self._stdout.getvalue(), self._stderr.getvalue()
 
+    def metrics(self):
+        """latest metrics of the subprocess, by node name. For each node:
+        executions (int): number of times the node has executed
+        throughput (float): executions per second since the last report
+        queued (int): number of inputs waiting to be processed
+        """
+        self._receive()
+        return self._metrics
+
     def restart(self):
         """restart the subprocess
 
+        If standby, the standby process is started from the last checkpoint,
+        and a new standby is forked.
+
         Note: this does not check the status of the subprocess
         """
-        # IO of subprocess
-        self._stdout = StringIO()
-        self._stderr = StringIO()
-
         # assert no running process or that process is dead
         assert (self._process is None) or (not self._process.is_alive())
 
-        # instantiate process
-        self._process = Process(
+        # pick up anything the dead process sent
+        self._receive()
+
+        if (
+            self._standby
+            and self._standby_process is not None
+            and self._standby_process.is_alive()
+        ):
+            # promote standby
+            self._process, self._conn = self._standby_process, self._standby_conn
+        else:
+            self._process, self._conn = self._fork()
+
+        # start from the last checkpoint
+        self._conn.send(self._checkpoint)
+
+        if self._standby:
+            # and prepare the next standby
+            self._standby_process, self._standby_conn = self._fork()
+
+    def _fork(self):
+        """start a process, which will wait to be sent a checkpoint to run from"""
+        conn, child_conn = Pipe()
+
+        process = Process(
             target=_waitToRun,
             args=(
-                self._stdout,
-                self._stderr,
+                child_conn,
                 self._startsafter,
                 self._endsafter,
                 self._graph,
+                self._checkpoint_interval if self._standby else None,
+                self._metrics_interval,
             ),
         )
-
-        # Start subprocess
-        self._process.start()
+        process.start()
+
+        # so we see EOF if the process dies
+        child_conn.close()
+        return process, conn
+
+    def _wait(self, timeout):
+        """wait up to `timeout` seconds for the process to exit,
+        collecting messages as they arrive"""
+        end = time.monotonic() + timeout
+
+        while self.alive() and time.monotonic() < end:
+            waitables = [self._process.sentinel]
+            if self._conn is not None:
+                waitables.append(self._conn)
+
+            wait(waitables, max(end - time.monotonic(), 0))
+            self._receive()
+
+        # pick up any sent before exiting
+        self._receive()
+
+    def _receive(self):
+        """collect any output, metrics and checkpoints sent by the process"""
+        if self._conn is None:
+            return
+
+        # called from monitor thread, as well as `output()` and `metrics()`
+        with self._lock:
+            self._drain()
+
+    def _drain(self):
+        try:
+            while self._conn.poll():
+                kind, data = self._conn.recv()
+                if kind == "stdout":
+                    self._stdout.write(data)
+                elif kind == "stderr":
+                    self._stderr.write(data)
+                elif kind == "metrics":
+                    self._metrics = data
+                elif kind == "checkpoint":
+                    self._checkpoint = data
+        except (EOFError, OSError):
+            # process has exited
+            pass
+
+    def _stopStandby(self):
+        if self._standby_process is not None and self._standby_process.is_alive():
+            self._standby_process.kill()
+            self._standby_process.join()
 
     def start(self):
         """Start running graph in a subprocess and monitor it.
@@ -167,6 +420,7 @@ class Scheduler(object):
         """
         if self._process is None:
             raise TributaryException("Process not yet started!")
+        self._stopped = True
         if not kill_immediately:
             print("terminating...")
             self._process.terminate()
@@ -180,3 +434,4 @@ class Scheduler(object):
             print("killing...")
             self._process.kill()
         self._process.join()
+        self._stopStandby()
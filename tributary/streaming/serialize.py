@@ -1,16 +1,50 @@
 class NodeSerializeMixin(object):
+    __slots__ = ()
+
+    def checkpoint(self):
+        """return a serializeable structure representing this node's runtime state,
+        e.g. to resume a copy of this node in another process. State set with `set()`
+        which can't be serialized (e.g. servers) is skipped"""
+        import dill
+
+        ret = {}
+        ret["input"] = [dill.dumps(_) for _ in self._input]
+        ret["active"] = [dill.dumps(_) for _ in self._active]
+        ret["execution_count"] = self._execution_count
+        ret["last"] = dill.dumps(self._last)
+        ret["finished"] = self._finished
+
+        ret["state"] = {}
+        for k, v in self._state.items():
+            try:
+                ret["state"][k] = dill.dumps(v)
+            except Exception:
+                continue
+        return ret
+
+    def restoreCheckpoint(self, ret):
+        """restore this node's runtime state from `checkpoint()`"""
+        import dill
+
+        self._input = [dill.loads(_) for _ in ret["input"]]
+        self._active = [dill.loads(_) for _ in ret["active"]]
+        self._execution_count = ret["execution_count"]
+        self._last = dill.loads(ret["last"])
+        self._finished = ret["finished"]
+
+        for k, v in ret.get("state", {}).items():
+            self._state[k] = dill.loads(v)
+
     def save(self):
         """return a serializeable structure representing this node's state"""
         import dill
 
-        ret = {}
+        ret = self.checkpoint()
         ret["id"] = self._id
         ret["graphvizshape"] = self._graphvizshape
         # self._dd3g = None  # TODO
         ret["name"] = self._name_only  # use name sans id
 
-        ret["input"] = [dill.dumps(_) for _ in self._input]
-        ret["active"] = [dill.dumps(_) for _ in self._active]
         ret[
             "downstream"
         ] = []  # TODO think about this more [_.save() for _ in self._downstream]
@@ -21,17 +55,14 @@ class NodeSerializeMixin(object):
 
         ret["delay_interval"] = self._delay_interval
         ret["execution_max"] = self._execution_max
-        ret["execution_count"] = self._execution_count
 
-        ret["last"] = dill.dumps(self._last)
-        ret["finished"] = self._finished
         ret["use_dual"] = self._use_dual
 
         ret["drop"] = self._drop
         ret["replace"] = self._replace
         ret["repeat"] = self._repeat
 
-        ret["attrs"] = self._initial_attrs
+        ret["attrs"] = list(self._state)
         return ret
 
     @staticmethod
@@ -72,8 +103,6 @@ class NodeSerializeMixin(object):
         # restore private attrs
         n._id = ret["id"]
         n._name = "{}#{}".format(name, n._id)
-        n._input = [dill.loads(_) for _ in ret["input"]]
-        n._active = [dill.loads(_) for _ in ret["active"]]
         # n._downstream = [] # TODO upstream don't get saved
         n._upstream = [Node.restore(_) for _ in ret["upstream"]]
 
@@ -81,12 +110,12 @@ class NodeSerializeMixin(object):
         for up_node in n._upstream:
             up_node >> n
 
-        n._execution_count = ret["execution_count"]
-        n._last = ret["last"]
-        n._finished = ret["finished"]
-        n._initial_attrs = ret["attrs"]
+        n.restoreCheckpoint(ret)
         for k, v in extra_attrs.items():
-            setattr(n, k, v)
+            if k in ret["attrs"]:
+                n.set(k, v)
+            else:
+                setattr(n, k, v)
         return n
 
 
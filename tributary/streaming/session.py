@@ -0,0 +1,128 @@
+"""Keep-alive client sessions shared by the nodes of a graph
+
+Nodes making http or websocket requests use one client session per event loop and connector
+settings, opened when the graph starts and closed when the last node using it stops (see
+`lifecycle`). Failed connections are retried, waiting exponentially longer each time.
+"""
+import asyncio
+import aiohttp
+
+# shared client sessions, by event loop and connector settings
+_sessions = {}
+
+# methods safe to repeat, even if the first request reached the server
+_IDEMPOTENT = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE")
+
+
+async def acquire(limit=100, keepalive_timeout=15):
+    """Get the client session shared by every node of the graph running in this event loop,
+    creating it if needed. Its connector keeps up to `limit` connections open, alive for
+    `keepalive_timeout` seconds between requests. Must be released with `release`.
+
+    Args:
+        limit (int): maximum number of simultaneous connections, 0 for no limit
+        keepalive_timeout (float): seconds to keep idle connections open
+    """
+    key = (asyncio.get_running_loop(), limit, keepalive_timeout)
+    entry = _sessions.get(key)
+
+    if entry is None or entry[0].closed:
+        connector = aiohttp.TCPConnector(
+            limit=limit, keepalive_timeout=keepalive_timeout
+        )
+        entry = _sessions[key] = [aiohttp.ClientSession(connector=connector), 0]
+
+    entry[1] += 1
+    return entry[0]
+
+
+async def release(session):
+    """Release a session from `acquire`, closing it once no node uses it anymore"""
+    for key, entry in list(_sessions.items()):
+        if entry[0] is session:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del _sessions[key]
+                await session.close()
+            return
+
+
+def lifecycle(node, session=None, limit=100, keepalive_timeout=15):
+    """Set the node's `session` attribute, and return onstart and onstop coroutines which
+    acquire and release the shared session, unless an existing `session` is given
+
+    Args:
+        node (Node): node making requests with `node.session`
+        session (aiohttp.ClientSession): existing session to use, which won't be closed
+        limit (int): maximum number of connections of the shared session
+        keepalive_timeout (float): seconds to keep idle connections open
+    """
+    node.set("session", session)
+
+    async def _start(node=node):
+        if session is None:
+            node.session = await acquire(limit, keepalive_timeout)
+
+    async def _shutdown(node=node):
+        if session is None and node.session is not None:
+            await release(node.session)
+            node.session = None
+
+    return _start, _shutdown
+
+
+async def backoff(attempt, delay=0.1, max_delay=10):
+    """Sleep before retrying, exponentially longer with each attempt
+
+    Args:
+        attempt (int): number of attempts so far
+        delay (float): seconds to wait after the first attempt
+        max_delay (float): maximum seconds to wait
+    """
+    await asyncio.sleep(min(delay * 2**attempt, max_delay))
+
+
+async def retry(call, retries=3, delay=0.1, errors=(aiohttp.ClientConnectorError,)):
+    """Await `call()`, retrying `retries` times with `backoff` if it raises one of `errors`,
+    and return its result
+
+    Args:
+        call (callable): function returning an awaitable, called for each attempt
+        retries (int): times to retry
+        delay (float): seconds to wait before the first retry
+        errors (tuple): exceptions to retry on
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except errors:
+            if attempt >= retries:
+                raise
+            await backoff(attempt, delay)
+            attempt += 1
+
+
+async def request(session, method, url, retries=3, delay=0.1, **kwargs):
+    """Make a request with `session`, retrying failed connections `retries` times with
+    `backoff`, and return the response
+
+    Requests with idempotent methods are retried on any connection error or timeout. Others,
+    e.g. POST, only if the connection couldn't be established, so they are never sent twice.
+
+    Args:
+        session (aiohttp.ClientSession): session to use
+        method (str): http method
+        url (str): url to request
+        retries (int): times to retry a failed connection
+        delay (float): seconds to wait before the first retry
+        kwargs (dict): arguments of the request
+    """
+    if method.upper() in _IDEMPOTENT:
+        errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+    else:
+        errors = (aiohttp.ClientConnectorError,)
+
+    return await retry(
+        lambda: session.request(method, url, **kwargs), retries, delay, errors
+    )
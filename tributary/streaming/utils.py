@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 from .node import Node
 from ..base import StreamNone, StreamRepeat, StreamEnd, TributaryException
+from ..base import _STREAM_END
 
 
 def Delay(node, delay=1):
@@ -308,7 +309,7 @@ def Subprocess(
                 return stdout
 
         else:
-            if value == StreamEnd():
+            if value is _STREAM_END:
                 try:
                     ret._proc.terminate()
                     ret._proc.kill()
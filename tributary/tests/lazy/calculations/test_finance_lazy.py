@@ -70,3 +70,45 @@ class TestFinance:
         )
 
         assert n_macd().tolist() == expected.values.tolist()
+
+    def test_incremental(self):
+        data = pd.Series(range(40)).apply(lambda x: (x * 7) % 11 + x / 3)
+
+        delta = data.diff().shift(-1)
+        up, down = delta.copy(), delta.copy()
+        up[up < 0] = 0
+        down[down > 0] = 0
+        _gain = up.ewm(alpha=1.0 / 14, adjust=False).mean()
+        _loss = down.abs().ewm(alpha=1.0 / 14, adjust=False).mean()
+        rsi = 100 - (100 / (1 + _gain / _loss))
+
+        fast = data.ewm(span=12, adjust=False).mean()
+        slow = data.ewm(span=26, adjust=False).mean()
+        macd = fast - slow
+        signal = macd.ewm(span=9, adjust=False).mean()
+
+        val = [data[0]]
+        n = tl.Node(value=val)
+        n_rsi = n.rsi()
+        n_macd = n.macd()
+
+        for i, x in enumerate(data[1:]):
+            val.append(x)
+            n._dirty = True
+            assert abs(n_rsi() - rsi[i]) < 1e-9
+            assert abs(n_macd()["MACD"] - macd[i + 1]) < 1e-9
+            assert abs(n_macd()["SIGNAL"] - signal[i + 1]) < 1e-9
+
+        # replacing history starts over
+        n.setValue(list(data[:10]))
+        assert abs(n_rsi() - rsi[8]) < 1e-9
+        assert abs(n_macd()["MACD"] - macd[9]) < 1e-9
+
+        # even by a longer list, equal where the old one ended
+        other = pd.Series(list(data[20:31]))
+        other[9] = data[9]
+        n.setValue(list(other))
+
+        expected = tl.Node(value=list(other))
+        assert abs(n_rsi() - expected.rsi(basket=True)().iloc[-2]) < 1e-9
+        assert abs(n_macd()["MACD"] - expected.macd(basket=True)()[-1][0]) < 1e-9
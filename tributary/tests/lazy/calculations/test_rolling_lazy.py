@@ -1,2 +1,113 @@
+import tributary.lazy as tl
+import pandas as pd
+
+
+def foo():
+    yield 1
+    yield 1
+    yield 1
+    yield 1
+    yield 1
+
+
+def foo2():
+    yield 1
+    yield 2
+    yield 0
+    yield 5
+    yield 4
+
+
+def foo3():
+    yield 1
+    yield 2
+    yield 3
+    yield 4
+    yield 5
+
+
+def foo4():
+    for _ in range(10):
+        yield _
+
+
+def foo5():
+    yield [1, 1, 2]
+    yield [1, 2, 3]
+    yield [3, 4, 5]
+
+
+def run(node, n=5):
+    return [node() for _ in range(n)]
+
+
 class TestRolling:
-    pass
+    def test_count(self):
+        assert run(tl.RollingCount(tl.Node(callable=foo))) == [1, 2, 3, 4, 5]
+
+    def test_sum(self):
+        assert run(tl.RollingSum(tl.Node(callable=foo))) == [1, 2, 3, 4, 5]
+
+    def test_sum_iterable(self):
+        assert run(tl.RollingSum(tl.Node(callable=foo5)), 3) == [4, 10, 22]
+
+    def test_min(self):
+        assert run(tl.RollingMin(tl.Node(callable=foo2))) == [1, 1, 0, 0, 0]
+
+    def test_max(self):
+        assert run(tl.RollingMax(tl.Node(callable=foo2))) == [1, 2, 2, 5, 5]
+
+    def test_average(self):
+        assert run(tl.RollingAverage(tl.Node(callable=foo3))) == [1, 1.5, 2, 2.5, 3]
+
+    def test_diff(self):
+        assert run(tl.Diff(tl.Node(callable=foo2))) == [None, 1, -2, 5, -1]
+
+    def test_first_last(self):
+        assert run(tl.First(tl.Node(callable=foo5)), 3) == [1, 1, 1]
+        assert run(tl.Last(tl.Node(callable=foo5)), 3) == [2, 3, 5]
+
+    def test_sma(self):
+        ret = run(tl.SMA(tl.Node(callable=foo4), window_width=3), 10)
+        comp = pd.Series(range(10)).rolling(3, min_periods=1).mean()
+        assert ret == comp.tolist()
+
+        ret = run(tl.SMA(tl.Node(callable=foo4), window_width=3, full_only=True), 10)
+        assert ret[:2] == [None, None]
+        assert ret[2:] == comp.tolist()[2:]
+
+    def test_ema(self):
+        ret = run(tl.EMA(tl.Node(callable=foo4)), 10)
+        comp = pd.Series(range(10)).ewm(span=10, adjust=False).mean()
+        for x, y in zip(ret, comp):
+            assert abs(x - y) < 1e-12
+
+    def test_ema_adjust(self):
+        ret = run(tl.EMA(tl.Node(callable=foo4), alpha=1 / 10, adjust=True), 10)
+        comp = pd.Series(range(10)).ewm(alpha=1 / 10, adjust=True).mean()
+        for x, y in zip(ret, comp):
+            assert abs(x - y) < 1e-12
+
+    def test_only_new_values(self):
+        n = tl.Node(value=1)
+        count = n.rollingCount()
+        total = n.rollingSum()
+
+        # cached, so state is shared
+        assert n.rollingSum() is total
+
+        assert count() == 1
+        assert total() == 1
+
+        # clean, nothing new
+        assert count() == 1
+        assert total() == 1
+
+        n.setValue(2)
+        assert count() == 2
+        assert total() == 3
+
+        # tweaks aren't kept
+        assert total(node_tweaks={n: 10}) == 13
+        assert total() == 3
+        assert count() == 2
@@ -0,0 +1,89 @@
+import math
+import numpy as np
+import pytest
+import tributary.lazy as tl
+from tributary.base import TributaryException
+
+
+class TestCompile:
+    def test_compile_arithmetic(self):
+        x = tl.Node(name="x", value=1.0)
+        y = tl.Node(name="y", value=2.0)
+        out = (x + y) * x - y / 2 + 1
+
+        f = out.compile()
+        assert [n is m for n, m in zip(f.inputs, [x, y])] == [True, True]
+
+        xs = np.arange(10.0)
+        ys = np.arange(10.0, 20.0)
+        expected = (xs + ys) * xs - ys / 2 + 1
+        assert np.allclose(f(xs, ys), expected)
+
+        # matches scalar evaluation
+        assert f(1.0, 2.0) == out()
+
+    def test_compile_black_scholes(self):
+        spot = tl.Node(name="spot", value=100.0)
+        strike = tl.Node(name="strike", value=100.0)
+        vol = tl.Node(name="vol", value=0.2)
+        rate = tl.Node(name="rate", value=0.01)
+        time = tl.Node(name="time", value=1.0)
+
+        def ncdf(x):
+            return ((x / math.sqrt(2)).erf() + 1) * 0.5
+
+        d1 = ((spot / strike).log() + (rate + vol * vol / 2) * time) / (
+            vol * time.sqrt()
+        )
+        d2 = d1 - vol * time.sqrt()
+        call = spot * ncdf(d1) - strike * (-rate * time).exp() * ncdf(d2)
+
+        f = call.compile(spot, strike, vol, rate, time)
+
+        spots = np.linspace(50, 150, 10000)
+        strikes = np.full_like(spots, 100.0)
+        vols = np.full_like(spots, 0.2)
+        rates = np.full_like(spots, 0.01)
+        times = np.full_like(spots, 1.0)
+        prices = f(spots, strikes, vols, rates, times)
+        assert prices.shape == spots.shape
+
+        for i in (0, 5000, 9999):
+            spot.setValue(spots[i])
+            assert abs(call() - prices[i]) < 1e-8
+
+    def test_compile_upstream_constant(self):
+        x = tl.Node(name="x", value=1.0)
+        y = tl.Node(name="y", value=2.0)
+        out = x * y
+
+        # y is not an input, its current value is used
+        f = out.compile(x)
+        assert np.allclose(f(np.arange(3.0)), [0.0, 2.0, 4.0])
+
+        y.setValue(3.0)
+        assert np.allclose(f(np.arange(3.0)), [0.0, 3.0, 6.0])
+
+        with pytest.raises(TributaryException):
+            f(1.0, 2.0)
+
+    def test_compile_unsupported(self):
+        x = tl.Node(name="x", value=1.0)
+        out = tl.Node(callable=lambda x: x.value() + 1, callable_args=[x])
+
+        with pytest.raises(TributaryException):
+            out.compile()
+
+    def test_compile_kwargs(self):
+        x = tl.Node(name="x", value=1.0)
+        y = tl.Node(name="y", value=2.0)
+        out = tl.Node(
+            callable=lambda x, y: x.value() + y.value(),
+            callable_args=[x],
+            callable_kwargs={"y": y},
+            vectorized=np.add,
+        )
+
+        # keyword operands aren't passed to the vectorized operator
+        with pytest.raises(TributaryException):
+            out.compile()
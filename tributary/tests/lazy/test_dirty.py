@@ -32,3 +32,24 @@ class TestDirtyPropogation:
 
         assert f.x() is None
         assert f.z()() == 10
+
+    def test_diamond_dirtypropogation(self):
+        a = t.Node(name="a", value=1)
+        d = a * 2
+        out = (d + 1) + (d * 3)
+        assert out() == 9
+
+        a.setValue(2)
+        assert out() == 17
+
+    def test_diamond_leaf_dirtypropogation(self):
+        a = t.Node(name="a", value=1)
+        b = t.Node(name="b", value=1)
+        out = a * (a + b)
+        assert out() == 2
+
+        # a reaches out directly, and through a + b
+        a.setValue(2)
+        assert out() == 6
+        a.setValue(3)
+        assert out() == 12
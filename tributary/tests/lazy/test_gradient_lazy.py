@@ -0,0 +1,98 @@
+import math
+import pytest
+import tributary.lazy as tl
+from tributary.base import TributaryException
+
+
+class TestGradient:
+    def test_gradient_arithmetic(self):
+        x = tl.Node(name="x", value=3.0)
+        y = tl.Node(name="y", value=2.0)
+        out = x * y + x / y - y**2
+
+        grad = out.gradient()
+        assert list(grad.keys())[0] is x
+        assert list(grad.keys())[1] is y
+        assert grad[x] == 2.0 + 1 / 2.0
+        assert grad[y] == 3.0 - 3.0 / 4.0 - 4.0
+
+    def test_gradient_matches_dual(self):
+        def f(x):
+            return (x.sin() * x.exp() + x.sqrt()).log()
+
+        x = tl.Node(name="x", value=1.5)
+        grad = f(x).gradient(x)
+
+        x_dual = tl.Node(name="x", value=(1.5, 1), use_dual=True)
+        assert abs(grad[x] - f(x_dual)()[1]) < 1e-12
+
+    def test_gradient_black_scholes(self):
+        spot = tl.Node(name="spot", value=100.0)
+        strike = tl.Node(name="strike", value=110.0)
+        vol = tl.Node(name="vol", value=0.2)
+        rate = tl.Node(name="rate", value=0.01)
+        time = tl.Node(name="time", value=1.0)
+
+        def ncdf(x):
+            return ((x / math.sqrt(2)).erf() + 1) * 0.5
+
+        d1 = ((spot / strike).log() + (rate + vol * vol / 2) * time) / (
+            vol * time.sqrt()
+        )
+        d2 = d1 - vol * time.sqrt()
+        call = spot * ncdf(d1) - strike * (-rate * time).exp() * ncdf(d2)
+
+        grad = call.gradient()
+        assert len(grad) == 5
+
+        # delta
+        assert abs(grad[spot] - ncdf(d1)()) < 1e-12
+
+        # vega
+        pdf = math.exp(-(d1() ** 2) / 2) / math.sqrt(2 * math.pi)
+        assert abs(grad[vol] - spot() * pdf * math.sqrt(time())) < 1e-9
+
+        # compare others against finite differences
+        for node in (strike, rate, time):
+            # bump so that intermediate changes exceed the default tolerance
+            base, bump = node(), 1e-2
+            node.setValue(base + bump)
+            up = call()
+            node.setValue(base - bump)
+            down = call()
+            node.setValue(base)
+            assert abs(grad[node] - (up - down) / (2 * bump)) < 1e-3 * abs(grad[node])
+
+    def test_gradient_many_inputs(self):
+        inputs = [tl.Node(name="x{}".format(i), value=float(i)) for i in range(200)]
+        out = inputs[0].sum(*(x * x for x in inputs[1:]))
+
+        grad = out.gradient()
+        assert len(grad) == 200
+        assert grad[inputs[0]] == 1
+        assert all(grad[x] == 2 * i for i, x in enumerate(inputs) if i > 0)
+
+    def test_gradient_unsupported(self):
+        x = tl.Node(name="x", value=1.0)
+        out = tl.Node(callable=lambda x: x.value() + 1, callable_args=[x]) * 2
+
+        with pytest.raises(TributaryException):
+            out.gradient()
+
+        # unless the callable is treated as an input
+        inner = list(out._dependencies.values())[0][0][0]
+        assert out.gradient(inner)[inner] == 2
+
+    def test_gradient_kwargs(self):
+        x = tl.Node(name="x", value=1.0)
+        y = tl.Node(name="y", value=2.0)
+        out = tl.Node(
+            callable=lambda x, y: x.value() * y.value(),
+            callable_args=[x],
+            callable_kwargs={"y": y},
+            gradient=lambda x, y, out: (y, x),
+        )
+
+        # no partials for keyword operands, rather than leaving them out
+        with pytest.raises(TributaryException):
+            out.gradient()
@@ -1,4 +1,6 @@
 import tributary.lazy as t
+import pytest
+import numpy as np
 import random
 
 
@@ -72,3 +74,50 @@ class TestLazy:
         print(n2._callable_args_mapping[0]["arg"])
         assert n2._callable_args_mapping[0]["node"] == "Test"
         assert n2._callable_args_mapping[0]["arg"] == "x"
+
+    def test_lazy_structural_node_cache(self):
+        n = t.Node(name="Test", value=5)
+        m = t.Node(name="Test", value=6)
+
+        # same operation on same operands is shared
+        assert (n + m) is (n + m)
+        assert (n + 1) is (n + 1)
+
+        # same name, different operands are not
+        assert (n + m) is not (n + n)
+        assert (n + m)() == 11
+        assert (n + n)() == 10
+
+        # constants with the same str are not shared
+        s = t.Node(value="1")
+        assert (s == 1)() is False
+        assert (s == "1")() is True
+
+        # nor are unhashable constants with truncated reprs
+        a1 = np.arange(2000)
+        a2 = a1.copy()
+        a2[1000] = -1
+        assert str(a1) == str(a2)
+        d = t.Node(value=a1)
+        assert (d - a1)().sum() == 0
+        assert (d - a2)().sum() == 1001
+
+    def test_lazy_node_construction(self):
+        n = t.Node(name="Test", value=5)
+        m = t.Node(name="Test", value=6)
+        assert m._id > n._id
+        assert n._name == "Test#{}".format(n._id)
+
+        # bookkeeping is created on first use
+        assert n._parents is None
+        assert n._node_op_cache is None
+
+        out = n + m
+        assert out() == 11
+        assert len(n._parents) == 1 and n._parents[0] is out
+        assert len(n._node_op_cache) == 1
+
+        # no per-instance dict
+        assert not hasattr(n, "__dict__")
+        with pytest.raises(AttributeError):
+            n._extra = 1
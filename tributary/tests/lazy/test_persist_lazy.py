@@ -0,0 +1,118 @@
+import os.path
+import pandas as pd
+import pytest
+import sqlite3
+import tributary.lazy as tl
+from tributary.base import TributaryException
+
+
+class TestPersist:
+    def _graph(self, calls):
+        def price(spot, vol):
+            calls.append((spot.value(), vol.value()))
+            return spot.value() * vol.value()
+
+        spot = tl.Node(name="spot", value=100)
+        vol = tl.Node(name="vol", value=0.2)
+        return spot, vol, tl.Node(callable=price, callable_args=[spot, vol])
+
+    def test_persist_across_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        calls = []
+
+        spot, vol, out = self._graph(calls)
+        tl.Persist(out, tl.PersistentStore(path), key="price")
+        assert out() == 20
+        assert calls == [(100, 0.2)]
+
+        # "restart": new graph, new store on the same file
+        spot, vol, out = self._graph(calls)
+        tl.Persist(out, tl.PersistentStore(path), key="price")
+        assert out() == 20
+        assert calls == [(100, 0.2)]
+
+        # new inputs are computed
+        spot.setValue(200)
+        assert out() == 40
+        assert calls == [(100, 0.2), (200, 0.2)]
+
+        # and old inputs are still stored
+        spot.setValue(100)
+        assert out() == 20
+        assert len(calls) == 2
+
+    def test_persist_eviction(self, tmp_path):
+        store = tl.PersistentStore(str(tmp_path / "cache.db"), max_size=2000)
+
+        for i in range(10):
+            store.set("key", str(i), "x" * 500)
+            assert store.size() <= 2000
+
+        # oldest evicted first
+        assert store.get("key", "0") is None
+        assert store.get("key", "9") == "x" * 500
+
+    def test_persist_path(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        calls = []
+        _, _, out = self._graph(calls)
+        out.persist(path, "price")
+        assert out() == 20
+        assert os.path.exists(path)
+
+        # shared while in use, closed stores aren't reused
+        _, _, other = self._graph(calls)
+        other.persist(path, "other")
+        assert other._persistent_store is out._persistent_store
+
+        out._persistent_store.close()
+        _, _, other = self._graph(calls)
+        other.persist(path, "other")
+        assert other._persistent_store is not out._persistent_store
+        assert other() == 20
+
+    def test_persist_close(self, tmp_path):
+        with tl.PersistentStore(str(tmp_path / "cache.db")) as store:
+            store.set("key", "0", 1)
+            assert store.get("key", "0") == 1
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            store.get("key", "0")
+
+    def test_persist_dynamic(self, tmp_path):
+        def foo():
+            yield 1
+
+        with pytest.raises(TributaryException):
+            tl.Persist(tl.Node(callable=foo), str(tmp_path / "cache.db"), "foo")
+
+    def test_persist_no_key(self, tmp_path):
+        _, _, out = self._graph([])
+
+        with pytest.raises(TributaryException):
+            tl.Persist(out, str(tmp_path / "cache.db"), None)
+
+    def test_persist_labels(self, tmp_path):
+        store = tl.PersistentStore(str(tmp_path / "cache.db"))
+        df = tl.Node(value=pd.DataFrame({"x": [1, 2], "y": [10, 20]}))
+        out = tl.Node(callable=lambda df: df.value()["x"].sum(), callable_args=[df])
+        tl.Persist(out, store, key="sum")
+        assert out() == 3
+
+        # same values, columns swapped
+        df.setValue(df.value().rename(columns={"x": "y", "y": "x"}))
+        assert out() == 30
+
+    def test_persist_unhashable(self, tmp_path):
+        class Foo(object):
+            def __init__(self, x):
+                self.x = x
+
+        store = tl.PersistentStore(str(tmp_path / "cache.db"))
+        foo = tl.Node(value=Foo(1))
+        out = tl.Node(callable=lambda foo: foo.value().x, callable_args=[foo])
+        tl.Persist(out, store, key="x")
+        assert out() == 1
+
+        # no stable fingerprint, so nothing stored
+        assert store.size() == 0
@@ -1,4 +1,9 @@
+import numpy as np
+import pandas as pd
+import pytest
 import tributary.lazy as t
+from tributary.base import TributaryException
+from tributary.utils import _compare
 
 
 class TestTolerance:
@@ -11,3 +16,140 @@ class TestTolerance:
 
         n.setValue(1.0001)
         assert n.isDirty() is True
+
+    def test_compare_arrays(self):
+        a = np.arange(10000, dtype=float)
+        b = a.copy()
+        assert not _compare(b, a)
+
+        b[-1] += 1
+        assert _compare(b, a)
+
+        # shape changes
+        assert _compare(a[:-1], a)
+        assert _compare(a.reshape(100, 100), a)
+
+        # non numeric
+        s = np.array(["a", "b"])
+        assert not _compare(s.copy(), s)
+        assert _compare(np.array(["a", "c"]), s)
+        assert _compare(np.array([True, False]), np.array([True, True]))
+
+    def test_compare_frames(self):
+        df = pd.DataFrame({"a": [1.0, 2.0], "b": ["x", "y"]})
+        assert not _compare(df.copy(), df)
+
+        df2 = df.copy()
+        df2.loc[1, "b"] = "z"
+        assert _compare(df2, df)
+
+        df2 = df.copy()
+        df2.loc[1, "a"] += 0.000000001
+        assert not _compare(df2, df)
+
+        df2.loc[1, "a"] += 1
+        assert _compare(df2, df)
+
+        # shape and label changes
+        assert _compare(df.iloc[:1], df)
+        assert _compare(df.rename(columns={"a": "c"}), df)
+        assert _compare(df["a"].iloc[:1], df["a"])
+        assert not _compare(df["b"].copy(), df["b"])
+
+    def test_compare_identity(self):
+        lst = [1, 2]
+        n = t.Node(value=lst, compare="identity")
+        n.setValue([1, 2])
+        assert n.isDirty() is True
+        n()
+
+        n.setValue(n.value())
+        assert n.isDirty() is False
+
+    def test_compare_version(self):
+        class Versioned(object):
+            def __init__(self):
+                self.version = 0
+                self.data = []
+
+            def append(self, x):
+                self.data.append(x)
+                self.version += 1
+
+        v = Versioned()
+        n = t.Node(value=v, compare="version")
+        n.setValue(v)
+        n()
+
+        n.setValue(v)
+        assert n.isDirty() is False
+
+        v.append(1)
+        n.setValue(v)
+        assert n.isDirty() is True
+
+    def test_compare_hash(self):
+        a = np.zeros(100)
+        n = t.Node(value=a, compare="hash")
+        n.setValue(a)
+        assert n.isDirty() is False
+
+        # in place modification
+        a[50] = 1
+        n.setValue(a)
+        assert n.isDirty() is True
+
+        n()
+        n.setValue(np.array(a))
+        assert n.isDirty() is False
+
+    def test_compare_hash_labels(self):
+        df = pd.DataFrame({"x": [1, 2], "y": [10, 20]})
+        n = t.Node(value=df, compare="hash")
+        out = t.Node(callable=lambda n: n.value()["x"].sum(), callable_args=[n])
+        assert out() == 3
+
+        # same values, columns swapped
+        n.setValue(df.rename(columns={"x": "y", "y": "x"}))
+        assert n.isDirty() is True
+        assert out() == 30
+
+        s = pd.Series([1, 2], name="a")
+        n = t.Node(value=s, compare="hash")
+        n.setValue(s.rename("b"))
+        assert n.isDirty() is True
+
+        n = t.Node(value=s, compare="hash")
+        n.setValue(s.astype(float))
+        assert n.isDirty() is True
+
+    def test_compare_hash_unhashable(self):
+        class Foo(object):
+            pass
+
+        foo = Foo()
+        n = t.Node(value=foo, compare="hash")
+        n.setValue(foo)
+
+        # no stable digest, assume changed
+        assert n.isDirty() is True
+
+    def test_compare_tweak(self):
+        n = t.Node(value=1, compare=lambda new, old: new // 10 != old // 10)
+        out = n + 1
+        assert out() == 2
+
+        assert n.isDirty({n: 2}) is False
+        assert n.isDirty({n: 12}) is True
+
+    def test_compare_custom(self):
+        n = t.Node(value=1, compare=lambda new, old: new // 10 != old // 10)
+        n.setValue(2)
+        assert n.isDirty() is False
+
+        n.setValue(12)
+        assert n.isDirty() is True
+
+    def test_compare_bad(self):
+        with pytest.raises(TributaryException):
+            t.Node(value=1, compare="bad")
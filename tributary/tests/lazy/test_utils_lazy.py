@@ -1,4 +1,8 @@
+import gc
+import threading
+import pytest
 import tributary.lazy as tl
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from time import sleep
 
@@ -57,3 +61,195 @@ class TestUtils:
         n = tl.Window(tl.Node(callable=foo), size=2, full_only=True)
         assert n() is None
         assert n() == [1, 2]
+
+    def test_parallel(self):
+        calls = []
+
+        # each call waits for the other two, so only passes if all run at once
+        barrier = [threading.Barrier(3, timeout=5)]
+
+        def pricer(x):
+            if barrier[0] is not None:
+                barrier[0].wait()
+            calls.append(threading.current_thread().name)
+            return x.value() * 2
+
+        a = tl.Node(value=1)
+        b = tl.Node(value=2)
+        c = tl.Node(value=3)
+
+        pa = tl.Node(callable=pricer, callable_args=[a])
+        pb = tl.Node(callable=pricer, callable_args=[b])
+        pc = tl.Node(callable=pricer, callable_args=[c])
+
+        out = tl.Parallel(pa.sum(pb, pc), max_workers=3)
+
+        assert out() == 12
+        assert len(calls) == 3
+        assert len(set(calls)) == 3
+
+        # only the stale branch is recomputed
+        barrier[0] = None
+        b.setValue(5)
+        assert out() == 18
+        assert len(calls) == 4
+
+        # workers are reused across evaluations
+        barrier[0] = threading.Barrier(3, timeout=5)
+        a.setValue(2)
+        b.setValue(3)
+        c.setValue(4)
+        assert out() == 18
+        assert set(calls[4:]) == set(calls[:3])
+
+        # and shut down with the graph
+        executor = out._executor
+        del out, pa, pb, pc, a, b, c
+        gc.collect()
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+    def test_parallel_dirty_closure(self):
+        a = tl.Node(value=1)
+        b = tl.Node(value=2)
+        pa = a + 1
+        pb = b + 1
+        out = tl.Parallel(pa * pb)
+        assert out() == 6
+
+        # the dirty set is collected without marking anything dirty
+        a.setValue(2)
+        assert pa._dirty_closure() == {id(pa), id(a)}
+        assert pb._dirty_closure() == set()
+        assert not pa._dirty
+        assert out() == 9
+
+    def test_parallel_executor(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def pricer(x):
+            barrier.wait()
+            return x.value()
+
+        a = tl.Node(value=1)
+        b = tl.Node(value=2)
+        pa = tl.Node(callable=pricer, callable_args=[a])
+        pb = tl.Node(callable=pricer, callable_args=[b])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            out = tl.Parallel(pa + pb, executor=executor)
+            assert out() == 3
+
+    def test_parallel_shared_subtree(self):
+        calls = []
+
+        def shared(x):
+            calls.append(x.value())
+            return x.value()
+
+        n = tl.Node(value=1)
+        s = tl.Node(callable=shared, callable_args=[n])
+        out = tl.Parallel((s + 1) * (s + 2))
+        assert out() == 6
+
+        n.setValue(2)
+        assert out() == 12
+        assert calls == [1, 2]
+
+    def test_memoize(self):
+        calls = []
+
+        def book_value(book):
+            calls.append(book.value())
+            return len(book.value())
+
+        book = tl.Node(value="abc")
+        out = tl.Memoize(tl.Node(callable=book_value, callable_args=[book]), maxsize=2)
+
+        assert out() == 3
+        book.setValue("abcd")
+        assert out() == 4
+        assert calls == ["abc", "abcd"]
+
+        # revisit prior state
+        book.setValue("abc")
+        assert out() == 3
+        assert calls == ["abc", "abcd"]
+
+        # evict least recently used
+        book.setValue("ab")
+        assert out() == 2
+        book.setValue("abcd")
+        assert out() == 4
+        assert calls == ["abc", "abcd", "ab", "abcd"]
+
+    def test_memoize_unhashable(self):
+        calls = []
+
+        def foo(x):
+            calls.append(len(x.value()))
+            return len(x.value())
+
+        # keyed on a digest of the contents
+        x = tl.Node(value=[1, 2])
+        out = tl.Memoize(tl.Node(callable=foo, callable_args=[x]))
+        assert out() == 2
+        x.setValue([1, 2, 3])
+        assert out() == 3
+        x.setValue([1, 2])
+        assert out() == 2
+        assert calls == [2, 3]
+
+        # modified in place, not the cached result
+        x.append(4)
+        assert out() == 3
+        assert calls == [2, 3, 3]
+        x.setValue([1, 2])
+        assert out() == 2
+
+        # no digest, not cached
+        x.setValue([object()])
+        assert out() == 1
+        x.setValue([1, 2])
+        assert out() == 2
+        x.setValue([object()])
+        assert out() == 1
+        assert calls == [2, 3, 3, 1, 1]
+
+    def test_memoize_mutable(self):
+        class Book(object):
+            # hashes by identity
+            def __init__(self):
+                self.pages = 1
+
+        def foo(book):
+            return book.value().pages
+
+        book = tl.Node(value=Book())
+        out = tl.Memoize(tl.Node(callable=foo, callable_args=[book]))
+        assert out() == 1
+
+        book.value().pages = 2
+        book._dirty = True
+        assert out() == 2
+
+    def test_memoize_ttl(self):
+        calls = []
+
+        def foo(x):
+            calls.append(x.value())
+            return x.value()
+
+        x = tl.Node(value=1)
+        out = tl.Node(callable=foo, callable_args=[x]).memoize(ttl=1)
+        assert out() == 1
+        x.setValue(2)
+        assert out() == 2
+        x.setValue(1)
+        assert out() == 1
+        assert calls == [1, 2]
+
+        sleep(1.5)
+        x.setValue(2)
+        assert out() == 2
+        assert calls == [1, 2, 2]
@@ -0,0 +1,84 @@
+import os
+import pytest
+import time
+import tributary.streaming as ts
+from tributary.streaming.input.arrow import _arrow, _parquet
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+_TABLE = {"i": list(range(10)), "x": [i * 1.5 for i in range(10)], "y": ["a"] * 10}
+
+
+def _open_files():
+    """paths of this process's open files, where visible"""
+    fds = "/proc/self/fd"
+    if not os.path.isdir(fds):
+        pytest.skip("no /proc")
+    paths = []
+    for fd in os.listdir(fds):
+        try:
+            paths.append(os.readlink(os.path.join(fds, fd)))
+        except OSError:
+            continue
+    return paths
+
+
+class TestArrow:
+    def setup(self):
+        time.sleep(0.5)
+
+    def test_parquet(self, tmp_path):
+        file = str(tmp_path / "test.parquet")
+        pq.write_table(pa.table(_TABLE), file, row_group_size=4)
+
+        # by row group, projected
+        out = ts.ParquetSource(
+            filename=file, columns=["i", "x"], batch_format="records"
+        )
+        ret = ts.run(out.print())
+        assert [len(x) for x in ret] == [4, 4, 2]
+        assert [row for rows in ret for row in rows] == [
+            {"i": i, "x": i * 1.5} for i in range(10)
+        ]
+
+        # by batch of rows
+        out = ts.ParquetSource(filename=file, batch_size=3, batch_format="pandas")
+        ret = ts.run(out.print())
+        assert sum(len(df) for df in ret) == 10
+        assert list(ret[0].columns) == ["i", "x", "y"]
+
+        # closed once read, even while still referenced
+        batches = _parquet(file, None, 3)
+        assert sum(len(b) for b in batches) == 10
+        assert file not in _open_files()
+
+        # or when stopped early
+        batches = _parquet(file, None, 3)
+        next(batches)
+        assert file in _open_files()
+        batches.close()
+        assert file not in _open_files()
+
+    def test_arrow(self, tmp_path):
+        table = pa.table(_TABLE)
+
+        for stream in (False, True):
+            file = str(tmp_path / "test{}.arrow".format(stream))
+            with pa.OSFile(file, "wb") as sink:
+                writer = pa.ipc.new_stream if stream else pa.ipc.new_file
+                with writer(sink, table.schema) as w:
+                    for batch in table.to_batches(max_chunksize=5):
+                        w.write_batch(batch)
+
+            out = ts.ArrowSource(filename=file, columns=["y", "i"])
+            ret = ts.run(out.print())
+            assert len(ret) == 2
+            assert ret[0].schema.names == ["y", "i"]
+            assert [i for b in ret for i in b.column("i").to_pylist()] == list(
+                range(10)
+            )
+
+            batches = _arrow(file, None)
+            assert len(list(batches)) == 2
+            assert file not in _open_files()
@@ -1,7 +1,10 @@
+import csv
 import os
 import os.path
 import time
 import tributary.streaming as ts
+from concurrent.futures import ThreadPoolExecutor
+from tributary.streaming.input.file import _Chunks
 
 
 _DATA = [
@@ -128,3 +131,74 @@ class TestFile:
                 "-2.7621283579713527",
             ],
         ]
+
+    def test_file_chunks(self):
+        file = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "test_file_data.json")
+        )
+
+        # lines split across chunks
+        out = ts.FileSource(filename=file, json=True, chunk_size=100).print()
+        assert ts.run(out) == _DATA
+
+        out = ts.FileSource(filename=file, json=True, chunk_size=300, batch=True)
+        ret = ts.run(out.print())
+        assert len(ret) > 1
+        assert [x for batch in ret for x in batch] == _DATA
+
+    def test_file_csv_quoted_newlines(self, tmp_path):
+        file = str(tmp_path / "quoted.csv")
+        rows = [[str(i), 'line {}\nand "more"\n'.format(i)] for i in range(20)]
+        with open(file, "w", newline="") as fp:
+            csv.writer(fp).writerows(rows)
+
+        # quoted newlines split across chunks
+        out = ts.FileSource(filename=file, csv=True, chunk_size=16)
+        assert ts.run(out.print()) == rows
+
+    def test_file_chunks_close(self, tmp_path):
+        file = str(tmp_path / "lines.txt")
+        with open(file, "w") as fp:
+            fp.write("a\n" * 1000)
+
+        chunks = _Chunks(file, 100)
+        with ThreadPoolExecutor(1) as executor:
+            future = executor.submit(lambda: [chunks.next() for _ in range(1000)])
+
+            # from another thread, while reading
+            chunks.close()
+            assert all(c is None or c.endswith(b"\n") for c in future.result())
+
+        assert chunks.next() is None
+
+    def test_file_csv_pandas(self):
+        file = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "test_file_data.csv")
+        )
+
+        out = ts.FileSource(
+            filename=file, csv=True, header=True, batch=True, batch_format="pandas"
+        )
+        ret = ts.run(out.print())
+        assert len(ret) == 1
+        assert list(ret[0].columns) == ["index", "A", "B", "C", "D"]
+        assert ret[0]["index"].tolist()[:2] == ["2000-01-03", "2000-01-04"]
+        assert len(ret[0]) == 10
+
+    def test_file_replay(self, tmp_path):
+        file = str(tmp_path / "test.json")
+        with open(file, "w") as fp:
+            for i in range(5):
+                fp.write('{{"time": {}, "i": {}}}\n'.format(1000 + i * 0.2, i))
+
+        # 0.8 seconds of ticks, at twice real time
+        start = time.monotonic()
+        out = ts.FileSource(filename=file, json=True, replay="time", speed=2)
+        assert [x["i"] for x in ts.run(out.print())] == list(range(5))
+        assert 0.35 < time.monotonic() - start < 1.5
+
+        # as fast as possible
+        start = time.monotonic()
+        out = ts.FileSource(filename=file, json=True, replay="time", speed=None)
+        assert [x["i"] for x in ts.run(out.print())] == list(range(5))
+        assert time.monotonic() - start < 0.3
@@ -1,8 +1,20 @@
+import aiohttp
 import asyncio
 import pytest
 import requests
 import time
 import tributary.streaming as ts
+from aiohttp import web
+from tributary.streaming import session
+
+
+async def _serve(handler, port, method="GET"):
+    app = web.Application()
+    app.router.add_route(method, "/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
 
 
 class TestHttp:
@@ -14,6 +26,147 @@ class TestHttp:
         ret = ts.run(out)
         assert len(ret) == 1
 
+    def test_http_keepalive(self):
+        peers = []
+
+        async def handler(request):
+            peers.append(request.transport.get_extra_info("peername"))
+            return web.json_response({"count": len(peers)})
+
+        async def _run():
+            # server only comes up after the first attempts
+            await asyncio.sleep(0.2)
+            return await _serve(handler, 12347)
+
+        async def _main():
+            server = asyncio.create_task(_run())
+            graph = ts.Window(
+                ts.HTTPSource(
+                    url="http://127.0.0.1:12347/",
+                    interval=0,
+                    repeat=3,
+                    json=True,
+                    field="count",
+                    backoff=0.1,
+                    retries=5,
+                )
+            )
+            try:
+                await graph.constructGraph()._run()
+            finally:
+                await (await server).cleanup()
+            return graph
+
+        loop = asyncio.new_event_loop()
+        try:
+            out = loop.run_until_complete(_main())
+        finally:
+            loop.close()
+        assert out._accum == [1, 2, 3]
+
+        # one connection, kept alive
+        assert len(set(peers)) == 1
+
+        # shared session closed with the graph
+        assert session._sessions == {}
+
+    def test_http_retry_idempotent(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.method)
+
+            # drop the connection after the request was sent
+            request.transport.close()
+            return web.Response()
+
+        async def _main():
+            server = await _serve(handler, 12351, "*")
+            s = aiohttp.ClientSession()
+            try:
+                for method in ("GET", "POST"):
+                    with pytest.raises(aiohttp.ServerDisconnectedError):
+                        await session.request(
+                            s, method, "http://127.0.0.1:12351/", retries=2, delay=0
+                        )
+            finally:
+                await s.close()
+                await server.cleanup()
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(_main())
+        finally:
+            loop.close()
+
+        # get retried, post not sent twice
+        assert calls.count("GET") >= 3
+        assert calls.count("POST") == 1
+
+    def test_http_fan_out(self):
+        state = {"in_flight": 0, "max_in_flight": 0}
+
+        async def handler(request):
+            i = request.query["i"]
+            if request.headers.get("If-None-Match") == i:
+                return web.Response(status=304)
+
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            await asyncio.sleep(0.05)
+            state["in_flight"] -= 1
+
+            # only even urls support conditional requests
+            headers = {"ETag": i} if int(i) % 2 == 0 else {}
+            return web.json_response({"i": int(i)}, headers=headers)
+
+        def run(node, port):
+            async def _main():
+                server = await _serve(handler, port)
+                try:
+                    await node.constructGraph()._run()
+                finally:
+                    await server.cleanup()
+
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(_main())
+            finally:
+                loop.close()
+
+        urls = ["http://127.0.0.1:12350/?i={}".format(i) for i in range(10)]
+
+        source = ts.HTTPFanOutSource(
+            urls, interval=0, repeat=2, json=True, field="i", concurrency=3
+        )
+        out = ts.Window(source)
+        run(out, 12350)
+
+        # as they arrive, unchanged skipped on second round
+        assert all(len(x) == 1 for x in out._accum)
+        assert sorted(x[url] for x in out._accum for url in x) == sorted(
+            list(range(10)) + list(range(1, 10, 2))
+        )
+        assert source.stats == {
+            "requests": 20,
+            "results": 15,
+            "unchanged": 5,
+            "failed": 0,
+        }
+        assert state["max_in_flight"] == 3
+
+        # urls of each round from a function, results of a round at once
+        source = ts.HTTPFanOutSource(
+            lambda: urls[:4], interval=0, repeat=3, json=True, field="i", batch=True
+        )
+        out = ts.Window(source)
+        run(out, 12350)
+        assert out._accum == [
+            dict(zip(urls[:4], range(4))),
+            {urls[1]: 1, urls[3]: 3},
+            {urls[1]: 1, urls[3]: 3},
+        ]
+
     @pytest.mark.skipif('os.name == "nt" or os.environ.get("CI")')
     def test_http_server(self):
         ss = ts.HTTPServerSource(json=True, host="127.0.0.1", port=12345)
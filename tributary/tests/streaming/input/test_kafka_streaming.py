@@ -0,0 +1,122 @@
+import aiokafka
+import asyncio
+import tributary.streaming as ts
+import time
+from aiokafka.structs import TopicPartition
+
+
+class Message:
+    def __init__(self, offset, value):
+        self.offset = offset
+        self.value = value
+
+
+class MockConsumer:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.commits = []
+
+    async def getmany(self, timeout_ms=0, max_records=None):
+        if self.batches:
+            return self.batches.pop(0)
+        await asyncio.sleep(timeout_ms / 1000)
+        return {}
+
+    async def commit(self, offsets):
+        self.commits.append(offsets)
+
+
+class MockStreamConsumer:
+    def __init__(self, *topics, **kwargs):
+        self.messages = [Message(0, b'{"a": 1}'), Message(1, b'{"a": 2}')]
+        self.stops = 0
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        self.stops += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+
+def run(node, seconds=0.5):
+    graph = node.constructGraph()
+
+    async def _run():
+        asyncio.get_event_loop().call_later(seconds, graph.stop)
+        return await graph._run()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_run())
+    finally:
+        loop.close()
+
+
+P0 = TopicPartition("test", 0)
+P1 = TopicPartition("test", 1)
+
+
+def batches():
+    return [
+        {
+            P0: [Message(0, b'{"a": 1}'), Message(1, b'{"a": 2}')],
+            P1: [Message(0, b'{"a": 3}')],
+        },
+        {P1: [Message(1, b'{"a": 4}')]},
+    ]
+
+
+class TestKafka:
+    def setup(self):
+        time.sleep(0.5)
+
+    def test_kafka_batch(self):
+        consumer = MockConsumer(batches())
+        source = ts.KafkaSource(
+            servers="",
+            group="",
+            topics="test",
+            json=True,
+            batch=True,
+            commit=True,
+            timeout_ms=10,
+            consumer=consumer,
+        )
+
+        p0, p1 = [], []
+        out0 = source.partition(0).apply(lambda msgs: p0.append(msgs) or msgs)
+        source.partition(1).apply(lambda msgs: p1.append(msgs) or msgs)
+        # whole graph runs, including the other branch
+        run(out0)
+
+        assert [[m.value for m in msgs] for msgs in p0] == [[{"a": 1}, {"a": 2}]]
+        assert [[m.value for m in msgs] for msgs in p1] == [[{"a": 3}], [{"a": 4}]]
+
+        # committed after each batch was processed
+        assert consumer.commits == [{P0: 2, P1: 1}, {P1: 2}]
+
+    def test_kafka_stop_once(self, monkeypatch):
+        consumers = []
+
+        def _consumer(*topics, **kwargs):
+            consumers.append(MockStreamConsumer(*topics, **kwargs))
+            return consumers[-1]
+
+        monkeypatch.setattr(aiokafka, "AIOKafkaConsumer", _consumer)
+
+        values = []
+        source = ts.KafkaSource(servers="", group="", topics="test", json=True)
+        run(source.apply(lambda msg: values.append(msg.value) or msg))
+
+        assert values == [{"a": 1}, {"a": 2}]
+
+        # stopped when the stream ended, not again when the graph stopped
+        assert consumers[0].stops == 1
@@ -1,6 +1,89 @@
+import asyncpg
 import tributary.streaming as ts
 import pytest
 import time
+from contextlib import asynccontextmanager
+
+
+class FakeRecord(dict):
+    """stand-in for asyncpg.Record, indexable by column name or position"""
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self.values())[key]
+        return super().__getitem__(key)
+
+
+ROWS = [FakeRecord(id=i, value=i * 10) for i in range(5)]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, n):
+        ret, self.rows = self.rows[:n], self.rows[n:]
+        return ret
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.pending = []
+        self.closed = False
+
+    def _rows(self, query, args):
+        self.queries.append((query, args))
+        if args:
+            op = ">=" if ">=" in query else ">"
+            rows = [
+                row
+                for row in self.rows
+                if (row["id"] >= args[0] if op == ">=" else row["id"] > args[0])
+            ]
+        else:
+            rows = list(self.rows)
+
+        # rows arriving after this query
+        self.rows, self.pending = self.rows + self.pending, []
+        return rows
+
+    async def fetch(self, query, *args):
+        return self._rows(query, args)
+
+    async def cursor(self, query, *args):
+        return FakeCursor(self._rows(query, args))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    conn = FakeConnection(ROWS)
+
+    async def connect(**kwargs):
+        return conn
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    return conn
+
+
+def source(**kwargs):
+    return ts.PostgresSource(
+        queries=["SELECT * FROM test"],
+        user="postgres",
+        database="postgres",
+        password="test",
+        host="localhost:5432",
+        interval=0,
+        **kwargs
+    )
 
 
 class TestPostgres:
@@ -18,3 +101,45 @@ class TestPostgres:
             host="localhost:5432",
         )
         assert len(ts.run(out)) != 0
+
+    def test_pg_records(self, conn):
+        assert ts.run(source()) == [[[("id", i), ("value", i * 10)] for i in range(5)]]
+
+    def test_pg_chunks(self, conn):
+        out = ts.run(source(chunk_size=2, batch_format="numpy"))
+        assert [chunk["id"].tolist() for chunk in out] == [[0, 1], [2, 3], [4]]
+        assert out[0]["value"].tolist() == [0, 10]
+
+    def test_pg_watermark(self, conn):
+        conn.rows = ROWS[:3]
+
+        out = ts.run(source(watermark="id", repeat=2, chunk_size=10))
+        assert len(out) == 1
+        assert [row[0][1] for row in out[0]] == [0, 1, 2]
+        assert conn.queries[0] == (
+            'SELECT * FROM (SELECT * FROM test) AS q ORDER BY "id"',
+            (),
+        )
+
+        # nothing new, second execution only fetches past the watermark
+        assert conn.queries[1] == (
+            'SELECT * FROM (SELECT * FROM test) AS q WHERE "id" >= $1 ORDER BY "id"',
+            (2,),
+        )
+
+    def test_pg_watermark_start(self, conn):
+        out = ts.run(source(watermark="id", watermark_start=2))
+        assert [[row[0][1] for row in tick] for tick in out] == [[3, 4]]
+        assert conn.queries[0][0].endswith('WHERE "id" > $1 ORDER BY "id"')
+
+    def test_pg_watermark_ties(self, conn):
+        conn.rows = [FakeRecord(id=0, value=0), FakeRecord(id=1, value=10)]
+
+        # row sharing the last watermark arrives after the first read
+        conn.pending = [FakeRecord(id=1, value=11)]
+
+        out = ts.run(source(watermark="id", repeat=2))
+        assert [[row[1][1] for row in tick] for tick in out] == [[0, 10], [11]]
+
+        # connection closed once done
+        assert conn.closed
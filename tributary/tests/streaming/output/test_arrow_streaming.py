@@ -0,0 +1,62 @@
+import pytest
+import time
+import tributary.streaming as ts
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def foo():
+    for i in range(5):
+        yield {"i": i, "x": i * 1.5}
+    # rows at once, and already columnar
+    yield [{"i": 5, "x": 7.5}, {"i": 6, "x": 9.0}]
+    yield pa.RecordBatch.from_pylist([{"i": 7, "x": 10.5}])
+
+
+class TestArrow:
+    def setup(self):
+        time.sleep(0.5)
+
+    def test_parquet(self, tmp_path):
+        file = str(tmp_path / "test.parquet")
+        out = ts.ParquetSink(ts.Foo(foo), filename=file, batch_size=2)
+        ts.run(out)
+
+        table = pq.read_table(file)
+        assert table.column("i").to_pylist() == list(range(8))
+        assert table.column("x").to_pylist() == [i * 1.5 for i in range(8)]
+
+        # bounded batches, each its own row group
+        assert pq.ParquetFile(file).num_row_groups == out.stats["batches"] == 4
+        assert out.stats["rows"] == 8
+
+    def test_arrow(self, tmp_path):
+        for stream in (False, True):
+            file = str(tmp_path / "test{}.arrow".format(stream))
+            out = ts.ArrowSink(ts.Foo(foo), filename=file, batch_size=2, stream=stream)
+            ts.run(out)
+
+            with pa.memory_map(file) as source:
+                if stream:
+                    table = pa.ipc.open_stream(source).read_all()
+                else:
+                    table = pa.ipc.open_file(source).read_all()
+            assert table.column("i").to_pylist() == list(range(8))
+
+    def test_parquet_small_frames(self, tmp_path):
+        pd = pytest.importorskip("pandas")
+
+        def frames():
+            for i in range(10):
+                yield pd.DataFrame({"i": [i], "x": [i * 1.5]})
+
+        file = str(tmp_path / "frames.parquet")
+        out = ts.ParquetSink(ts.Foo(frames), filename=file, batch_size=4)
+        ts.run(out)
+
+        table = pq.read_table(file)
+        assert table.column("i").to_pylist() == list(range(10))
+
+        # columnar ticks are buffered with rows, not written one row group each
+        assert pq.ParquetFile(file).num_row_groups == out.stats["batches"] == 3
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from tributary.base import TributaryException
+from tributary.streaming.output.broadcast import Broadcast
+
+
+def _drain(subscriber):
+    ret = list(subscriber._queue)
+    subscriber._queue.clear()
+    return ret
+
+
+class TestBroadcast:
+    def test_snapshot(self):
+        broadcast = Broadcast(history=2)
+        for i in range(5):
+            broadcast.publish(i)
+
+        # last ticks only
+        assert _drain(broadcast.subscribe()) == [3, 4]
+
+    def test_policies(self):
+        ret = {}
+        for policy in ("drop", "conflate", "disconnect"):
+            broadcast = Broadcast(history=0, max_queue=3, policy=policy)
+            fast, slow = broadcast.subscribe(), broadcast.subscribe()
+            for i in range(5):
+                broadcast.publish(i)
+                _drain(fast)
+            ret[policy] = (_drain(slow) if not slow.closed else None, broadcast.stats)
+
+        assert ret["drop"] == (
+            [2, 3, 4],
+            {"published": 5, "dropped": 2, "disconnected": 0},
+        )
+        assert ret["conflate"] == (
+            [3, 4],
+            {"published": 5, "dropped": 3, "disconnected": 0},
+        )
+        assert ret["disconnect"] == (
+            None,
+            {"published": 5, "dropped": 0, "disconnected": 1},
+        )
+
+    def test_close(self):
+        broadcast = Broadcast()
+        subscriber = broadcast.subscribe()
+        broadcast.publish(1)
+        broadcast.close()
+
+        async def _get():
+            return [await subscriber.get(), await subscriber.get()]
+
+        # queued ticks, then done
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(_get()) == [1, None]
+        finally:
+            loop.close()
+        assert broadcast.subscribers == []
+
+    def test_bad_policy(self):
+        with pytest.raises(TributaryException):
+            Broadcast(policy="test")
@@ -1,3 +1,5 @@
+import gzip
+import json as JSON
 import os
 import time
 import tributary.streaming as ts
@@ -28,3 +30,52 @@ class TestFile:
         # Test that output is equal to what is read (generalized)
         out = ts.FileSink(ts.Foo(foo), filename=file, json=True)
         assert ts.run(out) == read_file(file)
+
+    def test_file_csv_rotate_gzip(self, tmp_path):
+        file = str(tmp_path / "test.csv.gz")
+
+        def foo():
+            for i in range(6):
+                yield [i, "a,b"]
+
+        # one flush per tick, rotated after each
+        out = ts.FileSink(
+            ts.Foo(foo),
+            filename=file,
+            csv=True,
+            buffer_size=1,
+            rotate_size=1,
+            compression="gzip",
+        )
+        ts.run(out)
+
+        files = sorted(os.listdir(str(tmp_path)))
+        assert files == ["test.csv.{}.gz".format(i) for i in range(1, 7)] + [
+            "test.csv.gz"
+        ]
+
+        lines = []
+        for i in range(1, 7):
+            with gzip.open(str(tmp_path / "test.csv.{}.gz".format(i)), "rt") as fp:
+                lines.append(fp.read())
+        assert lines == ['{},"a,b"\n'.format(i) for i in range(6)]
+
+        # current file is empty
+        with gzip.open(file, "rt") as fp:
+            assert fp.read() == ""
+
+    def test_file_buffered(self, tmp_path):
+        file = str(tmp_path / "test.json")
+
+        def foo():
+            for i in range(100):
+                yield {"i": i}
+
+        # written at once when the stream ends
+        out = ts.FileSink(
+            ts.Foo(foo), filename=file, json=True, separator="\n", flush_interval=None
+        )
+        ts.run(out)
+
+        with open(file) as fp:
+            assert [JSON.loads(line) for line in fp] == [{"i": i} for i in range(100)]
@@ -1,8 +1,38 @@
+import asyncio
 import tributary.streaming as ts
 import pytest
 import time
 
 
+class MockProducer:
+    def __init__(self, fail=()):
+        self.sent = []
+        self.fail = fail
+        self.flushed = False
+        self.futures = []
+
+    async def send(self, topic, value, key=None, partition=None):
+        self.sent.append((topic, value, key, partition))
+        future = asyncio.get_event_loop().create_future()
+        if value in self.fail:
+            future.set_exception(Exception("delivery failed"))
+        else:
+            future.set_result(None)
+        return future
+
+    async def send_and_wait(self, topic, value, key=None, partition=None):
+        return await (await self.send(topic, value, key, partition))
+
+    async def flush(self):
+        self.flushed = True
+
+
+def foo():
+    yield "a"
+    yield "b"
+    yield "c"
+
+
 class TestKafka:
     def setup(self):
         time.sleep(0.5)
@@ -18,3 +48,55 @@ class TestKafka:
 
         out = ts.KafkaSink(ts.Foo(foo), servers="localhost:9092", topic="tributary")
         assert ts.run(out) == ["a", "b", "c"]
+
+    def test_kafka_wait(self):
+        producer = MockProducer()
+        out = ts.KafkaSink(ts.Foo(foo), topic="tributary", producer=producer)
+        assert ts.run(out) == ["a", "b", "c"]
+        assert [value for _, value, _, _ in producer.sent] == [b"a", b"b", b"c"]
+        assert out.stats == {"sent": 3, "delivered": 3, "failed": 0}
+
+    def test_kafka_pipelined(self):
+        producer = MockProducer(fail=(b"b",))
+        out = ts.KafkaSink(
+            ts.Foo(foo),
+            topic="tributary",
+            key=lambda data: data.upper(),
+            partition=lambda data: ord(data) % 2,
+            wait=False,
+            max_in_flight=2,
+            producer=producer,
+        )
+        assert ts.run(out) == ["a", "b", "c"]
+
+        assert producer.sent == [
+            ("tributary", b"a", b"A", 1),
+            ("tributary", b"b", b"B", 0),
+            ("tributary", b"c", b"C", 1),
+        ]
+        assert producer.flushed
+
+        # failures are counted, not raised
+        assert out.stats == {"sent": 3, "delivered": 2, "failed": 1}
+
+    def test_kafka_json_key(self):
+        def records():
+            yield {"id": "x", "value": 1}
+            yield {"id": "y", "value": 2}
+
+        producer = MockProducer()
+        out = ts.KafkaSink(
+            ts.Foo(records),
+            topic="tributary",
+            json=True,
+            key=lambda data: data["id"],
+            partition=lambda data: data["value"] % 2,
+            producer=producer,
+        )
+        ts.run(out)
+
+        # key and partition from the tick, not its json
+        assert producer.sent == [
+            ("tributary", b'{"id": "x", "value": 1}', b"x", 1),
+            ("tributary", b'{"id": "y", "value": 2}', b"y", 0),
+        ]
@@ -3,6 +3,62 @@ import pytest
 import time
 
 
+class FakeConnection:
+    def __init__(self, calls, failures=None):
+        self.calls = calls
+        self.failures = failures
+
+    def transaction(self):
+        calls = self.calls
+
+        class _Transaction:
+            async def __aenter__(self):
+                calls.append(("begin",))
+
+            async def __aexit__(self, *args):
+                calls.append(("commit",))
+
+        return _Transaction()
+
+    async def execute(self, query):
+        self.calls.append(("execute", query))
+
+    async def executemany(self, query, records):
+        if self.failures:
+            self.failures.pop()
+            raise ConnectionError("down")
+        self.calls.append(("executemany", query, records))
+
+    async def copy_records_to_table(self, table, records, columns=None):
+        self.calls.append(("copy", table, records, columns))
+
+
+class FakePool:
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = [None] * failures
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return FakeConnection(pool.calls, pool.failures)
+
+            async def __aexit__(self, *args):
+                pass
+
+        return _Acquire()
+
+
+def foo():
+    yield 1
+    yield 2
+    yield 3
+    yield 4
+    yield 5
+
+
 class TestPostgres:
     def setup(self):
         time.sleep(0.5)
@@ -26,3 +82,127 @@ class TestPostgres:
             host="localhost:5432",
         )
         assert len(ts.run(out)) == 3
+
+    def test_pg_batched_queries(self):
+        def parser(data):
+            return ["INSERT INTO test(col1) VALUES ({});".format(data)]
+
+        pool = FakePool()
+        out = ts.PostgresSink(
+            ts.Foo(foo),
+            query_parser=parser,
+            user="postgres",
+            database="postgres",
+            password="test",
+            host="localhost:5432",
+            batch_size=2,
+            batch_interval=None,
+            pool=pool,
+        )
+        assert ts.run(out) == [1, 2, 3, 4, 5]
+
+        # batches of 2, then the rest on stop, each in a transaction
+        assert [call[0] for call in pool.calls] == (
+            ["begin", "execute", "execute", "commit"] * 2
+            + ["begin", "execute", "commit"]
+        )
+        assert pool.calls[1][1] == "INSERT INTO test(col1) VALUES (1);"
+        assert pool.calls[-2][1] == "INSERT INTO test(col1) VALUES (5);"
+
+        assert out.stats["flushes"] == 3
+        assert out.stats["records"] == 5
+        assert out.stats["last_batch_size"] == 1
+        assert out.stats["max_latency"] >= out.stats["last_latency"] >= 0
+
+    def test_pg_executemany(self):
+        pool = FakePool()
+        out = ts.PostgresSink(
+            ts.Foo(foo),
+            query="INSERT INTO test(col1) VALUES ($1)",
+            user="postgres",
+            database="postgres",
+            password="test",
+            host="localhost:5432",
+            batch_size=10,
+            pool=pool,
+        )
+        assert ts.run(out) == [1, 2, 3, 4, 5]
+
+        records = [record for call in pool.calls for record in call[2]]
+        assert records == [(1,), (2,), (3,), (4,), (5,)]
+        assert all(call[0] == "executemany" for call in pool.calls)
+
+    def test_pg_failed_flush(self):
+        pool = FakePool(failures=1)
+        out = ts.PostgresSink(
+            ts.Foo(foo),
+            query="INSERT INTO test(col1) VALUES ($1)",
+            user="postgres",
+            database="postgres",
+            password="test",
+            host="localhost:5432",
+            batch_size=2,
+            batch_interval=None,
+            pool=pool,
+        )
+
+        with pytest.raises(ConnectionError):
+            ts.run(out)
+
+        # failed batch still buffered, written on stop
+        records = [record for call in pool.calls for record in call[2]]
+        assert records == [(1,), (2,)]
+        assert out.stats["failed"] == 1
+        assert out.stats["records"] == 2
+
+    def test_pg_dropped_batch(self):
+        dropped = []
+        pool = FakePool(failures=10)
+        out = ts.PostgresSink(
+            ts.Foo(foo),
+            query="INSERT INTO test(col1) VALUES ($1)",
+            user="postgres",
+            database="postgres",
+            password="test",
+            host="localhost:5432",
+            batch_size=2,
+            batch_interval=None,
+            pool=pool,
+            max_retries=1,
+            dead_letter=lambda batch, error: dropped.append(batch),
+        )
+
+        with pytest.raises(ConnectionError):
+            ts.run(out)
+
+        # failed on the tick and again on stop, then given up on
+        assert pool.calls == []
+        assert dropped == [[(1,), (2,)]]
+        assert out.stats["failed"] == 2
+        assert out.stats["dropped"] == 2
+
+    def test_pg_copy(self):
+        pool = FakePool()
+        out = ts.PostgresSink(
+            ts.Foo(foo),
+            table="test",
+            columns=["col1", "col2"],
+            record_parser=lambda data: [(data, data * 2)],
+            user="postgres",
+            database="postgres",
+            password="test",
+            host="localhost:5432",
+            batch_size=5,
+            batch_interval=None,
+            pool=pool,
+        )
+        ts.run(out)
+
+        assert pool.calls == [
+            (
+                "copy",
+                "test",
+                [(1, 2), (2, 4), (3, 6), (4, 8), (5, 10)],
+                ["col1", "col2"],
+            )
+        ]
@@ -0,0 +1,59 @@
+import aiohttp
+import asyncio
+import pytest
+import time
+import tributary.streaming as ts
+from tributary.streaming.output.sse import _write
+
+
+class TestSSE:
+    def setup(self):
+        time.sleep(0.5)
+
+    def test_sse_broadcast(self):
+        async def foo():
+            # let clients connect
+            await asyncio.sleep(0.5)
+            yield {"a": 1}
+            yield "multi\nline"
+
+        async def client():
+            await asyncio.sleep(0.2)
+            async with aiohttp.ClientSession() as session:
+                async with session.get("http://127.0.0.1:12353/") as resp:
+                    return await resp.read()
+
+        out = ts.SSESink(ts.Foo(foo), port=12353)
+
+        async def _main():
+            clients = [asyncio.create_task(client()) for _ in range(3)]
+            await out.constructGraph()._run()
+            return await asyncio.gather(*clients)
+
+        loop = asyncio.new_event_loop()
+        try:
+            ret = loop.run_until_complete(_main())
+        finally:
+            loop.close()
+        assert ret == [b'data: {"a": 1}\r\n\r\ndata: "multi\\nline"\r\n\r\n'] * 3
+
+    def test_sse_slow_client(self):
+        class SlowResponse:
+            stopped = False
+
+            async def write(self, data):
+                await asyncio.sleep(1)
+
+            def stop_streaming(self):
+                self.stopped = True
+
+        resp = SlowResponse()
+        loop = asyncio.new_event_loop()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                loop.run_until_complete(_write(resp, b"data: 1\r\n\r\n", 0.05))
+        finally:
+            loop.close()
+
+        # stopped, as aiohttp_sse does for gone clients
+        assert resp.stopped
@@ -1,6 +1,29 @@
+import aiohttp
+import asyncio
 import tributary.streaming as ts
 import pytest
 import time
+from aiohttp import web
+from tributary.streaming import session
+
+
+def _run(node, handler, port):
+    async def _main():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        try:
+            return await node.constructGraph()._run()
+        finally:
+            await runner.cleanup()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_main())
+    finally:
+        loop.close()
 
 
 class TestWebSocket:
@@ -19,6 +42,59 @@ class TestWebSocket:
         out = ts.WebSocketSink(ts.Foo(foo), url="ws://localhost:8080", response=True)
         assert len(ts.run(out)) == 3
 
+    def test_websocket_persistent(self):
+        connections, received = [], []
+
+        async def handler(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            connections.append(ws)
+            async for msg in ws:
+                received.append(msg.data)
+                await ws.send_str(msg.data.upper())
+            return ws
+
+        def foo():
+            yield "x"
+            yield "y"
+            yield "z"
+
+        # pipelined, without waiting on the socket
+        out = ts.WebSocketSink(ts.Foo(foo), url="ws://127.0.0.1:12348/")
+        _run(out, handler, 12348)
+        assert received == ["x", "y", "z"]
+        assert len(connections) == 1
+        assert session._sessions == {}
+
+        connections.clear()
+        received.clear()
+
+        out = ts.Window(
+            ts.WebSocketSink(ts.Foo(foo), url="ws://127.0.0.1:12349/", response=True)
+        )
+        _run(out, handler, 12349)
+        assert received == ["x", "y", "z"]
+        assert out._accum == ["X", "Y", "Z"]
+        assert len(connections) == 1
+
+    def test_websocket_error_on_stop(self):
+        async def handler(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            async for _ in ws:
+                pass
+            return ws
+
+        def foo():
+            yield "x"
+            # can't be sent as text, and no tick follows to raise it on
+            yield 1
+
+        out = ts.WebSocketSink(ts.Foo(foo), url="ws://127.0.0.1:12354/")
+        with pytest.raises(TypeError):
+            _run(out, handler, 12354)
+        assert session._sessions == {}
+
     def test_websocket_server(self):
         """Test websocket server"""
 
@@ -29,3 +105,31 @@ class TestWebSocket:
 
         out = ts.WebSocketServerSink(ts.Foo(foo), port=1234)
         assert len(ts.run(out)) == 3
+
+    def test_websocket_server_broadcast(self):
+        async def foo():
+            # let clients connect
+            await asyncio.sleep(0.5)
+            for x in ("x", "y", "z"):
+                yield x
+
+        async def client():
+            await asyncio.sleep(0.2)
+            async with aiohttp.ClientSession() as session:
+                async with session.ws_connect("ws://127.0.0.1:12352/") as ws:
+                    return [msg.data async for msg in ws]
+
+        out = ts.WebSocketServerSink(ts.Foo(foo), port=12352)
+
+        async def _main():
+            clients = [asyncio.create_task(client()) for _ in range(3)]
+            await out.constructGraph()._run()
+            return await asyncio.gather(*clients)
+
+        loop = asyncio.new_event_loop()
+        try:
+            ret = loop.run_until_complete(_main())
+        finally:
+            loop.close()
+        assert ret == [['"x"', '"y"', '"z"']] * 3
+        assert out.stats == {"published": 3, "dropped": 0, "disconnected": 0}
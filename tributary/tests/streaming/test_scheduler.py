@@ -0,0 +1,95 @@
+import os
+import pytest
+import signal
+import sys
+import tempfile
+import time
+import tributary.streaming as ts
+from tributary.base import TributaryException
+
+
+class TestScheduler:
+    def test_checkpoint(self):
+        def foo():
+            n.set("count", n.count + 1 if n.has("count") else 1)
+            return n.count
+
+        n = ts.Foo(foo, count=3)
+        g = ts.StreamingGraph(n)
+        g.run()
+
+        checkpoint = g.checkpoint()
+        assert checkpoint[n._id]["execution_count"] == n._execution_count
+
+        n2 = ts.Foo(foo, count=3)
+        n2._id = n._id
+        g2 = ts.StreamingGraph(n2)
+        g2.restoreCheckpoint(checkpoint)
+        assert n2.count == 3
+        assert n2._execution_count == n._execution_count
+
+    def test_standby_requires_dill(self, monkeypatch):
+        # as if dill were not installed
+        monkeypatch.setitem(sys.modules, "dill", None)
+
+        with pytest.raises(TributaryException):
+            ts.Scheduler(ts.StreamingGraph(ts.Const(1)), standby=True)
+
+    def test_standby(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        def foo():
+            n.set("count", n.count + 1 if n.has("count") else 1)
+            with open(path, "a") as fp:
+                fp.write("{} {}\n".format(os.getpid(), n.count))
+            return n.count
+
+        n = ts.Foo(foo, interval=0.05)
+        s = ts.Scheduler(ts.StreamingGraph(n), standby=True, checkpoint_interval=0.1)
+        s.start()
+
+        try:
+            time.sleep(1)
+            pid = s._process.pid
+            os.kill(pid, signal.SIGKILL)
+            time.sleep(1)
+            assert s._process.pid != pid
+        finally:
+            s.stop(kill_immediately=True)
+
+        with open(path) as fp:
+            lines = [line.split() for line in fp]
+        os.remove(path)
+
+        before = [int(count) for p, count in lines if int(p) == pid]
+        after = [int(count) for p, count in lines if int(p) != pid]
+
+        # standby resumed from a checkpoint, rather than from scratch
+        assert before and after
+        assert after[0] > 1
+
+    def test_output_and_metrics(self):
+        def foo():
+            print("out")
+            print("err", file=sys.stderr)
+            return 1
+
+        n = ts.Foo(foo, interval=0.05)
+        s = ts.Scheduler(ts.StreamingGraph(n), metrics_interval=0.2)
+        s.start()
+
+        try:
+            time.sleep(1)
+            stdout, stderr = s.output()
+            metrics = s.metrics()
+        finally:
+            s.stop(kill_immediately=True)
+
+        assert "out\n" in stdout
+        assert "err\n" in stderr
+        assert "out" not in stderr
+
+        assert metrics[n._name]["executions"] > 0
+        assert metrics[n._name]["throughput"] > 0
+        assert metrics[n._name]["queued"] == 0
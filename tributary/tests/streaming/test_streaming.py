@@ -1,6 +1,8 @@
 import asyncio
+import pytest
 import time
 import tributary.streaming as ts
+from tributary.base import TributaryException
 
 
 class TestStreaming:
@@ -91,3 +93,107 @@ class TestStreaming:
         for x in (a, b, c, d, e, f, g, h, i):
             for y in (a, b, c, d, e, f, g, h, i):
                 assert _ids_ids(x._deep_bfs()) == _ids_ids(y._deep_bfs())
+
+    def test_node_state(self):
+        def foo():
+            n.set("_count", n._count + 1 if n.has("_count") else 1)
+            n._total += n._count
+            return n._total
+
+        n = ts.Foo(foo, count=3)
+        n.set("_total", 0)
+        assert ts.run(n) == [1, 3, 6]
+        assert n._count == 3
+
+        # state is kept apart from node attributes
+        assert "_total" in n._state
+        assert not hasattr(n, "__dict__") or "_total" not in n.__dict__
+
+        # node-critical attributes and methods can't be overloaded
+        for key in ("_foo", "_last", "_name", "value"):
+            with pytest.raises(TributaryException):
+                n.set(key, None)
+
+        with pytest.raises(TributaryException):
+            n._unknown = 1
+
+        n._drop = False
+        assert n._drop is False
+
+        with pytest.raises(AttributeError):
+            n._unknown
+
+    def test_onstarts(self):
+        events = []
+
+        def foo():
+            events.append("tick")
+            return 1
+
+        async def start_b():
+            await asyncio.sleep(0.2)
+            events.append("start b")
+
+        async def start_c():
+            await asyncio.sleep(0.4)
+            events.append("start c")
+
+        async def stop_b():
+            events.append("stop b")
+
+        a = ts.Foo(foo, count=2)
+        b = ts.Const(1, count=2)
+        c = ts.Const(1, count=2)
+        b._onstarts = (start_b,)
+        b._onstops = (stop_b,)
+        c._onstarts = (start_c,)
+
+        assert ts.run(a + b + c) == [3, 3]
+
+        # nodes without onstarts don't wait for others to start
+        assert events[0] == "tick"
+        assert events.index("start b") < events.index("start c")
+        assert events[-1] == "stop b"
+
+    def test_onstarts_failed(self):
+        events = []
+
+        async def start_a():
+            await asyncio.sleep(0.2)
+            events.append("start a")
+
+        async def stop_a():
+            events.append("stop a")
+
+        async def start_b():
+            raise Exception("failed to start")
+
+        async def stop_b():
+            events.append("stop b")
+
+        a = ts.Const(1, count=2)
+        b = ts.Const(1, count=2)
+        a._onstarts = (start_a,)
+        a._onstops = (stop_a,)
+        b._onstarts = (start_b,)
+        b._onstops = (stop_b,)
+
+        with pytest.raises(Exception):
+            ts.run(a + b)
+
+        # node partway through starting is still stopped, failed one isn't
+        assert events == ["start a", "stop a"]
+
+    def test_onstarts_timeout(self):
+        async def start():
+            await asyncio.sleep(1)
+
+        async def stop():
+            raise Exception("not started, shouldn't be stopped")
+
+        a = ts.Const(1, count=1)
+        a._onstarts = (start,)
+        a._onstops = (stop,)
+
+        with pytest.raises(TributaryException):
+            ts.run(a, start_timeout=0.1)
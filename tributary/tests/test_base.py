@@ -7,3 +7,11 @@ class TestBase:
         from tributary.base import StreamNone
 
         assert not StreamNone()
+
+    def test_singletons(self):
+        from tributary.base import StreamEnd, StreamNone, StreamRepeat
+        from tributary.base import _STREAM_END, _STREAM_NONE, _STREAM_REPEAT
+
+        assert StreamNone() is StreamNone() is _STREAM_NONE
+        assert StreamEnd() is StreamEnd() is _STREAM_END
+        assert StreamRepeat() is StreamRepeat() is _STREAM_REPEAT
@@ -0,0 +1,73 @@
+import functools
+import gc
+import inspect
+from tributary.utils import _PARAMETERS, _ismethod, _signature
+
+
+def foo(a, b=1, *c, d, e=2, **f):
+    ...
+
+
+def bar(a, b: int = 1):
+    ...
+
+
+class Test:
+    def meth(self, a, b=1):
+        ...
+
+
+def _expected(callable):
+    parameters = inspect.signature(callable).parameters.values()
+    return [
+        (p.name, p.default)
+        for p in parameters
+        if p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+    ]
+
+
+class TestSignature:
+    def test_matches_inspect(self):
+        t = Test()
+        for callable in (foo, bar, Test.meth, t.meth, lambda x, y=2: None):
+            assert _signature(callable)[0] == _expected(callable)
+
+        assert _signature(foo)[1]
+        assert not _signature(bar)[1]
+
+    def test_shared_code(self):
+        # same code object, different defaults
+        makers = [(lambda i: lambda x=i: x)(i) for i in range(3)]
+        assert [_signature(m)[0] for m in makers] == [[("x", i)] for i in range(3)]
+
+    def test_dynamic_code(self):
+        gc.collect()
+        size = len(_PARAMETERS)
+
+        for i in range(10):
+            # a new code object each time
+            namespace = {}
+            exec("def dynamic(x={}): return x".format(i), namespace)
+            assert _signature(namespace["dynamic"])[0] == [("x", i)]
+
+        # released along with the functions
+        del namespace
+        gc.collect()
+        assert len(_PARAMETERS) == size
+
+    def test_wrapped(self):
+        @functools.wraps(bar)
+        def wrapper(*args, **kwargs):
+            return bar(*args, **kwargs)
+
+        assert _signature(wrapper)[0] == _expected(bar)
+
+    def test_ismethod(self):
+        assert _ismethod(Test().meth)
+        assert _ismethod(Test.meth)
+        assert not _ismethod(foo)
+
+        # annotated functions aren't supported by getargspec
+        assert not _ismethod(bar)
+        assert not _ismethod(len)
+        assert not _ismethod(None)
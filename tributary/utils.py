@@ -1,12 +1,23 @@
+import datetime
+import decimal
+import fractions
 import functools
+import hashlib
 import inspect
+import json as JSON
+import weakref
 
 import numpy as np
 import pandas as pd
 
 from collections import namedtuple
 
-from .base import StreamEnd
+from .base import StreamEnd, TributaryException
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def _either_type(f):
@@ -41,35 +52,346 @@ def LazyToStreaming(lazy_node):
     return Foo(foo=lambda node=lazy_node: node())
 
 
-def _compare(new_value, old_value):
+# number of elements to compare at a time when checking arrays for changes
+_COMPARE_CHUNK_SIZE = 4096
+
+
+def _array_changed(new_value, old_value, tolerance):
+    """return true if numpy arrays differ in shape or in any element, comparing
+    in chunks along the first axis so that we exit on the first differing chunk
+    and only allocate temporaries of the chunk size"""
+    if new_value.shape != old_value.shape:
+        return True
+
+    numeric = new_value.dtype.kind in "iufc" and old_value.dtype.kind in "iufc"
+
+    if new_value.ndim == 0:
+        if numeric:
+            return bool(abs(new_value - old_value) > tolerance)
+        return bool(new_value != old_value)
+
+    # number of rows per chunk
+    rows = max(1, _COMPARE_CHUNK_SIZE // max(1, new_value[0].size))
+
+    for i in range(0, new_value.shape[0], rows):
+        new_chunk, old_chunk = new_value[i : i + rows], old_value[i : i + rows]
+
+        if numeric:
+            if (np.abs(new_chunk - old_chunk) > tolerance).any():
+                return True
+        elif (new_chunk != old_chunk).any():
+            return True
+    return False
+
+
+def _series_changed(new_value, old_value, tolerance):
+    """return true if pandas series differ in index or in any element"""
+    if not new_value.index.equals(old_value.index):
+        return True
+
+    if new_value.dtype.kind in "iufc" and old_value.dtype.kind in "iufc":
+        return _array_changed(new_value.to_numpy(), old_value.to_numpy(), tolerance)
+    return not new_value.equals(old_value)
+
+
+def _frame_changed(new_value, old_value, tolerance):
+    """return true if pandas dataframes differ in shape, labels, or in any element"""
+    if (
+        new_value.shape != old_value.shape
+        or not new_value.columns.equals(old_value.columns)
+        or not new_value.index.equals(old_value.index)
+    ):
+        return True
+
+    # compare column by column, exiting on first differing column
+    for i in range(new_value.shape[1]):
+        if _series_changed(new_value.iloc[:, i], old_value.iloc[:, i], tolerance):
+            return True
+    return False
+
+
+def _compare(new_value, old_value, tolerance=0.00001):
     """return true if value is new, otherwise false"""
+    if new_value is old_value:
+        # same object
+        return False
+
     if isinstance(new_value, (int, float)) and type(new_value) == type(old_value):
         # if numeric, compare within a threshold
-        # TODO
-        return abs(new_value - old_value) > 0.00001
+        return abs(new_value - old_value) > tolerance
 
     elif type(new_value) != type(old_value):
         return True
 
-    elif isinstance(new_value, (pd.DataFrame, pd.Series, np.ndarray)) or isinstance(
-        old_value, (pd.DataFrame, pd.Series, np.ndarray)
-    ):
-        return (abs(new_value - old_value) > 0.00001).any()
+    elif isinstance(new_value, pd.DataFrame):
+        return _frame_changed(new_value, old_value, tolerance)
+
+    elif isinstance(new_value, pd.Series):
+        return _series_changed(new_value, old_value, tolerance)
+
+    elif isinstance(new_value, np.ndarray):
+        return _array_changed(new_value, old_value, tolerance)
 
     return new_value != old_value
 
 
-def _ismethod(callable):
-    try:
-        return callable and (
-            inspect.ismethod(callable)
-            or (
-                inspect.getargspec(callable).args
-                and inspect.getargspec(callable).args[0] == "self"
-            )
+def _compare_identity(new_value, old_value):
+    """return true if value is a different object, otherwise false.
+    This is the cheapest check, but won't detect in-place modifications"""
+    return new_value is not old_value
+
+
+class _CompareVersion(object):
+    """Detect changes via a version counter on the value, e.g. an object that
+    increments `value.version` whenever it is modified in place.
+
+    Returns true if the value is a different object, or if its version has changed
+    since the last comparison. This is stateful, so use one instance per node.
+
+    Args:
+        attr (str): name of the version attribute on the value
+    """
+
+    def __init__(self, attr="version"):
+        self._attr = attr
+        self._version = None
+
+    def __call__(self, new_value, old_value):
+        version = getattr(new_value, self._attr, None)
+        changed = new_value is not old_value or version != self._version
+        self._version = version
+        return changed
+
+
+# types whose repr is a stable description of their contents
+_REPR_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    fractions.Fraction,
+)
+
+
+def _update_digest(digest, value):
+    """add the contents of a value to a digest, raising TypeError if it
+    has no deterministic representation"""
+    # tag each value with its type, so e.g. 1 and "1" differ
+    digest.update(type(value).__qualname__.encode() + b":")
+
+    if isinstance(value, (str, bytes)):
+        data = value.encode() if isinstance(value, str) else value
+        digest.update(str(len(data)).encode() + b":" + data)
+
+    elif isinstance(value, _REPR_TYPES) or isinstance(value, np.generic):
+        digest.update(repr(value).encode())
+
+    elif isinstance(value, (list, tuple)):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            _update_digest(digest, item)
+
+    elif isinstance(value, dict):
+        digest.update(str(len(value)).encode())
+        for k, v in value.items():
+            _update_digest(digest, k)
+            _update_digest(digest, v)
+
+    elif isinstance(value, (set, frozenset)):
+        # iteration order of sets varies across processes
+        items = sorted(_hash_value(item) or b"" for item in value)
+        if len(items) != len(value) or b"" in items:
+            raise TypeError("unhashable set element")
+        _update_digest(digest, items)
+
+    elif isinstance(value, pd.Index):
+        # labels, names and dtype
+        _update_digest(digest, (list(value.names), str(value.dtype)))
+        _update_digest(digest, pd.util.hash_pandas_object(value).to_numpy())
+
+    elif isinstance(value, pd.Series):
+        _update_digest(digest, (value.name, str(value.dtype), value.index))
+        _update_digest(
+            digest, pd.util.hash_pandas_object(value, index=False).to_numpy()
         )
+
+    elif isinstance(value, pd.DataFrame):
+        _update_digest(digest, value.columns)
+        _update_digest(digest, [str(dtype) for dtype in value.dtypes])
+        _update_digest(digest, value.index)
+        _update_digest(
+            digest, pd.util.hash_pandas_object(value, index=False).to_numpy()
+        )
+
+    elif isinstance(value, np.ndarray):
+        _update_digest(digest, (value.shape, str(value.dtype)))
+
+        if value.dtype.kind == "O":
+            _update_digest(digest, value.tolist())
+        else:
+            # hash underlying buffer, avoiding a copy if possible
+            digest.update(memoryview(np.ascontiguousarray(value)).cast("B"))
+
+    else:
+        raise TypeError("no deterministic digest for {}".format(type(value)))
+
+
+def _hash_value(value):
+    """compute a digest of the contents of a value, stable across processes. For pandas
+    objects, this includes labels, names and dtypes, not just values.
+
+    Returns None if the value has no deterministic digest, e.g. arbitrary objects.
+    """
+    digest = hashlib.blake2b()
+    try:
+        _update_digest(digest, value)
     except TypeError:
-        return False
+        return None
+    return digest.digest()
+
+
+class _CompareHash(object):
+    """Detect changes by hashing the contents of the value. Also detects in-place
+    modifications, at the cost of hashing the new value on every comparison.
+
+    This is stateful, so use one instance per node.
+    """
+
+    def __init__(self):
+        # id and digest of the last value seen
+        self._last = (None, None)
+
+    def __call__(self, new_value, old_value):
+        last_id, last_digest = self._last
+
+        if last_id != id(old_value):
+            last_digest = _hash_value(old_value)
+
+        digest = _hash_value(new_value)
+        self._last = (id(new_value), digest)
+
+        # without a digest, can't tell, so assume changed
+        return digest is None or digest != last_digest
+
+
+def _get_compare(compare=None):
+    """Construct a change detector for a node.
+
+    Args:
+        compare (Union[str, callable]): one of:
+            - None or "tolerance": compare numeric values within a tolerance (default)
+            - "identity": only values which are different objects are new
+            - "version": compare the `version` attribute of values
+            - "hash": compare the hash of the contents of values
+            - callable: custom callable taking (new_value, old_value),
+                        returning true if the value is new
+    Returns:
+        callable: callable taking (new_value, old_value), returning true if the value is new
+    """
+    if compare is None or compare == "tolerance":
+        return _compare
+    elif callable(compare):
+        return compare
+    elif compare == "identity":
+        return _compare_identity
+    elif compare == "version":
+        return _CompareVersion()
+    elif compare == "hash":
+        return _CompareHash()
+    raise TributaryException(
+        "`compare` must be a callable or in ('tolerance', 'identity', 'version', 'hash')"
+    )
+
+
+def _ismethod(callable):
+    """callable is a method, or a function taking `self` as its first argument"""
+    if inspect.ismethod(callable):
+        return True
+
+    # plain functions, don't go through inspect.signature
+    code = getattr(callable, "__code__", None)
+    return bool(code and code.co_argcount and code.co_varnames[0] == "self")
+
+
+# names of parameters of functions, by code object, which is
+# shared by e.g. every function created from the same lambda.
+# weak, so dynamically created functions don't accumulate
+_PARAMETERS = weakref.WeakKeyDictionary()
+
+
+def _signature(callable):
+    """Get the named parameters of a callable, excluding *args and **kwargs.
+
+    Args:
+        callable (callable): callable to inspect
+    Returns:
+        tuple: list of (name, default) pairs, with default `inspect.Parameter.empty`
+               if not provided, and whether the callable takes *args or **kwargs
+    """
+    func = callable.__func__ if inspect.ismethod(callable) else callable
+
+    if (
+        not inspect.isfunction(func)
+        or hasattr(func, "__signature__")
+        or hasattr(func, "__wrapped__")
+    ):
+        # not a plain function, fall back to inspect.signature
+        try:
+            parameters = inspect.signature(callable).parameters.values()
+        except ValueError:
+            # https://bugs.python.org/issue20189
+            return [], False
+
+        variable = (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.VAR_KEYWORD,
+        )
+        return [(p.name, p.default) for p in parameters if p.kind not in variable], any(
+            p.kind in variable for p in parameters
+        )
+
+    code = func.__code__
+    if code not in _PARAMETERS:
+        _PARAMETERS[code] = (
+            code.co_varnames[: code.co_argcount + code.co_kwonlyargcount],
+            code.co_argcount,
+            bool(code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)),
+        )
+    names, positional, variable = _PARAMETERS[code]
+
+    # defaults can differ between functions sharing code
+    defaults = func.__defaults__ or ()
+    kwdefaults = func.__kwdefaults__ or {}
+    first_default = positional - len(defaults)
+
+    parameters = [
+        (
+            name,
+            defaults[i - first_default]
+            if first_default <= i < positional
+            else kwdefaults.get(name, inspect.Parameter.empty),
+        )
+        for i, name in enumerate(names)
+    ]
+
+    if func is not callable and positional:
+        # bound method, skip self
+        parameters = parameters[1:]
+    return parameters, variable
+
+
+def _loads(values):
+    """decode a list of json values at once, with orjson if installed"""
+    data = b"[" + b",".join(v if isinstance(v, bytes) else v.encode() for v in values)
+    data += b"]"
+    if orjson is not None:
+        return orjson.loads(data)
+    return JSON.loads(data)
 
 
 def anext(obj):